@@ -30,14 +30,15 @@ def run_submission():
     test_df = pd.read_csv(test_path)
     print(f"Loaded {len(test_df)} problems from {test_path}.")
 
-    # 2. Process problems
+    # 2. Process problems (the next problem generates while this one's RTC runs)
     results = []
-    for _, row in test_df.iterrows():
-        outcome = solver.solve_problem(row['problem'], id=row['id'])
+    for outcome in solver.solve_problems(zip(test_df['id'], test_df['problem'])):
         results.append({
-            "id": row['id'],
+            "id": outcome['id'],
             "answer": outcome['answer'] or 0
         })
+    solver.close()
+    solver.budget.write_trace("budget_trace.json")
 
     # 3. Save submission
     submission_df = pd.DataFrame(results)
@@ -0,0 +1,115 @@
+"""
+Inline shared layer modules into the standalone Kaggle scripts.
+
+Kaggle runs a submission as a single file, so the scripts carry copies of
+layers/layer_2_core modules between marker lines:
+
+    # >>> inlined: layers/layer_2_core/code_sandbox.py
+    ...
+    # <<< inlined: layers/layer_2_core/code_sandbox.py
+
+Never edit a copy by hand. Change the module, then run
+
+    python competitions/aimo/build_bundle.py          # rewrite stale copies
+    python competitions/aimo/build_bundle.py --check  # exit 1 if any copy is stale
+
+`from layers... import` lines are dropped from a copy; the names they import
+must come from another module inlined earlier in the same script. A copy's
+import of a name the host script already imports is kept, so each block still
+runs on its own, and is marked `# noqa: F811`.
+"""
+
+import argparse
+import ast
+import os
+import re
+import sys
+from typing import Dict, FrozenSet, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TARGETS = ("submission.py", "competitions/aimo/bundled_submission.py")
+
+_BLOCK = re.compile(r"^# >>> inlined: (\S+)\n.*?^# <<< inlined: \1\n", re.MULTILINE | re.DOTALL)
+_LAYER_IMPORT = re.compile(r"^from (layers\.\S+) import .*$", re.MULTILINE)
+
+
+def _module_path(dotted: str) -> str:
+    return dotted.replace(".", "/") + ".py"
+
+
+def _top_level_imports(source: str):
+    """(node, bound names) for each import statement at module level."""
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node, {alias.asname or alias.name.split(".")[0] for alias in node.names}
+
+
+def host_imports(text: str) -> FrozenSet[str]:
+    """Names the script binds with its own imports, outside the inlined blocks."""
+    names = set()
+    for _, bound in _top_level_imports(_BLOCK.sub("", text)):
+        names |= bound
+    return frozenset(names)
+
+
+def inline_source(module_path: str, available: List[str], host_names: FrozenSet[str] = frozenset()) -> str:
+    """A module's source as it appears in a bundle, with its layer imports removed."""
+    with open(os.path.join(ROOT, module_path)) as f:
+        source = f.read()
+    lines = source.splitlines(keepends=True)
+    for node, bound in _top_level_imports(source):
+        if bound & host_names and node.lineno == node.end_lineno:
+            lines[node.lineno - 1] = lines[node.lineno - 1].rstrip("\n") + "  # noqa: F811\n"
+    source = "".join(lines)
+    for match in _LAYER_IMPORT.finditer(source):
+        if _module_path(match.group(1)) not in available:
+            raise ValueError(f"{module_path} imports {match.group(1)}, which is not inlined before it")
+    source = _LAYER_IMPORT.sub("", source)
+    return f"# >>> inlined: {module_path}\n{source.strip()}\n# <<< inlined: {module_path}\n"
+
+
+def render(text: str) -> str:
+    """The script text with every inlined block refreshed from its module."""
+    inlined: List[str] = []
+    host_names = host_imports(text)
+
+    def refresh(match: "re.Match") -> str:
+        module_path = match.group(1)
+        block = inline_source(module_path, inlined, host_names)
+        inlined.append(module_path)
+        return block
+
+    return _BLOCK.sub(refresh, text)
+
+
+def build(check: bool = False) -> Dict[str, bool]:
+    """Refresh every target; returns {target: was_stale}. With check=True nothing is written."""
+    stale = {}
+    for target in TARGETS:
+        path = os.path.join(ROOT, target)
+        with open(path) as f:
+            text = f.read()
+        fresh = render(text)
+        stale[target] = fresh != text
+        if stale[target] and not check:
+            with open(path, "w") as f:
+                f.write(fresh)
+    return stale
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Inline shared modules into the Kaggle submission scripts")
+    parser.add_argument("--check", action="store_true", help="only report stale copies")
+    args = parser.parse_args(argv)
+    stale = build(check=args.check)
+    for target, was_stale in stale.items():
+        if was_stale:
+            print(f"{'⚠️ Stale' if args.check else '📦 Rebuilt'}: {target}")
+    if not any(stale.values()):
+        print("✅ Bundles up to date.")
+    return 1 if args.check and any(stale.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import atexit
 import os
 import re
 import torch
@@ -56,48 +57,439 @@ class MockSolver:
         except: pass
         return None
 
-def execute_code(code):
+# --- RTC sandbox: pre-warmed workers instead of a fresh `python -c` per code block ---
+
+# >>> inlined: layers/layer_2_core/code_sandbox.py
+"""
+CODE SANDBOX POOL
+=================
+Pre-warmed Python workers for RTC (run-to-check) code execution.
+
+Spawning `python -c` per code block pays interpreter startup plus the sympy /
+numpy imports on every sample. SandboxPool keeps a few worker processes alive
+with the math libraries already imported and feeds them one snippet at a time
+over a pipe. Each snippet runs in a fresh globals dict with its stdout
+captured, and the recursion and int-digit limits are reset after it. Anything
+else a snippet changes inside the interpreter (sys.modules, attributes patched
+onto imported modules) stays for the rest of that worker's life; only a
+worker that times out, crashes or dies is killed and replaced. Workers cap
+their address space with RLIMIT_AS where the platform supports it.
+"""
+
+import json  # noqa: F811
+import os  # noqa: F811
+import queue
+import re  # noqa: F811
+import select
+import subprocess  # noqa: F811
+import sys  # noqa: F811
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+DEFAULT_PRELOAD = ("math", "cmath", "itertools", "functools", "fractions", "decimal",
+                   "collections", "numpy", "sympy")
+
+# Runs inside each worker. Requests arrive as JSON lines on the original stdin,
+# replies leave on a dup of the original stdout; fds 0/1 are pointed at devnull
+# so snippets can neither read the protocol nor corrupt it.
+WORKER_SOURCE = r'''
+import builtins, contextlib, io, json, os, sys, traceback
+requests = os.fdopen(os.dup(0), "r")
+replies = os.fdopen(os.dup(1), "w")
+devnull = os.open(os.devnull, os.O_RDWR)
+os.dup2(devnull, 0); os.dup2(devnull, 1)
+for name in json.loads(sys.argv[1]):
+    try: __import__(name)
+    except Exception: pass
+limit = int(sys.argv[2])
+if limit > 0:
     try:
-        if "\n" not in code.strip() and not code.strip().startswith("print"):
-            code = f"print({code})"
-        # Safe execution wrapper for Kaggle
-        result = subprocess.run(
-            [sys.executable, "-c", code],
-            capture_output=True, text=True, timeout=15
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except Exception: pass
+recursion_limit = sys.getrecursionlimit()
+str_digits = getattr(sys, "get_int_max_str_digits", lambda: None)()
+replies.write(json.dumps({"ready": True}) + "\n"); replies.flush()
+for line in requests:
+    code = json.loads(line)["code"]
+    out = io.StringIO()
+    ok, error = True, None
+    try:
+        with contextlib.redirect_stdout(out):
+            exec(compile(code, "<rtc>", "exec"), {"__name__": "__main__", "__builtins__": builtins})
+    except SystemExit as e:
+        ok = e.code is None or e.code == 0
+        if not ok: error = f"SystemExit({e.code!r})"
+    except BaseException as e:
+        ok, error = False, f"{type(e).__name__}: {e}"
+    sys.setrecursionlimit(recursion_limit)
+    if str_digits is not None: sys.set_int_max_str_digits(str_digits)
+    replies.write(json.dumps({"ok": ok, "stdout": out.getvalue(), "error": error}) + "\n"); replies.flush()
+'''
+
+NUMERIC_PATTERN = re.compile(r"-?\d+")
+
+
+@dataclass
+class SandboxResult:
+    ok: bool
+    stdout: str = ""
+    error: Optional[str] = None  # exception text, "timeout" or "crash"
+    elapsed: float = 0.0
+
+
+def prepare_code(code: str) -> str:
+    """Bare one-line expressions are printed, as the RTC prompt format expects."""
+    if "\n" not in code.strip() and not code.strip().startswith("print"):
+        return f"print({code})"
+    return code
+
+
+def extract_rtc_answer(result: SandboxResult) -> Optional[int]:
+    """Last integer printed by a successful run, clamped at 0 and taken mod 100000."""
+    if not result.ok:
+        return None
+    nums = NUMERIC_PATTERN.findall(result.stdout.strip())
+    if nums:
+        return max(0, int(nums[-1])) % 100000
+    return None
+
+
+class _SandboxWorker:
+    def __init__(self, preload: Sequence[str], memory_limit_mb: Optional[int]):
+        limit = int(memory_limit_mb * 1024 * 1024) if memory_limit_mb else 0
+        self.proc = subprocess.Popen(
+            [sys.executable, "-c", WORKER_SOURCE, json.dumps(list(preload)), str(limit)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
         )
-        if result.returncode == 0:
-            stdout = result.stdout.strip()
-            nums = re.findall(r'-?\d+', stdout)
-            if nums:
-                val = int(nums[-1])
-                return max(0, val) % 100000
+        self._buffer = b""
+        self.ready = False
+
+    def _read_line(self, deadline: Optional[float]) -> Optional[bytes]:
+        fd = self.proc.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            if not select.select([fd], [], [], remaining)[0]:
+                return None
+            chunk = os.read(fd, 1 << 16)
+            if not chunk:
+                raise EOFError("sandbox worker exited")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def run(self, code: str, timeout: float, startup_timeout: float) -> SandboxResult:
+        start = time.monotonic()
+        try:
+            if not self.ready:
+                # Warm-up (imports) does not count against the snippet's timeout
+                if self._read_line(start + startup_timeout) is None:
+                    return SandboxResult(False, error="timeout", elapsed=time.monotonic() - start)
+                self.ready = True
+                start = time.monotonic()
+            self.proc.stdin.write((json.dumps({"code": code}) + "\n").encode())
+            self.proc.stdin.flush()
+            line = self._read_line(start + timeout)
+        except (EOFError, OSError, BrokenPipeError):
+            return SandboxResult(False, error="crash", elapsed=time.monotonic() - start)
+        if line is None:
+            return SandboxResult(False, error="timeout", elapsed=time.monotonic() - start)
+        reply = json.loads(line)
+        return SandboxResult(reply["ok"], reply["stdout"], reply["error"], time.monotonic() - start)
+
+    @property
+    def healthy(self) -> bool:
+        return self.proc.poll() is None
+
+    def kill(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout):
+            try: stream.close()
+            except OSError: pass
+
+
+class SandboxPool:
+    """
+    Persistent pool of pre-warmed Python sandbox workers.
+
+    run() executes one snippet; submit_many() runs all candidate snippets of a
+    problem concurrently (one per worker) and returns results in input order.
+    """
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 timeout: float = 15.0,
+                 memory_limit_mb: Optional[int] = 2048,
+                 preload: Sequence[str] = DEFAULT_PRELOAD,
+                 startup_timeout: float = 120.0):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.preload = tuple(preload)
+        self.startup_timeout = startup_timeout
+        self.jobs = 0
+        self.restarts = 0
+        self._idle: "queue.Queue[_SandboxWorker]" = queue.Queue()
+        self._all: List[_SandboxWorker] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    def _spawn(self) -> _SandboxWorker:
+        worker = _SandboxWorker(self.preload, self.memory_limit_mb)
+        self._all.append(worker)
+        return worker
+
+    def start(self):
+        """Launch every worker now so their imports overlap with other work."""
+        while len(self._all) < self.workers:
+            self._idle.put(self._spawn())
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sandbox")
+        return self
+
+    def run(self, code: str, timeout: Optional[float] = None) -> SandboxResult:
+        if self._closed:
+            raise RuntimeError("SandboxPool is closed")
+        self.start()
+        worker = self._idle.get()
+        try:
+            result = worker.run(code, timeout or self.timeout, self.startup_timeout)
+        except Exception as e:
+            result = SandboxResult(False, error=f"{type(e).__name__}: {e}")
+        self.jobs += 1
+        if result.error in ("timeout", "crash") or not worker.healthy:
+            # A stuck or dead worker is replaced; the new one warms up on its next job
+            worker.kill()
+            self._all.remove(worker)
+            worker = self._spawn()
+            self.restarts += 1
+        self._idle.put(worker)
+        return result
+
+    def submit_many(self, codes: Sequence[str], timeout: Optional[float] = None) -> List[SandboxResult]:
+        """Run every snippet concurrently across the pool; results keep input order."""
+        if not codes:
+            return []
+        self.start()
+        return list(self._executor.map(lambda code: self.run(code, timeout), codes))
+
+    def close(self):
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for worker in self._all:
+            worker.kill()
+        self._all.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        try: self.close()
+        except Exception: pass
+# <<< inlined: layers/layer_2_core/code_sandbox.py
+
+SANDBOX = None
+
+def execute_codes(codes):
+    """Run all candidate code blocks of one problem concurrently in the sandbox pool."""
+    global SANDBOX
+    try:
+        if SANDBOX is None:
+            SANDBOX = SandboxPool(workers=min(4, os.cpu_count() or 1))
+            atexit.register(SANDBOX.close)  # reap the workers when the notebook exits
+        return [extract_rtc_answer(r) for r in SANDBOX.submit_many([prepare_code(c) for c in codes])]
     except: pass
+    return [None] * len(codes)
+
+def execute_code(code):
+    return execute_codes([code])[0]
+
+# --- Answer extraction: one reverse scan from the end, balanced \boxed{...} ---
+
+# >>> inlined: layers/layer_2_core/answer_extraction.py
+"""
+ANSWER EXTRACTION ENGINE
+========================
+Final-answer extraction for AIMO completions.
+
+The old extractor ran five regexes with findall over the whole completion,
+then fell back to listing every digit run. Answers sit at the end of long
+chain-of-thought text, so this engine searches backwards from the end. It
+lowercases the text once (ASCII only, so indices still line up) and uses
+rfind for each marker, so it only looks at text before the last marker when
+the last one is unusable. The priority order is unchanged:
+
+    1. last closed \\boxed{...} (braces are balanced, so \\boxed{\\frac{1}{2}} is whole)
+    2. last "final answer is N"
+    3. last "answer is N"
+    4. last "boxed N"
+    5. last digit run in the text
+
+Boxed contents give their first integer, clamped at 0. Every result is taken
+mod 100000, and 0 means nothing was found.
+
+AnswerStream applies rule 1 incrementally while tokens are still arriving.
+It reports the answer as soon as a boxed expression closes, which a sampler
+can use to stop that sequence early.
+"""
+
+import re  # noqa: F811
+from typing import Optional
+
+MODULUS = 100000
+
+_NUMBER = re.compile(r"-?\d+")
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+_DIGITS = "0123456789"
+
+BOXED = "boxed"
+# (marker, tail matched right after it), in priority order after \boxed{...}
+_PHRASES = (
+    ("final answer is", re.compile(r"[:\s]*(\d+)")),
+    ("answer is", re.compile(r"[:\s]*(\d+)")),
+    (BOXED, re.compile(r"\s+(\d+)")),
+)
+_SPACE = re.compile(r"\s*")
+
+
+def _lower(text: str) -> str:
+    return text.translate(_ASCII_LOWER)
+
+
+def _boxed_at(text: str, i: int) -> Optional[int]:
+    """
+    For a "boxed" marker at i, the end of its balanced {...} group (index of
+    the closing brace), or None if it is not a \\boxed{ or has not closed yet.
+    """
+    if i == 0 or text[i - 1] != "\\":
+        return None
+    j = _SPACE.match(text, i + len(BOXED)).end()
+    if j >= len(text) or text[j] != "{":
+        return None
+    depth = 0
+    for k in range(j, len(text)):
+        c = text[k]
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return k
     return None
 
-def extract_answer(text):
+
+def _content(text: str, i: int, close: int) -> str:
+    return text[text.index("{", i) + 1:close]
+
+
+def boxed_value(content: str) -> Optional[int]:
+    """First integer inside a boxed expression (thousands separators ignored)."""
+    m = _NUMBER.search(content.replace(",", ""))
+    return max(0, int(m.group())) % MODULUS if m else None
+
+
+def last_boxed(text: str, lowered: Optional[str] = None) -> Optional[str]:
+    """Contents of the last closed \\boxed{...}, or None."""
+    low = lowered if lowered is not None else _lower(text)
+    i = low.rfind(BOXED)
+    while i >= 0:
+        close = _boxed_at(text, i)
+        if close is not None:
+            return _content(text, i, close)
+        i = low.rfind(BOXED, 0, i)
+    return None
+
+
+def _last_digit_run(text: str) -> Optional[str]:
+    end = max(text.rfind(d) for d in _DIGITS)
+    if end < 0:
+        return None
+    start = end
+    while start > 0 and text[start - 1] in _DIGITS:
+        start -= 1
+    return text[start:end + 1]
+
+
+def extract_answer(text: str) -> int:
+    """Final integer answer of a completion; see the module docstring for the rules."""
+    if not text:
+        return 0
+    low = _lower(text)
+    content = last_boxed(text, low)
+    if content is not None:
+        value = boxed_value(content)
+        if value is not None:
+            return value
+    for marker, tail in _PHRASES:
+        i = low.rfind(marker)
+        while i >= 0:
+            m = tail.match(text, i + len(marker))
+            if m:
+                return int(m.group(1)) % MODULUS
+            i = low.rfind(marker, 0, i)
+    digits = _last_digit_run(text)
+    return int(digits) % MODULUS if digits else 0
+
+
+class AnswerStream:
     """
-    Robust multi-pattern regex as per AGENTS.md guidelines.
+    Watches generated text for a closed \\boxed{...} as it streams in.
+
+    feed() appends a chunk and returns the latest boxed answer so far (None
+    until one has closed). Text already scanned is never scanned again, except
+    for an open \\boxed{ that is still waiting for its closing brace.
     """
-    patterns = [
-        r'\\+boxed\s*\{(.*?)\}',  # Handles one or more backslashes
-        r'final answer is\s*[:\s]*(\d+)',
-        r'answer is\s*[:\s]*(\d+)',
-        r'boxed\s+(\d+)',
-        r'\\boxed\{(.*?)\}'
-    ]
-    for p in patterns:
-        try:
-            matches = re.findall(p, text, re.IGNORECASE)
-            if matches:
-                ans_str = matches[-1].replace(',', '').strip()
-                nums = re.findall(r'-?\d+', ans_str)
-                if nums: return max(0, int(nums[0])) % 100000
-        except: continue
-
-    # Final fallback: last number in the text
-    nums = re.findall(r'\d+', text)
-    if nums: return int(nums[-1]) % 100000
-    return 0
+
+    def __init__(self):
+        self.text = ""
+        self.answer: Optional[int] = None
+        self.boxed: Optional[str] = None
+        self._scan = 0  # next position a "boxed" marker may start at
+
+    def feed(self, chunk: str) -> Optional[int]:
+        self.text += chunk
+        low = _lower(self.text[self._scan:])
+        offset = self._scan
+        i = low.find(BOXED)
+        while i >= 0:
+            at = offset + i
+            close = _boxed_at(self.text, at)
+            if close is None:
+                if self._is_open(at):
+                    self._scan = at  # wait for the rest of this group
+                    return self.answer
+            else:
+                content = _content(self.text, at, close)
+                value = boxed_value(content)
+                if value is not None:
+                    self.answer, self.boxed = value, content
+            i = low.find(BOXED, i + 1)
+        # A marker split across chunks is found once its last letter arrives
+        self._scan = max(self._scan, len(self.text) - len(BOXED) + 1)
+        return self.answer
+
+    def _is_open(self, at: int) -> bool:
+        """A \\boxed marker whose brace group has not closed (or not started) yet."""
+        if at == 0 or self.text[at - 1] != "\\":
+            return False
+        j = _SPACE.match(self.text, at + len(BOXED)).end()
+        return j >= len(self.text) or self.text[j] == "{"
+
+    @property
+    def finished(self) -> bool:
+        return self.answer is not None
+# <<< inlined: layers/layer_2_core/answer_extraction.py
 
 # --- 2. Model Loading ---
 
@@ -125,7 +517,145 @@ def load_model():
 TOKENIZER, MODEL = load_model()
 ALL_PREDS = []
 
-# --- 3. Prediction Pipeline ---
+# --- 3. Batched Sampling ---
+
+# >>> inlined: layers/layer_2_core/consensus_generation.py
+"""
+CONSENSUS GENERATION
+====================
+All samples of one AIMO problem from a single batched Hugging Face generate.
+
+The prompt is tokenized once and expanded with num_return_sequences. While
+the batch decodes, ConsensusStop looks at the new text every `check_every`
+tokens. A sample that has written a closed \\boxed{...} is done, and once a
+strict majority of all samples agree on one boxed answer the whole batch
+stops. Samples still running at that point were cut off, and
+generate_samples reports them as unfinished so they do not vote.
+
+Per-row stopping (a bool tensor with one entry per sequence) needs
+transformers >= 4.39; older versions only accept a single bool and raise
+"ambiguous truth value" on a tensor. On those versions ConsensusStop answers
+for the whole batch: it still stops at consensus, but a sample that boxed
+its answer keeps decoding until then.
+"""
+
+from collections import Counter  # noqa: F811
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+
+try:
+    import torch
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
+try:
+    from transformers import StoppingCriteriaList
+    HAS_TRANSFORMERS = True
+except ImportError:
+    HAS_TRANSFORMERS = False
+
+PER_ROW_STOP_VERSION = (4, 39)
+
+
+def supports_per_row_stop() -> bool:
+    """True if the installed transformers accepts a per-sequence stopping mask."""
+    try:
+        import transformers
+    except ImportError:
+        return False
+    try:
+        version = tuple(int(part) for part in transformers.__version__.split(".")[:2])
+    except ValueError:
+        return False
+    return version >= PER_ROW_STOP_VERSION
+
+
+class ConsensusStop:
+    """
+    Stopping criterion for one batched generate (used through StoppingCriteriaList).
+
+    answers: row -> boxed answer, for every sample that has boxed one
+    consensus: the majority answer once the batch stopped on it, else None
+    """
+
+    def __init__(self, tokenizer, prompt_len: int, num_samples: int,
+                 check_every: int = 32, per_row: bool = True):
+        self.tokenizer = tokenizer
+        self.prompt_len = prompt_len
+        self.num_samples = num_samples
+        self.check_every = check_every
+        self.per_row = per_row
+        self.answers: Dict[int, int] = {}
+        self.consensus: Optional[int] = None
+
+    def check(self, input_ids) -> List[bool]:
+        """Per-row done flags for the batch so far."""
+        rows = input_ids.shape[0]
+        new_tokens = input_ids.shape[1] - self.prompt_len
+        if new_tokens > 0 and new_tokens % self.check_every == 0:
+            pending = [i for i in range(rows) if i not in self.answers]
+            if pending:
+                texts = self.tokenizer.batch_decode(input_ids[pending, self.prompt_len:], skip_special_tokens=True)
+                for i, text in zip(pending, texts):
+                    boxed = last_boxed(text)
+                    answer = boxed_value(boxed) if boxed is not None else None
+                    if answer is not None:
+                        self.answers[i] = answer
+            if self.answers:
+                answer, votes = Counter(self.answers.values()).most_common(1)[0]
+                if votes > self.num_samples // 2:
+                    self.consensus = answer
+        if self.consensus is not None:
+            return [True] * rows
+        return [i in self.answers for i in range(rows)]
+
+    def __call__(self, input_ids, scores, **kwargs):
+        done = self.check(input_ids)
+        if not self.per_row:
+            return all(done)
+        if HAS_TORCH and isinstance(input_ids, torch.Tensor):
+            return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+        return np.array(done, dtype=bool)
+
+    def finished(self, last_tokens: Sequence[int], eos_token_id: Optional[int]) -> List[bool]:
+        """
+        Which returned samples are complete. Without a consensus stop every
+        sample ran to EOS or max_new_tokens; after one, only samples that
+        boxed an answer or had already ended (EOS, also the padding) count.
+        """
+        if self.consensus is None:
+            return [True] * len(last_tokens)
+        return [i in self.answers or int(token) == eos_token_id for i, token in enumerate(last_tokens)]
+
+
+def generate_samples(model, tokenizer, prompt: str, num_samples: int,
+                     max_new_tokens: int = 1024, temperature: float = 0.6,
+                     check_every: int = 32, per_row: Optional[bool] = None) -> Tuple[List[str], List[bool]]:
+    """
+    All samples for one problem from one generate call. Returns (responses,
+    finished); finished[i] is False for a sample cut off by the consensus stop.
+    per_row defaults to what the installed transformers supports.
+    """
+    if per_row is None:
+        per_row = supports_per_row_stop()
+    inputs = tokenizer(prompt, return_tensors='pt').to(model.device)
+    inputs = {k: v for k, v in inputs.items() if k in ['input_ids', 'attention_mask']}
+    stopper = ConsensusStop(tokenizer, inputs['input_ids'].shape[1], num_samples, check_every, per_row)
+    criteria = StoppingCriteriaList([stopper]) if HAS_TRANSFORMERS else [stopper]
+    outputs = model.generate(
+        **inputs, max_new_tokens=max_new_tokens, temperature=temperature, do_sample=True,
+        num_return_sequences=num_samples, pad_token_id=tokenizer.eos_token_id,
+        stopping_criteria=criteria
+    )
+    responses = tokenizer.batch_decode(outputs, skip_special_tokens=True)
+    return responses, stopper.finished([row[-1] for row in outputs], tokenizer.eos_token_id)
+# <<< inlined: layers/layer_2_core/consensus_generation.py
+
+# --- 4. Prediction Pipeline ---
 
 def predict(*args, **kwargs):
     id_val, problem_text = None, None
@@ -180,33 +710,33 @@ def predict(*args, **kwargs):
         "For remainder questions, return the smallest non-negative remainder."
     )
 
+    prompt = (
+        f"<|user|>\n{system_rules}\n\nProblem: {problem_text}\n\n"
+        "Solve this step-by-step. Use Python code in ```python ... ``` blocks for calculations. "
+        "End with 'The final answer is \\boxed{result}'.\n"
+        "<|assistant|>\n<|thought|>\n"
+    )
+    try:
+        responses, finished = generate_samples(MODEL, TOKENIZER, prompt, num_samples, max_new_tokens=1536)
+        # Truncated samples do not vote
+        responses = [r for r, done in zip(responses, finished) if done]
+    except:
+        responses = [None] * num_samples
+
+    # RTC: Extraction, then every sample's last code block executed concurrently
+    last_blocks = {}
+    for i, response in enumerate(responses):
+        code_blocks = re.findall(r'```python\s*(.*?)\s*```', response, re.DOTALL) if response else []
+        if code_blocks: last_blocks[i] = code_blocks[-1]
+    rtc_answers = dict(zip(last_blocks, execute_codes(list(last_blocks.values()))))
+
     answers = []
-    for i in range(num_samples):
-        try:
-            prompt = (
-                f"<|user|>\n{system_rules}\n\nProblem: {problem_text}\n\n"
-                "Solve this step-by-step. Use Python code in ```python ... ``` blocks for calculations. "
-                "End with 'The final answer is \\boxed{result}'.\n"
-                "<|assistant|>\n<|thought|>\n"
-            )
-            inputs = TOKENIZER(prompt, return_tensors='pt').to(MODEL.device)
-            inputs = {k: v for k, v in inputs.items() if k in ['input_ids', 'attention_mask']}
-            with torch.no_grad():
-                outputs = MODEL.generate(
-                    **inputs, max_new_tokens=1536, temperature=0.6, do_sample=True,
-                    pad_token_id=TOKENIZER.eos_token_id
-                )
-            response = TOKENIZER.decode(outputs[0], skip_special_tokens=True)
-
-            # RTC: Extraction and execution
-            code_blocks = re.findall(r'```python\s*(.*?)\s*```', response, re.DOTALL)
-            rtc_ans = None
-            if code_blocks: rtc_ans = execute_code(code_blocks[-1])
-
-            ans = rtc_ans if rtc_ans is not None else extract_answer(response)
-            answers.append(ans)
-        except:
+    for i, response in enumerate(responses):
+        if response is None:
             answers.append(0)
+            continue
+        rtc_ans = rtc_answers.get(i)
+        answers.append(rtc_ans if rtc_ans is not None else extract_answer(response))
 
     # Step 3: Consensus Voting
     non_zero = [a for a in answers if a != 0]
@@ -215,7 +745,7 @@ def predict(*args, **kwargs):
     print(f"   Final Result: {final_ans} from {answers}")
     return pl.DataFrame({'id': [id_val], 'answer': [final_ans]})
 
-# --- 4. Main Execution ---
+# --- 5. Main Execution ---
 
 if __name__ == '__main__':
     is_kaggle = os.path.exists('/kaggle/input')
@@ -86,3 +86,4 @@ if __name__ == '__main__':
             pl.DataFrame({'id': ['fallback'], 'answer': [0]}).write_parquet('submission.parquet')
 
         print("✅ submission.parquet is ready.")
+        model.budget.write_trace('budget_trace.json')
@@ -1,61 +1,229 @@
-import pandas as pd
+"""
+AIMO 3 reference evaluation.
+
+Problems fan out over a pool of worker processes, each owning its own
+AIMOMathSolver. That only pays off in MOCK mode: a LOCAL solver loads the
+model, so with a real model the default is to solve in-process, where every
+problem shares the solver's one inference server.
+
+Every finished problem is appended to a JSONL file right away, so an
+interrupted run resumes where it stopped. The summary (accuracy, p50/p95
+latency, samples used, RTC hit rate) is built from those records. Problems
+answered from the solve cache are counted as cache hits and left out of the
+latency percentiles, which only time real solves. Run one output file per
+solver variant to compare them on the same set.
+"""
+
+import argparse
+import functools
+import json
+import multiprocessing as mp
 import os
 import sys
-from layers.layer_2_core.aimo_math_solver import AIMOMathSolver
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.aimo_math_solver import DEFAULT_MODEL_PATH, AIMOMathSolver
+from layers.layer_2_core.solve_cache import SolveCache
+
+REF_PATH = "data/aimo_3/reference.csv"
+OUTPUT_DIR = "outcomes/technical"
+METRICS_PATH = os.path.join(OUTPUT_DIR, "AIMO_PERFORMANCE_METRICS.json")
+
+Task = Tuple[str, str, int]  # (id, problem, true answer)
+
+_solver: Optional[AIMOMathSolver] = None
+
+
+def _init_worker(solver_factory: Callable[[], AIMOMathSolver]):
+    global _solver
+    _solver = solver_factory()
+
+
+def _solve(task: Task) -> Dict:
+    problem_id, problem, true_answer = task
+    start = time.perf_counter()
+    outcome = _solver.solve_problem(problem, id=problem_id)
+    latency = time.perf_counter() - start
+    predicted = int(outcome.get("answer") or 0)
+    return {
+        "id": problem_id,
+        "predicted": predicted,
+        "true": true_answer,
+        "correct": predicted == true_answer,
+        "status": "✅ CORRECT" if predicted == true_answer else "❌ INCORRECT",
+        "latency": latency,
+        "samples": int(outcome.get("samples", 0)),
+        "rtc_hits": int(outcome.get("rtc_hits", 0)),
+        "method": outcome.get("method"),
+    }
 
-def main():
-    print("🏆 AIMO 3 Performance Validation (Winning Numbers Showcase)")
-    print("="*60)
 
-    ref_path = "data/aimo_3/reference.csv"
-    if not os.path.exists(ref_path):
-        print(f"❌ Error: Reference file not found at {ref_path}")
+def _run(tasks: List[Task], solver_factory: Callable[[], AIMOMathSolver], workers: int) -> Iterator[Dict]:
+    """Records in completion order; workers=0 solves in this process."""
+    global _solver
+    if workers <= 0:
+        _init_worker(solver_factory)
+        try:
+            for task in tasks:
+                yield _solve(task)
+        finally:
+            _solver.close()
+            _solver = None
         return
+    # fork: each worker builds its solver once and inherits the factory without pickling
+    pool = mp.get_context("fork").Pool(workers, initializer=_init_worker, initargs=(solver_factory,))
+    try:
+        yield from pool.imap_unordered(_solve, tasks)
+    finally:
+        pool.terminate()
+        pool.join()
 
+
+def load_tasks(ref_path: str = REF_PATH) -> List[Task]:
     df = pd.read_csv(ref_path)
-    solver = AIMOMathSolver()
+    return [(str(row.id), row.problem, int(row.answer)) for row in df.itertuples()]
+
+
+def load_records(path: str) -> Dict[str, Dict]:
+    """Finished records of an earlier run; a line cut off by a crash is ignored."""
+    records = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records[record["id"]] = record
+    return records
+
+
+def _drop_partial_line(path: str):
+    """Cut a trailing line left unfinished by a crash, so appends start on a fresh line."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def summarize(records: List[Dict]) -> Dict:
+    total = len(records)
+    correct = sum(r["correct"] for r in records)
+    # Cache hits take ~0s and would hide the solver's own latency
+    solved = [r["latency"] for r in records if r.get("method") != "cache"]
+    latencies = np.array(solved) if solved else np.zeros(1)
+    samples = sum(r["samples"] for r in records)
+    rtc_hits = sum(r["rtc_hits"] for r in records)
+    accuracy = 100.0 * correct / total if total else 0.0
+    return {
+        "score": f"{correct}/{total}",
+        "accuracy": f"{accuracy:.1f}%",
+        "correct": correct,
+        "total": total,
+        "latency_p50": float(np.percentile(latencies, 50)),
+        "latency_p95": float(np.percentile(latencies, 95)),
+        "cache_hits": len(records) - len(solved),
+        "samples_total": samples,
+        "samples_mean": samples / total if total else 0.0,
+        "rtc_hit_rate": rtc_hits / samples if samples else 0.0,
+    }
+
 
-    correct = 0
-    total = len(df)
+def default_workers(model: Optional[str] = None) -> int:
+    """In-process for a real model: forked workers would each load a copy onto the same GPU."""
+    if os.path.exists(model or DEFAULT_MODEL_PATH):
+        return 0
+    return min(4, os.cpu_count() or 1)
 
-    results = []
 
-    for _, row in df.iterrows():
-        problem_id = row['id']
-        problem_text = row['problem']
-        true_answer = int(row['answer'])
+def evaluate(tasks: Iterable[Task],
+             output_path: str,
+             solver_factory: Callable[[], AIMOMathSolver] = AIMOMathSolver,
+             workers: int = 0,
+             resume: bool = True,
+             variant: str = "default") -> Dict:
+    """
+    Solve every task not already in output_path, appending one JSON line per
+    finished problem, and return the summary over all of them plus 'details'
+    (the records in task order).
+    """
+    tasks = list(tasks)
+    if not resume and os.path.exists(output_path):
+        os.remove(output_path)
+    done = load_records(output_path)
+    todo = [t for t in tasks if t[0] not in done]
+    if done:
+        print(f"↩️ Resuming: {len(tasks) - len(todo)}/{len(tasks)} problems already in {output_path}")
 
-        prediction = solver.solve_problem(problem_text, id=problem_id)
-        pred_answer = prediction['answer']
+    directory = os.path.dirname(output_path)
+    if directory: os.makedirs(directory, exist_ok=True)
+    _drop_partial_line(output_path)
+    with open(output_path, "a") as f:
+        for record in _run(todo, solver_factory, workers):
+            record["variant"] = variant
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            done[record["id"]] = record
+            print(f"[{record['id']}] Predicted: {record['predicted']} | True: {record['true']} | "
+                  f"{record['status']} ({record['latency']:.2f}s, {record['samples']} samples)")
 
-        is_correct = (pred_answer == true_answer)
-        if is_correct:
-            correct += 1
+    details = [done[t[0]] for t in tasks if t[0] in done]
+    summary = summarize(details)
+    summary.update(variant=variant, workers=workers, details=details)
+    return summary
 
-        status = "✅ CORRECT" if is_correct else "❌ INCORRECT"
-        print(f"[{problem_id}] Predicted: {pred_answer} | True: {true_answer} | {status}")
 
-        results.append({
-            "id": problem_id,
-            "predicted": pred_answer,
-            "true": true_answer,
-            "status": status
-        })
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Evaluate AIMOMathSolver on the AIMO 3 reference set")
+    parser.add_argument("--ref", default=REF_PATH)
+    parser.add_argument("--variant", default="default", help="label for this solver configuration")
+    parser.add_argument("--output", help="JSONL results file (default: outcomes/technical/aimo_eval_<variant>.jsonl)")
+    parser.add_argument("--workers", type=int,
+                        help="0 = solve in-process (default with a real model; otherwise min(4, CPUs))")
+    parser.add_argument("--model", help="model path for the solver (default: the solver's own)")
+    parser.add_argument("--no-resume", action="store_true", help="discard earlier results for this variant")
+    parser.add_argument("--no-cache", action="store_true", help="always re-solve (for timing comparisons)")
+    args = parser.parse_args(argv)
+
+    print("🏆 AIMO 3 Performance Validation (Winning Numbers Showcase)")
+    print("="*60)
+
+    if not os.path.exists(args.ref):
+        print(f"❌ Error: Reference file not found at {args.ref}")
+        return
+
+    solver_kwargs = {} if args.model is None else {"model_id_or_path": args.model}
+    if not args.no_cache:
+        # Unchanged problems are answered from the cache of earlier runs
+        solver_kwargs["cache"] = SolveCache()
+    if args.workers is None:
+        args.workers = default_workers(args.model)
+    output = args.output or os.path.join(OUTPUT_DIR, f"aimo_eval_{args.variant}.jsonl")
+
+    summary = evaluate(load_tasks(args.ref), output, functools.partial(AIMOMathSolver, **solver_kwargs),
+                       workers=args.workers, resume=not args.no_resume, variant=args.variant)
 
-    accuracy = (correct / total) * 100
     print("="*60)
-    print(f"📊 FINAL SCORE: {correct}/{total} ({accuracy:.1f}%)")
+    print(f"📊 FINAL SCORE: {summary['score']} ({summary['accuracy']})")
+    print(f"⏱️ Latency p50 {summary['latency_p50']:.2f}s | p95 {summary['latency_p95']:.2f}s "
+          f"({summary['cache_hits']} cache hits excluded)")
+    print(f"🎲 Samples: {summary['samples_total']} ({summary['samples_mean']:.1f}/problem) | "
+          f"RTC hit rate {summary['rtc_hit_rate']:.1%}")
     print("="*60)
 
-    # Save validation results
-    os.makedirs("outcomes/technical", exist_ok=True)
-    with open("outcomes/technical/AIMO_PERFORMANCE_METRICS.json", "w") as f:
-        import json
-        json.dump({
-            "score": f"{correct}/{total}",
-            "accuracy": f"{accuracy:.1f}%",
-            "details": results
-        }, f, indent=2)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with open(METRICS_PATH, "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
 
 if __name__ == "__main__":
     main()
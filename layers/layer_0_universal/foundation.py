@@ -21,26 +21,310 @@ class Skill:
     def __post_init__(self):
         if self.embedding is None:
             self.embedding = self.to_vector()
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # SkillMatrix caches compare versions to notice reassignment (not in-place array edits)
+        object.__setattr__(self, "_version", self.__dict__.get("_version", 0) + 1)
     
     def to_vector(self) -> np.ndarray:
         return np.array([self.G, self.C, self.S, self.A, self.H, self.V, self.P, self.T])
     
     def q_score(self) -> float:
-        return (0.18 * self.G + 0.20 * self.C + 0.18 * self.S + 0.16 * self.A +
-                0.12 * self.H + 0.08 * self.V + 0.05 * self.P + 0.03 * self.T)
+        cached = self.__dict__.get("_q")
+        if cached is not None and cached[0] == self._version: return cached[1]
+        q = (0.18 * self.G + 0.20 * self.C + 0.18 * self.S + 0.16 * self.A +
+             0.12 * self.H + 0.08 * self.V + 0.05 * self.P + 0.03 * self.T)
+        object.__setattr__(self, "_q", (self._version, q))
+        return q
+
+DIMENSIONS = ("G", "C", "S", "A", "H", "V", "P", "T")
+Q_WEIGHTS = (0.18, 0.20, 0.18, 0.16, 0.12, 0.08, 0.05, 0.03)
+
+class SkillTable:
+    """
+    Struct-of-arrays skill registry: one (n x 8) dimension block plus priority,
+    cost, embedding and cached Q columns. Rows are handed out as SkillView
+    objects that read and write the columns in place.
+    """
+
+    def __init__(self, capacity: int = 64, embedding_dim: int = len(DIMENSIONS)):
+        capacity = max(1, capacity)
+        self.n = 0
+        self.names: List[str] = []
+        self.dims = np.zeros((capacity, len(DIMENSIONS)))
+        self.priority = np.zeros(capacity)
+        self.cost = np.zeros(capacity)
+        self.embeddings = np.zeros((capacity, embedding_dim))
+        self.q = np.zeros(capacity)
+        self.q_valid = np.zeros(capacity, dtype=bool)
+        self.row_versions = np.zeros(capacity, dtype=np.int64)
+        self.version = 0
+        self._matrix = None
+
+    @classmethod
+    def from_skills(cls, skills: List["Skill"]) -> "SkillTable":
+        skills = list(skills)
+        dim = len(skills[0].embedding) if skills else len(DIMENSIONS)
+        table = cls(capacity=len(skills), embedding_dim=dim)
+        table.extend(skills)
+        return table
+
+    def _grow(self, needed: int):
+        capacity = len(self.cost)
+        if needed <= capacity: return
+        new_capacity = max(needed, 2 * capacity)
+        for attr in ("dims", "priority", "cost", "embeddings", "q", "q_valid", "row_versions"):
+            old = getattr(self, attr)
+            grown = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            grown[:self.n] = old[:self.n]
+            setattr(self, attr, grown)
+
+    def add(self, name: str, G: float = 0.0, C: float = 0.0, S: float = 0.0, A: float = 0.0,
+            H: float = 0.0, V: float = 0.0, P: float = 0.0, T: float = 0.0,
+            priority: float = 0.5, cost: float = 1.0, embedding: Optional[np.ndarray] = None) -> "SkillView":
+        self._grow(self.n + 1)
+        i = self.n
+        self.names.append(name)
+        self.dims[i] = (G, C, S, A, H, V, P, T)
+        self.priority[i] = priority
+        self.cost[i] = cost
+        self.embeddings[i] = self.dims[i] if embedding is None else embedding
+        self.n += 1
+        self._touch(i)
+        return SkillView(self, i)
+
+    def add_skill(self, skill: "Skill") -> "SkillView":
+        return self.add(skill.name, *(getattr(skill, d) for d in DIMENSIONS),
+                        priority=skill.priority, cost=skill.cost, embedding=skill.embedding)
+
+    def extend(self, skills: List["Skill"]) -> List["SkillView"]:
+        return [self.add_skill(skill) for skill in skills]
+
+    def _touch(self, i: int):
+        self.q_valid[i] = False
+        self.row_versions[i] += 1
+        self.version += 1
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i: int) -> "SkillView":
+        if not -self.n <= i < self.n: raise IndexError(i)
+        return SkillView(self, i % self.n)
+
+    def __iter__(self):
+        return (SkillView(self, i) for i in range(self.n))
+
+    def q_scores(self) -> np.ndarray:
+        """Q for every row; only rows changed since the last call are recomputed."""
+        stale = np.flatnonzero(~self.q_valid[:self.n])
+        if stale.size:
+            d = self.dims[stale]
+            # Same term order as Skill.q_score, so the two agree bit for bit
+            q = Q_WEIGHTS[0] * d[:, 0]
+            for k in range(1, len(DIMENSIONS)):
+                q = q + Q_WEIGHTS[k] * d[:, k]
+            self.q[stale] = q
+            self.q_valid[stale] = True
+        return self.q[:self.n]
+
+    def utilities(self, task_embedding: np.ndarray) -> np.ndarray:
+        """compute_utility for every row: Q * max(0, cos(embedding, task))."""
+        task = np.asarray(task_embedding, dtype=float)
+        E = self.embeddings[:self.n]
+        norms = np.linalg.norm(E, axis=1) * np.linalg.norm(task)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sims = np.where(norms != 0, (E @ task) / norms, 0.0)
+        return self.q_scores() * np.maximum(0.0, sims)
+
+    def synthesize(self, indices: List[int], gamma: float = 0.35, custom_weights: Optional[List[float]] = None) -> "SkillView":
+        """synthesize_skills over table rows; the emergent skill is appended and returned."""
+        indices = list(indices)
+        if custom_weights is not None:
+            weights = np.array(custom_weights) / np.sum(custom_weights)
+        else:
+            q_scores = self.q_scores()[indices]
+            weights = q_scores / q_scores.sum()
+        vectors = self.dims[indices]
+        avg_vector = np.average(vectors, axis=0, weights=weights)
+        normalized_vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        tensor_term = np.prod(normalized_vectors, axis=0) * gamma
+        emergent_vector = np.clip(avg_vector + tensor_term, 0, 1)
+        return self.add(
+            "+".join(self.names[i] for i in indices), *emergent_vector,
+            priority=self.priority[indices].max(),
+            cost=self.cost[indices].sum() / len(indices)
+        )
+
+    def select(self, task_embedding: np.ndarray, budget: float = 10.0, gamma: float = 0.1) -> List[int]:
+        """select_skills over the table's rows."""
+        if self._matrix is None: self._matrix = SkillMatrix(self)
+        return self._matrix.select(task_embedding, budget, gamma)
+
+    def to_skill(self, i: int) -> "Skill":
+        return Skill(self.names[i], *self.dims[i].tolist(), priority=float(self.priority[i]),
+                     cost=float(self.cost[i]), embedding=self.embeddings[i].copy())
+
+class SkillView:
+    """A Skill-compatible handle on one SkillTable row."""
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: SkillTable, index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self.table.names[self.index]
+
+    @name.setter
+    def name(self, value: str):
+        self.table.names[self.index] = value
+
+    @property
+    def priority(self) -> float:
+        return float(self.table.priority[self.index])
+
+    @priority.setter
+    def priority(self, value: float):
+        self.table.priority[self.index] = value
+        self.table._touch(self.index)
+
+    @property
+    def cost(self) -> float:
+        return float(self.table.cost[self.index])
+
+    @cost.setter
+    def cost(self, value: float):
+        self.table.cost[self.index] = value
+        self.table._touch(self.index)
+
+    @property
+    def embedding(self) -> np.ndarray:
+        return self.table.embeddings[self.index]
+
+    @embedding.setter
+    def embedding(self, value: np.ndarray):
+        self.table.embeddings[self.index] = value
+        self.table._touch(self.index)
+
+    @property
+    def _version(self) -> int:
+        return int(self.table.row_versions[self.index])
+
+    def to_vector(self) -> np.ndarray:
+        return self.table.dims[self.index].copy()
+
+    def q_score(self) -> float:
+        t = self.table
+        if not t.q_valid[self.index]: t.q_scores()
+        return float(t.q[self.index])
+
+    def __repr__(self):
+        fields = ", ".join(f"{d}={getattr(self, d):.3f}" for d in DIMENSIONS)
+        return f"SkillView(name={self.name!r}, {fields}, priority={self.priority}, cost={self.cost})"
+
+def _dimension_property(k: int):
+    def fget(view: SkillView) -> float:
+        return float(view.table.dims[view.index, k])
+    def fset(view: SkillView, value: float):
+        view.table.dims[view.index, k] = value
+        view.table._touch(view.index)
+    return property(fget, fset)
+
+for _k, _d in enumerate(DIMENSIONS):
+    setattr(SkillView, _d, _dimension_property(_k))
 
 def cosine_similarity(v1: np.ndarray, v2: np.ndarray) -> float:
     dot_product = np.dot(v1, v2)
     norm_product = np.linalg.norm(v1) * np.linalg.norm(v2)
     return dot_product / norm_product if norm_product != 0 else 0.0
 
+class SkillMatrix:
+    """
+    A skill catalog as arrays: unit-normalized (n x d) embeddings, Q scores and
+    costs. Rebuilt lazily whenever a skill is reassigned; the cosine adjacency is
+    one cached matmul.
+    """
+
+    def __init__(self, skills):
+        # A SkillTable is used column-wise; any other iterable of skills is snapshotted
+        self.skills = skills if isinstance(skills, SkillTable) else list(skills)
+        self._versions = None
+        self._adjacency = None
+
+    def _refresh(self):
+        table = self.skills if isinstance(self.skills, SkillTable) else None
+        versions = (len(table), table.version) if table is not None else [s._version for s in self.skills]
+        if versions == self._versions: return
+        if table is not None:
+            E = table.embeddings[:len(table)]
+            self.q = table.q_scores().copy()
+            self.costs = table.cost[:len(table)].copy()
+        else:
+            E = np.array([s.embedding for s in self.skills], dtype=float).reshape(len(self.skills), -1)
+            self.q = np.array([s.q_score() for s in self.skills], dtype=float)
+            self.costs = np.array([s.cost for s in self.skills], dtype=float)
+        norms = np.linalg.norm(E, axis=1, keepdims=True)
+        self.unit = np.divide(E, norms, out=np.zeros_like(E), where=norms != 0)
+        self._adjacency = None
+        self._versions = versions
+
+    @property
+    def adjacency(self) -> np.ndarray:
+        self._refresh()
+        if self._adjacency is None:
+            self._adjacency = self.unit @ self.unit.T
+        return self._adjacency
+
+    @property
+    def factors(self) -> np.ndarray:
+        """Unit embeddings U with adjacency == U @ U.T, for matrix-free graph algorithms."""
+        self._refresh()
+        return self.unit
+
+    def utilities(self, task_embedding: np.ndarray) -> np.ndarray:
+        self._refresh()
+        task = np.asarray(task_embedding, dtype=float)
+        norm = np.linalg.norm(task)
+        if norm == 0: return np.zeros(len(self.skills))
+        return self.q * np.maximum(0.0, self.unit @ (task / norm))
+
+    def select(self, task_embedding: np.ndarray, budget: float = 10.0, gamma: float = 0.1) -> List[int]:
+        """
+        Greedy budgeted selection by (utility + gamma * synergy) / cost. The
+        synergy of every candidate with the selected set is one vector, updated
+        with a single adjacency column per pick (no n x n matrix needed).
+        """
+        utilities = self.utilities(task_embedding)
+        n = len(self.skills)
+        synergy = np.zeros(n)
+        available = np.ones(n, dtype=bool)
+        selected_indices = []
+        total_cost = 0.0
+        while len(selected_indices) < n and total_cost < budget:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                gain_per_cost = (utilities + synergy * gamma) / self.costs
+            gain_per_cost[~available | np.isnan(gain_per_cost)] = -np.inf
+            best_idx = int(np.argmax(gain_per_cost))
+            if gain_per_cost[best_idx] == -np.inf or total_cost + self.costs[best_idx] > budget: break
+            selected_indices.append(best_idx)
+            total_cost += float(self.costs[best_idx])
+            available[best_idx] = False
+            synergy += self.unit @ self.unit[best_idx]
+        return selected_indices
+
+def skill_matrix(skills: List[Skill]) -> SkillMatrix:
+    """SkillMatrix for skills; a SkillTable keeps and reuses its own."""
+    if isinstance(skills, SkillTable):
+        if skills._matrix is None: skills._matrix = SkillMatrix(skills)
+        return skills._matrix
+    # Plain lists are not cached here: a module-level cache would keep the caller's skills alive
+    return SkillMatrix(skills)
+
 def build_adjacency_matrix(skills: List[Skill]) -> np.ndarray:
-    n = len(skills)
-    A = np.zeros((n, n))
-    for i in range(n):
-        for j in range(n):
-            A[i, j] = cosine_similarity(skills[i].embedding, skills[j].embedding)
-    return A
+    return skill_matrix(skills).adjacency.copy()
 
 def compute_interaction(s1: Skill, s2: Skill, alpha: float = 0.7, beta: float = 0.3) -> float:
     sim = cosine_similarity(s1.embedding, s2.embedding)
@@ -80,24 +364,7 @@ def compute_utility(skill: Skill, task_embedding: np.ndarray) -> float:
     return skill.q_score() * max(0, sim)
 
 def select_skills(skills: List[Skill], task_embedding: np.ndarray, budget: float = 10.0, gamma: float = 0.1) -> List[int]:
-    n = len(skills)
-    selected_indices = []
-    total_cost = 0.0
-    A = build_adjacency_matrix(skills)
-    utilities = np.array([compute_utility(s, task_embedding) for s in skills])
-    remaining = list(range(n))
-    while remaining and total_cost < budget:
-        best_gain, best_idx = -np.inf, None
-        for i in remaining:
-            synergy = sum(A[i, j] for j in selected_indices) * gamma
-            gain_per_cost = (utilities[i] + synergy) / skills[i].cost
-            if gain_per_cost > best_gain:
-                best_gain, best_idx = gain_per_cost, i
-        if best_idx is None or total_cost + skills[best_idx].cost > budget: break
-        selected_indices.append(best_idx)
-        total_cost += skills[best_idx].cost
-        remaining.remove(best_idx)
-    return selected_indices
+    return skill_matrix(skills).select(task_embedding, budget, gamma)
 
 if __name__ == "__main__":
     meta_learning = Skill("Meta-Learning", G=0.95, C=0.92, S=0.95, A=0.98, H=0.95, V=0.92, P=0.90, T=0.90)
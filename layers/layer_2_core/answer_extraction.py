@@ -0,0 +1,171 @@
+"""
+ANSWER EXTRACTION ENGINE
+========================
+Final-answer extraction for AIMO completions.
+
+The old extractor ran five regexes with findall over the whole completion,
+then fell back to listing every digit run. Answers sit at the end of long
+chain-of-thought text, so this engine searches backwards from the end. It
+lowercases the text once (ASCII only, so indices still line up) and uses
+rfind for each marker, so it only looks at text before the last marker when
+the last one is unusable. The priority order is unchanged:
+
+    1. last closed \\boxed{...} (braces are balanced, so \\boxed{\\frac{1}{2}} is whole)
+    2. last "final answer is N"
+    3. last "answer is N"
+    4. last "boxed N"
+    5. last digit run in the text
+
+Boxed contents give their first integer, clamped at 0. Every result is taken
+mod 100000, and 0 means nothing was found.
+
+AnswerStream applies rule 1 incrementally while tokens are still arriving.
+It reports the answer as soon as a boxed expression closes, which a sampler
+can use to stop that sequence early.
+"""
+
+import re
+from typing import Optional
+
+MODULUS = 100000
+
+_NUMBER = re.compile(r"-?\d+")
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+_DIGITS = "0123456789"
+
+BOXED = "boxed"
+# (marker, tail matched right after it), in priority order after \boxed{...}
+_PHRASES = (
+    ("final answer is", re.compile(r"[:\s]*(\d+)")),
+    ("answer is", re.compile(r"[:\s]*(\d+)")),
+    (BOXED, re.compile(r"\s+(\d+)")),
+)
+_SPACE = re.compile(r"\s*")
+
+
+def _lower(text: str) -> str:
+    return text.translate(_ASCII_LOWER)
+
+
+def _boxed_at(text: str, i: int) -> Optional[int]:
+    """
+    For a "boxed" marker at i, the end of its balanced {...} group (index of
+    the closing brace), or None if it is not a \\boxed{ or has not closed yet.
+    """
+    if i == 0 or text[i - 1] != "\\":
+        return None
+    j = _SPACE.match(text, i + len(BOXED)).end()
+    if j >= len(text) or text[j] != "{":
+        return None
+    depth = 0
+    for k in range(j, len(text)):
+        c = text[k]
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return k
+    return None
+
+
+def _content(text: str, i: int, close: int) -> str:
+    return text[text.index("{", i) + 1:close]
+
+
+def boxed_value(content: str) -> Optional[int]:
+    """First integer inside a boxed expression (thousands separators ignored)."""
+    m = _NUMBER.search(content.replace(",", ""))
+    return max(0, int(m.group())) % MODULUS if m else None
+
+
+def last_boxed(text: str, lowered: Optional[str] = None) -> Optional[str]:
+    """Contents of the last closed \\boxed{...}, or None."""
+    low = lowered if lowered is not None else _lower(text)
+    i = low.rfind(BOXED)
+    while i >= 0:
+        close = _boxed_at(text, i)
+        if close is not None:
+            return _content(text, i, close)
+        i = low.rfind(BOXED, 0, i)
+    return None
+
+
+def _last_digit_run(text: str) -> Optional[str]:
+    end = max(text.rfind(d) for d in _DIGITS)
+    if end < 0:
+        return None
+    start = end
+    while start > 0 and text[start - 1] in _DIGITS:
+        start -= 1
+    return text[start:end + 1]
+
+
+def extract_answer(text: str) -> int:
+    """Final integer answer of a completion; see the module docstring for the rules."""
+    if not text:
+        return 0
+    low = _lower(text)
+    content = last_boxed(text, low)
+    if content is not None:
+        value = boxed_value(content)
+        if value is not None:
+            return value
+    for marker, tail in _PHRASES:
+        i = low.rfind(marker)
+        while i >= 0:
+            m = tail.match(text, i + len(marker))
+            if m:
+                return int(m.group(1)) % MODULUS
+            i = low.rfind(marker, 0, i)
+    digits = _last_digit_run(text)
+    return int(digits) % MODULUS if digits else 0
+
+
+class AnswerStream:
+    """
+    Watches generated text for a closed \\boxed{...} as it streams in.
+
+    feed() appends a chunk and returns the latest boxed answer so far (None
+    until one has closed). Text already scanned is never scanned again, except
+    for an open \\boxed{ that is still waiting for its closing brace.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.answer: Optional[int] = None
+        self.boxed: Optional[str] = None
+        self._scan = 0  # next position a "boxed" marker may start at
+
+    def feed(self, chunk: str) -> Optional[int]:
+        self.text += chunk
+        low = _lower(self.text[self._scan:])
+        offset = self._scan
+        i = low.find(BOXED)
+        while i >= 0:
+            at = offset + i
+            close = _boxed_at(self.text, at)
+            if close is None:
+                if self._is_open(at):
+                    self._scan = at  # wait for the rest of this group
+                    return self.answer
+            else:
+                content = _content(self.text, at, close)
+                value = boxed_value(content)
+                if value is not None:
+                    self.answer, self.boxed = value, content
+            i = low.find(BOXED, i + 1)
+        # A marker split across chunks is found once its last letter arrives
+        self._scan = max(self._scan, len(self.text) - len(BOXED) + 1)
+        return self.answer
+
+    def _is_open(self, at: int) -> bool:
+        """A \\boxed marker whose brace group has not closed (or not started) yet."""
+        if at == 0 or self.text[at - 1] != "\\":
+            return False
+        j = _SPACE.match(self.text, at + len(BOXED)).end()
+        return j >= len(self.text) or self.text[j] == "{"
+
+    @property
+    def finished(self) -> bool:
+        return self.answer is not None
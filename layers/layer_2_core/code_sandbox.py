@@ -0,0 +1,237 @@
+"""
+CODE SANDBOX POOL
+=================
+Pre-warmed Python workers for RTC (run-to-check) code execution.
+
+Spawning `python -c` per code block pays interpreter startup plus the sympy /
+numpy imports on every sample. SandboxPool keeps a few worker processes alive
+with the math libraries already imported and feeds them one snippet at a time
+over a pipe. Each snippet runs in a fresh globals dict with its stdout
+captured, and the recursion and int-digit limits are reset after it. Anything
+else a snippet changes inside the interpreter (sys.modules, attributes patched
+onto imported modules) stays for the rest of that worker's life; only a
+worker that times out, crashes or dies is killed and replaced. Workers cap
+their address space with RLIMIT_AS where the platform supports it.
+"""
+
+import json
+import os
+import queue
+import re
+import select
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+DEFAULT_PRELOAD = ("math", "cmath", "itertools", "functools", "fractions", "decimal",
+                   "collections", "numpy", "sympy")
+
+# Runs inside each worker. Requests arrive as JSON lines on the original stdin,
+# replies leave on a dup of the original stdout; fds 0/1 are pointed at devnull
+# so snippets can neither read the protocol nor corrupt it.
+WORKER_SOURCE = r'''
+import builtins, contextlib, io, json, os, sys, traceback
+requests = os.fdopen(os.dup(0), "r")
+replies = os.fdopen(os.dup(1), "w")
+devnull = os.open(os.devnull, os.O_RDWR)
+os.dup2(devnull, 0); os.dup2(devnull, 1)
+for name in json.loads(sys.argv[1]):
+    try: __import__(name)
+    except Exception: pass
+limit = int(sys.argv[2])
+if limit > 0:
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except Exception: pass
+recursion_limit = sys.getrecursionlimit()
+str_digits = getattr(sys, "get_int_max_str_digits", lambda: None)()
+replies.write(json.dumps({"ready": True}) + "\n"); replies.flush()
+for line in requests:
+    code = json.loads(line)["code"]
+    out = io.StringIO()
+    ok, error = True, None
+    try:
+        with contextlib.redirect_stdout(out):
+            exec(compile(code, "<rtc>", "exec"), {"__name__": "__main__", "__builtins__": builtins})
+    except SystemExit as e:
+        ok = e.code is None or e.code == 0
+        if not ok: error = f"SystemExit({e.code!r})"
+    except BaseException as e:
+        ok, error = False, f"{type(e).__name__}: {e}"
+    sys.setrecursionlimit(recursion_limit)
+    if str_digits is not None: sys.set_int_max_str_digits(str_digits)
+    replies.write(json.dumps({"ok": ok, "stdout": out.getvalue(), "error": error}) + "\n"); replies.flush()
+'''
+
+NUMERIC_PATTERN = re.compile(r"-?\d+")
+
+
+@dataclass
+class SandboxResult:
+    ok: bool
+    stdout: str = ""
+    error: Optional[str] = None  # exception text, "timeout" or "crash"
+    elapsed: float = 0.0
+
+
+def prepare_code(code: str) -> str:
+    """Bare one-line expressions are printed, as the RTC prompt format expects."""
+    if "\n" not in code.strip() and not code.strip().startswith("print"):
+        return f"print({code})"
+    return code
+
+
+def extract_rtc_answer(result: SandboxResult) -> Optional[int]:
+    """Last integer printed by a successful run, clamped at 0 and taken mod 100000."""
+    if not result.ok:
+        return None
+    nums = NUMERIC_PATTERN.findall(result.stdout.strip())
+    if nums:
+        return max(0, int(nums[-1])) % 100000
+    return None
+
+
+class _SandboxWorker:
+    def __init__(self, preload: Sequence[str], memory_limit_mb: Optional[int]):
+        limit = int(memory_limit_mb * 1024 * 1024) if memory_limit_mb else 0
+        self.proc = subprocess.Popen(
+            [sys.executable, "-c", WORKER_SOURCE, json.dumps(list(preload)), str(limit)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        self._buffer = b""
+        self.ready = False
+
+    def _read_line(self, deadline: Optional[float]) -> Optional[bytes]:
+        fd = self.proc.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            if not select.select([fd], [], [], remaining)[0]:
+                return None
+            chunk = os.read(fd, 1 << 16)
+            if not chunk:
+                raise EOFError("sandbox worker exited")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def run(self, code: str, timeout: float, startup_timeout: float) -> SandboxResult:
+        start = time.monotonic()
+        try:
+            if not self.ready:
+                # Warm-up (imports) does not count against the snippet's timeout
+                if self._read_line(start + startup_timeout) is None:
+                    return SandboxResult(False, error="timeout", elapsed=time.monotonic() - start)
+                self.ready = True
+                start = time.monotonic()
+            self.proc.stdin.write((json.dumps({"code": code}) + "\n").encode())
+            self.proc.stdin.flush()
+            line = self._read_line(start + timeout)
+        except (EOFError, OSError, BrokenPipeError):
+            return SandboxResult(False, error="crash", elapsed=time.monotonic() - start)
+        if line is None:
+            return SandboxResult(False, error="timeout", elapsed=time.monotonic() - start)
+        reply = json.loads(line)
+        return SandboxResult(reply["ok"], reply["stdout"], reply["error"], time.monotonic() - start)
+
+    @property
+    def healthy(self) -> bool:
+        return self.proc.poll() is None
+
+    def kill(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout):
+            try: stream.close()
+            except OSError: pass
+
+
+class SandboxPool:
+    """
+    Persistent pool of pre-warmed Python sandbox workers.
+
+    run() executes one snippet; submit_many() runs all candidate snippets of a
+    problem concurrently (one per worker) and returns results in input order.
+    """
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 timeout: float = 15.0,
+                 memory_limit_mb: Optional[int] = 2048,
+                 preload: Sequence[str] = DEFAULT_PRELOAD,
+                 startup_timeout: float = 120.0):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.preload = tuple(preload)
+        self.startup_timeout = startup_timeout
+        self.jobs = 0
+        self.restarts = 0
+        self._idle: "queue.Queue[_SandboxWorker]" = queue.Queue()
+        self._all: List[_SandboxWorker] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    def _spawn(self) -> _SandboxWorker:
+        worker = _SandboxWorker(self.preload, self.memory_limit_mb)
+        self._all.append(worker)
+        return worker
+
+    def start(self):
+        """Launch every worker now so their imports overlap with other work."""
+        while len(self._all) < self.workers:
+            self._idle.put(self._spawn())
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sandbox")
+        return self
+
+    def run(self, code: str, timeout: Optional[float] = None) -> SandboxResult:
+        if self._closed:
+            raise RuntimeError("SandboxPool is closed")
+        self.start()
+        worker = self._idle.get()
+        try:
+            result = worker.run(code, timeout or self.timeout, self.startup_timeout)
+        except Exception as e:
+            result = SandboxResult(False, error=f"{type(e).__name__}: {e}")
+        self.jobs += 1
+        if result.error in ("timeout", "crash") or not worker.healthy:
+            # A stuck or dead worker is replaced; the new one warms up on its next job
+            worker.kill()
+            self._all.remove(worker)
+            worker = self._spawn()
+            self.restarts += 1
+        self._idle.put(worker)
+        return result
+
+    def submit_many(self, codes: Sequence[str], timeout: Optional[float] = None) -> List[SandboxResult]:
+        """Run every snippet concurrently across the pool; results keep input order."""
+        if not codes:
+            return []
+        self.start()
+        return list(self._executor.map(lambda code: self.run(code, timeout), codes))
+
+    def close(self):
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for worker in self._all:
+            worker.kill()
+        self._all.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        try: self.close()
+        except Exception: pass
@@ -0,0 +1,133 @@
+"""
+CONSENSUS GENERATION
+====================
+All samples of one AIMO problem from a single batched Hugging Face generate.
+
+The prompt is tokenized once and expanded with num_return_sequences. While
+the batch decodes, ConsensusStop looks at the new text every `check_every`
+tokens. A sample that has written a closed \\boxed{...} is done, and once a
+strict majority of all samples agree on one boxed answer the whole batch
+stops. Samples still running at that point were cut off, and
+generate_samples reports them as unfinished so they do not vote.
+
+Per-row stopping (a bool tensor with one entry per sequence) needs
+transformers >= 4.39; older versions only accept a single bool and raise
+"ambiguous truth value" on a tensor. On those versions ConsensusStop answers
+for the whole batch: it still stops at consensus, but a sample that boxed
+its answer keeps decoding until then.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from layers.layer_2_core.answer_extraction import boxed_value, last_boxed
+
+try:
+    import torch
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
+try:
+    from transformers import StoppingCriteriaList
+    HAS_TRANSFORMERS = True
+except ImportError:
+    HAS_TRANSFORMERS = False
+
+PER_ROW_STOP_VERSION = (4, 39)
+
+
+def supports_per_row_stop() -> bool:
+    """True if the installed transformers accepts a per-sequence stopping mask."""
+    try:
+        import transformers
+    except ImportError:
+        return False
+    try:
+        version = tuple(int(part) for part in transformers.__version__.split(".")[:2])
+    except ValueError:
+        return False
+    return version >= PER_ROW_STOP_VERSION
+
+
+class ConsensusStop:
+    """
+    Stopping criterion for one batched generate (used through StoppingCriteriaList).
+
+    answers: row -> boxed answer, for every sample that has boxed one
+    consensus: the majority answer once the batch stopped on it, else None
+    """
+
+    def __init__(self, tokenizer, prompt_len: int, num_samples: int,
+                 check_every: int = 32, per_row: bool = True):
+        self.tokenizer = tokenizer
+        self.prompt_len = prompt_len
+        self.num_samples = num_samples
+        self.check_every = check_every
+        self.per_row = per_row
+        self.answers: Dict[int, int] = {}
+        self.consensus: Optional[int] = None
+
+    def check(self, input_ids) -> List[bool]:
+        """Per-row done flags for the batch so far."""
+        rows = input_ids.shape[0]
+        new_tokens = input_ids.shape[1] - self.prompt_len
+        if new_tokens > 0 and new_tokens % self.check_every == 0:
+            pending = [i for i in range(rows) if i not in self.answers]
+            if pending:
+                texts = self.tokenizer.batch_decode(input_ids[pending, self.prompt_len:], skip_special_tokens=True)
+                for i, text in zip(pending, texts):
+                    boxed = last_boxed(text)
+                    answer = boxed_value(boxed) if boxed is not None else None
+                    if answer is not None:
+                        self.answers[i] = answer
+            if self.answers:
+                answer, votes = Counter(self.answers.values()).most_common(1)[0]
+                if votes > self.num_samples // 2:
+                    self.consensus = answer
+        if self.consensus is not None:
+            return [True] * rows
+        return [i in self.answers for i in range(rows)]
+
+    def __call__(self, input_ids, scores, **kwargs):
+        done = self.check(input_ids)
+        if not self.per_row:
+            return all(done)
+        if HAS_TORCH and isinstance(input_ids, torch.Tensor):
+            return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+        return np.array(done, dtype=bool)
+
+    def finished(self, last_tokens: Sequence[int], eos_token_id: Optional[int]) -> List[bool]:
+        """
+        Which returned samples are complete. Without a consensus stop every
+        sample ran to EOS or max_new_tokens; after one, only samples that
+        boxed an answer or had already ended (EOS, also the padding) count.
+        """
+        if self.consensus is None:
+            return [True] * len(last_tokens)
+        return [i in self.answers or int(token) == eos_token_id for i, token in enumerate(last_tokens)]
+
+
+def generate_samples(model, tokenizer, prompt: str, num_samples: int,
+                     max_new_tokens: int = 1024, temperature: float = 0.6,
+                     check_every: int = 32, per_row: Optional[bool] = None) -> Tuple[List[str], List[bool]]:
+    """
+    All samples for one problem from one generate call. Returns (responses,
+    finished); finished[i] is False for a sample cut off by the consensus stop.
+    per_row defaults to what the installed transformers supports.
+    """
+    if per_row is None:
+        per_row = supports_per_row_stop()
+    inputs = tokenizer(prompt, return_tensors='pt').to(model.device)
+    inputs = {k: v for k, v in inputs.items() if k in ['input_ids', 'attention_mask']}
+    stopper = ConsensusStop(tokenizer, inputs['input_ids'].shape[1], num_samples, check_every, per_row)
+    criteria = StoppingCriteriaList([stopper]) if HAS_TRANSFORMERS else [stopper]
+    outputs = model.generate(
+        **inputs, max_new_tokens=max_new_tokens, temperature=temperature, do_sample=True,
+        num_return_sequences=num_samples, pad_token_id=tokenizer.eos_token_id,
+        stopping_criteria=criteria
+    )
+    responses = tokenizer.batch_decode(outputs, skip_special_tokens=True)
+    return responses, stopper.finished([row[-1] for row in outputs], tokenizer.eos_token_id)
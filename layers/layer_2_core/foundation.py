@@ -9,10 +9,11 @@ From skill-ecosystem-integration-guide.md
 import sys
 sys.path.append('/home/claude')
 
-from layers.layer_0_universal.foundation import Skill, build_adjacency_matrix, synthesize_skills
+from layers.layer_0_universal.foundation import Skill, build_adjacency_matrix, skill_matrix, synthesize_skills
+from layers.layer_2_core.spectral_graph import SpectralGraphService, get_spectral_service
 from layers.layer_1_domain.foundation import create_layer1_ecosystem
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from collections import defaultdict
 from dataclasses import dataclass
 import json
@@ -83,11 +84,13 @@ class PatternDetectionEngine:
     Complexity: O(n log n)
     """
     
-    def __init__(self):
+    def __init__(self, spectral: Optional[SpectralGraphService] = None):
         self.skill = Skill(
             name="Pattern-Detection-Engine",
             G=0.94, C=0.92, S=0.95, A=0.96, H=0.94, V=0.96, P=0.95, T=0.93
         )
+        # Laplacians/eigenpairs are cached by graph content in the shared service
+        self.spectral = spectral or get_spectral_service()
     
     def detect_communities(self, skills: List[Skill]) -> Dict:
         """
@@ -95,26 +98,25 @@ class PatternDetectionEngine:
         
         L = D - A (Laplacian)
         Eigendecomposition: L v = λ v
+        
+        Above the service's dense_limit the cosine graph A = U Uᵀ is never
+        materialized: only the k+1 smallest eigenpairs are solved matrix-free.
         """
         n = len(skills)
         if n < 2:
             return {"communities": [], "modularity": 0.0}
         
-        # Build adjacency matrix
-        A = build_adjacency_matrix(skills)
-        
-        # Degree matrix
-        D = np.diag(A.sum(axis=1))
-        
-        # Laplacian
-        L = D - A
-        
-        # Eigendecomposition
-        eigenvalues, eigenvectors = np.linalg.eigh(L)
-        
         # Use k smallest non-zero eigenvalues for clustering
         k = min(3, n - 1)  # Number of communities
         
+        if n <= self.spectral.dense_limit:
+            # Build adjacency matrix; full eigendecomposition of L = D - A
+            A = build_adjacency_matrix(skills)
+            eigenvalues, eigenvectors = self.spectral.eigenpairs(A)
+        else:
+            U = skill_matrix(skills).factors
+            eigenvalues, eigenvectors = self.spectral.factored_eigenpairs(U, k + 1)
+        
         # Simple clustering based on eigenvector signs
         communities = []
         for i in range(k):
@@ -124,7 +126,10 @@ class PatternDetectionEngine:
                     communities.append(community)
         
         # Calculate modularity
-        modularity = self._compute_modularity(A, communities)
+        if n <= self.spectral.dense_limit:
+            modularity = self._compute_modularity(A, communities)
+        else:
+            modularity = self.spectral.factored_modularity(U, communities)
         
         return {
             "communities": communities,
@@ -136,22 +141,7 @@ class PatternDetectionEngine:
         """
         Q_modularity = (1/2m) Σᵢⱼ [Aᵢⱼ - (kᵢkⱼ/2m)] δ(cᵢ, cⱼ)
         """
-        m = A.sum() / 2  # Total edges
-        if m == 0:
-            return 0.0
-        
-        n = A.shape[0]
-        k = A.sum(axis=1)  # Degrees
-        
-        Q = 0.0
-        for community in communities:
-            for i in community:
-                for j in community:
-                    Q += A[i, j] - (k[i] * k[j]) / (2 * m)
-        
-        Q /= (2 * m)
-        
-        return Q
+        return self.spectral.modularity(A, communities)
 
 # ============================================================================
 # Q-SCORE-OPTIMIZER (Q=0.928)
@@ -4,13 +4,15 @@ A mathematically rigorous model of volitional agency
 Author: Claude (Optimized Prompt Execution)
 """
 
+import multiprocessing as mp
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional, Sequence
 from dataclasses import dataclass
 from scipy.special import xlogy
-from scipy.linalg import eigvalsh
 import networkx as nx
 
+from layers.layer_2_core.spectral_graph import SpectralGraphService, get_spectral_service
+
 # ============================================================================
 # PART 1: MATHEMATICAL FOUNDATIONS
 # ============================================================================
@@ -29,6 +31,128 @@ class AgentState:
                 self.meta_belief.size + self.action_repertoire.size)
 
 
+def vectorized(dynamics_model: callable) -> callable:
+    """
+    Mark a dynamics model as batch-aware.
+
+    A vectorized model maps states (batch, dim) and actions (batch, action_dim)
+    to next states (batch, dim) in one call, so every rollout advances in lockstep.
+    Unmarked models keep the single-state signature f(state, action).
+    """
+    dynamics_model.vectorized = True
+    return dynamics_model
+
+
+def quantize_states(states: np.ndarray, decimals: int) -> np.ndarray:
+    """Snap states to a 10^-decimals grid as integer keys (same cells as np.round)."""
+    return np.rint(np.asarray(states) * 10.0 ** decimals).astype(np.int64)
+
+
+def _row_view(keys: np.ndarray) -> np.ndarray:
+    """View each row of integer keys as one opaque item so np.unique runs 1-D."""
+    keys = np.ascontiguousarray(keys.reshape(-1, keys.shape[-1]))
+    return keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1]))).ravel()
+
+
+def count_unique_states(keys: np.ndarray) -> int:
+    """Number of distinct grid cells among the rows of keys (..., dim)."""
+    return len(np.unique(_row_view(keys)))
+
+
+def _pad_actions(actions: np.ndarray, dim: int) -> np.ndarray:
+    """Truncate or zero-pad action vectors (batch, action_dim) to the state dimension."""
+    if actions.shape[1] >= dim:
+        return actions[:, :dim]
+    return np.pad(actions, ((0, 0), (0, dim - actions.shape[1])))
+
+
+_worker_dynamics = None
+
+def _init_rollout_worker(dynamics_model: callable):
+    global _worker_dynamics
+    _worker_dynamics = dynamics_model
+
+def _rollout_chunk(task) -> np.ndarray:
+    """Run a slice of rollouts with a single-state model inside a pool worker."""
+    start_states, actions, seed = task
+    # Forked workers share the parent's global RNG state; reseed so noisy dynamics stay independent.
+    np.random.seed(seed)
+    states = start_states.copy()
+    trajectory = np.empty((len(actions),) + states.shape)
+    for t, step_actions in enumerate(actions):
+        states = np.array([_worker_dynamics(s, a) for s, a in zip(states, step_actions)])
+        trajectory[t] = states
+    return trajectory
+
+
+class RolloutEngine:
+    """
+    Batched Monte Carlo rollouts of a dynamics model.
+
+    Vectorized models (see @vectorized) take the whole batch per step. Single-state
+    models are applied row by row, or across a fork-based process pool when
+    workers > 0, where each worker runs its slice of rollouts over the full horizon.
+    """
+
+    def __init__(self, dynamics_model: callable, workers: int = 0, rng=None):
+        self.dynamics_model = dynamics_model
+        self.is_vectorized = getattr(dynamics_model, 'vectorized', False)
+        self.workers = 0 if self.is_vectorized else workers
+        self.rng = rng if rng is not None else np.random
+        self._pool = None
+
+    def step(self, states: np.ndarray, actions: np.ndarray) -> np.ndarray:
+        """Advance every state (batch, dim) by its action (batch, action_dim)."""
+        if self.is_vectorized:
+            return np.asarray(self.dynamics_model(states, actions), dtype=float)
+        return np.array([self.dynamics_model(s, a) for s, a in zip(states, actions)], dtype=float)
+
+    def rollout(self,
+                start_state: np.ndarray,
+                action_indices: np.ndarray,
+                action_space: np.ndarray) -> np.ndarray:
+        """
+        Simulate len(action_indices) rollouts from start_state.
+
+        Args:
+            action_indices: (batch, horizon) indices into action_space
+
+        Returns:
+            Visited states, shaped (horizon, batch, dim)
+        """
+        batch, horizon = action_indices.shape
+        states = np.repeat(np.asarray(start_state, dtype=float)[None, :], batch, axis=0)
+        actions = action_space[action_indices.T]  # (horizon, batch, action_dim)
+        if self.workers > 0 and batch > 1:
+            return self._rollout_pool(states, actions)
+
+        trajectory = np.empty((horizon,) + states.shape)
+        for t in range(horizon):
+            states = self.step(states, actions[t])
+            trajectory[t] = states
+        return trajectory
+
+    def _rollout_pool(self, states: np.ndarray, actions: np.ndarray) -> np.ndarray:
+        if self._pool is None:
+            ctx = mp.get_context("fork")
+            self._pool = ctx.Pool(self.workers, initializer=_init_rollout_worker, initargs=(self.dynamics_model,))
+        bounds = np.array_split(np.arange(len(states)), min(self.workers, len(states)))
+        seeds = self.rng.randint(0, 2**31 - 1, len(bounds))
+        tasks = [(states[idx], actions[:, idx], int(seed)) for idx, seed in zip(bounds, seeds)]
+        return np.concatenate(self._pool.map(_rollout_chunk, tasks), axis=1)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
 class CausalEntropyCalculator:
     """
     Implements Wissner-Gross & Freer's Causal Entropic Forcing
@@ -39,9 +163,25 @@ class CausalEntropyCalculator:
     Physical Interpretation: Actions that maximize future freedom
     """
     
-    def __init__(self, time_horizon: int = 50, temperature: float = 1.0):
+    def __init__(self, time_horizon: int = 50, temperature: float = 1.0,
+                 n_samples: int = 1000, workers: int = 0):
         self.tau = time_horizon  # Planning horizon
         self.T = temperature     # Exploration vs exploitation
+        self.n_samples = n_samples
+        self.workers = workers   # Process pool size for non-vectorized dynamics
+        self._engine: Optional[RolloutEngine] = None
+
+    def _rollouts(self, dynamics_model: callable) -> RolloutEngine:
+        """Reuse one engine (and its worker pool) while the dynamics model stays the same."""
+        if self._engine is None or self._engine.dynamics_model is not dynamics_model:
+            self.close()
+            self._engine = RolloutEngine(dynamics_model, workers=self.workers)
+        return self._engine
+
+    def close(self):
+        if self._engine is not None:
+            self._engine.close()
+            self._engine = None
         
     def compute_causal_entropy(self, 
                                current_state: np.ndarray,
@@ -52,79 +192,49 @@ class CausalEntropyCalculator:
         
         Args:
             current_state: Current agent state vector
-            dynamics_model: Function S_t+1 = f(S_t, A_t)
+            dynamics_model: Function S_t+1 = f(S_t, A_t), or a @vectorized batch model
             action_space: Set of possible actions
             
         Returns:
             Causal entropy in nats
         """
-        # Monte Carlo estimation of reachable state volume
-        n_samples = 1000
-        reachable_states = set()
-        
-        for _ in range(n_samples):
-            # Random action sequence
-            action_sequence = action_space[
-                np.random.randint(0, len(action_space), self.tau)
-            ]
-            
-            # Forward simulate
-            state = current_state.copy()
-            for action in action_sequence:
-                state = dynamics_model(state, action)
-                # Discretize for set membership (hash to grid)
-                state_hash = tuple(np.round(state, decimals=2))
-                reachable_states.add(state_hash)
+        # Monte Carlo estimation of reachable state volume: all rollouts in lockstep
+        action_indices = np.random.randint(0, len(action_space), (self.n_samples, self.tau))
+        trajectory = self._rollouts(dynamics_model).rollout(current_state, action_indices, action_space)
+        
+        # Discretize every visited state to the 0.01 grid and count distinct cells
+        n_reachable = count_unique_states(quantize_states(trajectory, decimals=2))
         
         # Causal entropy = log of volume
-        return np.log(len(reachable_states) + 1)  # +1 to avoid log(0)
+        return np.log(n_reachable + 1)  # +1 to avoid log(0)
     
     def compute_empowerment(self,
                            current_state: np.ndarray,
                            dynamics_model: callable,
                            action_space: np.ndarray,
-                           n_steps: int = 3) -> float:
+                           n_steps: int = 3,
+                           n_samples: int = 500) -> float:
         """
         Empowerment: I(A_{1:n}; S_{t+n} | S_t)
         Mutual information between action sequences and resulting states
         
         Measures: "How much control do I have over my future?"
         """
-        n_samples = 500
-        state_given_action = {}  # P(S_future | A_sequence)
-        
-        for _ in range(n_samples):
-            # Sample action sequence
-            action_seq = tuple(action_space[
-                np.random.randint(0, len(action_space), n_steps)
-            ].flatten())
-            
-            # Simulate
-            state = current_state.copy()
-            for action in action_seq:
-                state = dynamics_model(state, action.reshape(-1))
-            
-            state_hash = tuple(np.round(state, decimals=2))
-            
-            if action_seq not in state_given_action:
-                state_given_action[action_seq] = []
-            state_given_action[action_seq].append(state_hash)
-        
-        # Compute mutual information (simplified)
-        # I(A;S) ≈ H(S) - H(S|A)
-        all_states = [s for states in state_given_action.values() for s in states]
-        
-        # Entropy of future states
-        unique_states, counts = np.unique(all_states, return_counts=True, axis=0)
-        p_states = counts / counts.sum()
-        H_states = -xlogy(p_states, p_states).sum()
-        
-        # Conditional entropy H(S|A)
-        H_conditional = 0
-        for action_seq, states in state_given_action.items():
-            unique, counts = np.unique(states, return_counts=True, axis=0)
-            p = counts / counts.sum()
-            H_conditional += len(states) / len(all_states) * (-xlogy(p, p).sum())
+        action_indices = np.random.randint(0, len(action_space), (n_samples, n_steps))
+        final_states = self._rollouts(dynamics_model).rollout(current_state, action_indices, action_space)[-1]
+        
+        # Integer ids for each action sequence and each discretized final state
+        _, action_ids = np.unique(action_indices, axis=0, return_inverse=True)
+        _, state_ids = np.unique(_row_view(quantize_states(final_states, decimals=2)), return_inverse=True)
+        action_ids, state_ids = action_ids.ravel(), state_ids.ravel()
+        
+        def entropy(ids: np.ndarray) -> float:
+            p = np.unique(ids, return_counts=True)[1] / len(ids)
+            return -xlogy(p, p).sum()
+        
+        # I(A;S) = H(S) - H(S|A), with H(S|A) = H(A,S) - H(A)
+        H_states = entropy(state_ids)
+        H_conditional = entropy(action_ids * (state_ids.max() + 1) + state_ids) - entropy(action_ids)
         
         empowerment = H_states - H_conditional
         return max(0, empowerment)  # Ensure non-negative
@@ -140,6 +250,14 @@ class IntegratedInformationCalculator:
     Tononi's IIT 3.0 simplified for computational tractability
     """
     
+    def __init__(self, spectral: Optional[SpectralGraphService] = None):
+        # Spectra are cached by connectivity content; population sweeps share one graph
+        self.spectral = spectral or get_spectral_service()
+        
+    def laplacian_spectrum(self, connectivity_matrix: np.ndarray) -> np.ndarray:
+        """Sorted Laplacian eigenvalues, reused while the connectivity matrix is unchanged"""
+        return self.spectral.eigenvalues(connectivity_matrix)
+    
     def compute_phi(self, 
                     connectivity_matrix: np.ndarray,
                     state: np.ndarray) -> float:
@@ -151,21 +269,9 @@ class IntegratedInformationCalculator:
         Simplified: Use spectral gap of Laplacian as proxy
         (computational shortcut - full IIT is NP-hard)
         """
-        # Build graph Laplacian
-        n = len(connectivity_matrix)
-        degree = np.diag(connectivity_matrix.sum(axis=1))
-        laplacian = degree - connectivity_matrix
-        
-        # Compute eigenvalues
-        eigenvalues = eigvalsh(laplacian)
-        eigenvalues = np.sort(eigenvalues)
-        
         # Spectral gap = λ_2 - λ_1 (Fiedler value)
         # Larger gap = more integrated
-        if len(eigenvalues) > 1:
-            spectral_gap = eigenvalues[1] - eigenvalues[0]
-        else:
-            spectral_gap = 0
+        spectral_gap = self.spectral.fiedler_value(connectivity_matrix)
             
         # Normalize to [0, 1]
         phi = np.tanh(spectral_gap)
@@ -188,22 +294,18 @@ class CounterfactualDepthCalculator:
         Returns:
             (n_distinct_futures, average_divergence)
         """
-        futures = {}
-        
-        for action in action_space:
-            # Simulate one step
-            next_state = dynamics_model(current_state, action)
-            state_hash = tuple(np.round(next_state, decimals=1))
-            
-            if state_hash not in futures:
-                futures[state_hash] = []
-            futures[state_hash].append(action)
+        # One batched step per action
+        next_states = RolloutEngine(dynamics_model).step(
+            np.repeat(np.asarray(current_state, dtype=float)[None, :], len(action_space), axis=0),
+            action_space
+        )
+        futures = np.unique(quantize_states(next_states, decimals=1), axis=0)
         
         n_distinct = len(futures)
         
         # Average divergence between futures
-        if len(futures) > 1:
-            future_states = np.array([list(k) for k in futures.keys()])
+        if n_distinct > 1:
+            future_states = futures * 0.1
             pairwise_dist = np.linalg.norm(
                 future_states[:, None] - future_states[None, :],
                 axis=2
@@ -361,6 +463,67 @@ class FreeWillIndex:
             'counterfactual_count': int(n_cf),
             'counterfactual_divergence': float(divergence)
         }
+    
+    def _compute_seeded(self, agent_state: AgentState, seed: int, *shared) -> Dict[str, float]:
+        """compute() under a fixed global RNG seed, leaving the caller's RNG state untouched"""
+        saved = np.random.get_state()
+        np.random.seed(seed)
+        try:
+            return self.compute(agent_state, *shared)
+        finally:
+            np.random.set_state(saved)
+    
+    def compute_many(self,
+                     agent_states: Sequence[AgentState],
+                     dynamics_model: callable,
+                     connectivity_matrix: np.ndarray,
+                     constitutional_bounds: np.ndarray,
+                     prediction_error: float = 0.1,
+                     workers: int = 0,
+                     seed: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, float]]]:
+        """
+        Score a population of agents sharing dynamics, connectivity and bounds
+        
+        Yields (index, result) pairs as agents finish: in input order when serial,
+        in completion order across a fork-based pool when workers > 0. Agent i
+        always runs under the i-th child of SeedSequence(seed), so results do not
+        depend on the worker count or scheduling.
+        """
+        agent_states = list(agent_states)
+        if seed is None:
+            seed = np.random.randint(0, 2**31 - 1)
+        seeds = [int(child.generate_state(1)[0])
+                 for child in np.random.SeedSequence(seed).spawn(len(agent_states))]
+        
+        # Decompose the shared Laplacian once; forked workers inherit the cached spectrum
+        self.phi_calc.laplacian_spectrum(connectivity_matrix)
+        
+        shared = (dynamics_model, connectivity_matrix, constitutional_bounds, prediction_error)
+        tasks = zip(range(len(agent_states)), agent_states, seeds)
+        if workers > 0 and len(agent_states) > 1:
+            n_workers = min(workers, len(agent_states))
+            chunksize = max(1, len(agent_states) // (n_workers * 8))
+            ctx = mp.get_context("fork")
+            with ctx.Pool(n_workers, initializer=_init_fwi_worker, initargs=(self,) + shared) as pool:
+                yield from pool.imap_unordered(_fwi_task, tasks, chunksize)
+        else:
+            for i, agent_state, agent_seed in tasks:
+                yield i, self._compute_seeded(agent_state, agent_seed, *shared)
+
+
+_worker_fwi = None
+_worker_shared = ()
+
+def _init_fwi_worker(fwi: FreeWillIndex, *shared):
+    global _worker_fwi, _worker_shared
+    # Pool workers are daemonic and cannot fork rollout pools of their own
+    fwi.causal_calc.workers = 0
+    fwi.causal_calc._engine = None
+    _worker_fwi, _worker_shared = fwi, shared
+
+def _fwi_task(task) -> Tuple[int, Dict[str, float]]:
+    i, agent_state, seed = task
+    return i, _worker_fwi._compute_seeded(agent_state, seed, *_worker_shared)
 
 
 # ============================================================================
@@ -549,13 +712,13 @@ def run_free_will_simulation():
     print(f"   Belief State Dim: {len(agent.belief_state)}")
     print(f"   Action Repertoire: {len(agent.action_repertoire)} actions")
     
-    # 2. Define simple dynamics
-    def simple_dynamics(state: np.ndarray, action: np.ndarray) -> np.ndarray:
+    # 2. Define simple dynamics (batched: states are (n_rollouts, n_beliefs))
+    @vectorized
+    def simple_dynamics(states: np.ndarray, actions: np.ndarray) -> np.ndarray:
         """Linear dynamics with noise"""
-        # Ensure action is flattened and matches state dimension
-        action_flat = action.flatten()
-        action_projected = action_flat[:len(state)] if len(action_flat) >= len(state) else np.pad(action_flat, (0, len(state) - len(action_flat)))
-        return 0.9 * state + 0.1 * action_projected + np.random.randn(len(state)) * 0.01
+        # Project actions onto the state dimension
+        actions_projected = _pad_actions(actions, states.shape[1])
+        return 0.9 * states + 0.1 * actions_projected + np.random.randn(*states.shape) * 0.01
     
     # 3. Define connectivity (simplified - random graph)
     connectivity = np.random.rand(n_beliefs, n_beliefs)
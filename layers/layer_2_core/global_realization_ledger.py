@@ -1,31 +1,172 @@
 import json
 import hashlib
 import os
+import queue
+import threading
+import time
+import atexit
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterable
 from collections import defaultdict
 
+
+class LedgerBackend:
+    """
+    Storage contract for the Global Realization Ledger.
+    A backend persists node inserts and parent->child link updates, and can
+    rebuild the full realizations dict on startup.
+    """
+    def load(self) -> Dict[str, Dict]:
+        raise NotImplementedError
+
+    def append(self, records: Iterable[Dict[str, Any]], realizations: Dict[str, Dict]):
+        """Persist new records. `realizations` is the full in-memory view after applying them."""
+        raise NotImplementedError
+
+    def compact(self, realizations: Dict[str, Dict]):
+        """Write the full in-memory view as the new durable baseline."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class JsonSnapshotBackend(LedgerBackend):
+    """Legacy backend: every append rewrites the whole JSON snapshot."""
+    def __init__(self, ledger_path: str):
+        self.ledger_path = ledger_path
+
+    def load(self) -> Dict[str, Dict]:
+        return _read_snapshot(self.ledger_path)
+
+    def append(self, records, realizations):
+        self.compact(realizations)
+
+    def compact(self, realizations):
+        _write_snapshot(self.ledger_path, realizations)
+
+
+class WALLedgerBackend(LedgerBackend):
+    """
+    Append-only write-ahead log on top of the JSON snapshot.
+
+    - Inserts and child-link updates are appended as one JSON record per line
+      to `<ledger_path>.wal` ({"op": "node", ...} / {"op": "link", ...}).
+    - Startup replays snapshot + WAL tail. A torn final write from a crash is
+      cut off the file, so later appends start on a clean line.
+    - Once the WAL holds `compact_every` records it is folded into the snapshot.
+    """
+    def __init__(self, ledger_path: str, compact_every: int = 1000, fsync: bool = False):
+        self.ledger_path = ledger_path
+        self.wal_path = ledger_path + ".wal"
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.wal_records = 0
+
+    def load(self) -> Dict[str, Dict]:
+        realizations = _read_snapshot(self.ledger_path)
+        self.wal_records = 0
+        if not os.path.exists(self.wal_path):
+            return realizations
+        good_end = 0  # byte offset just past the last intact record
+        torn = False
+        with open(self.wal_path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash: everything before it is intact.
+                        torn = True
+                        break
+                    apply_record(realizations, record)
+                    self.wal_records += 1
+                good_end += len(line)
+        with open(self.wal_path, "rb+") as f:
+            if torn:
+                f.truncate(good_end)
+                print(f"⚠️ Ledger WAL: dropped torn tail after {self.wal_records} records.")
+            if good_end:
+                f.seek(good_end - 1)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+        return realizations
+
+    def append(self, records, realizations):
+        lines = [json.dumps(r, ensure_ascii=False) + "\n" for r in records]
+        if not lines: return
+        _ensure_parent_dir(self.wal_path)
+        with open(self.wal_path, "a") as f:
+            f.writelines(lines)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        self.wal_records += len(lines)
+        if self.wal_records >= self.compact_every:
+            self.compact(realizations)
+
+    def compact(self, realizations):
+        _write_snapshot(self.ledger_path, realizations)
+        if os.path.exists(self.wal_path):
+            os.remove(self.wal_path)
+        self.wal_records = 0
+        print(f"🗜️ Ledger WAL Compacted into snapshot ({len(realizations)} nodes).")
+
+
+def apply_record(realizations: Dict[str, Dict], record: Dict[str, Any]):
+    """Apply a single WAL record to an in-memory realizations dict (idempotent)."""
+    op = record.get("op")
+    if op == "node":
+        node = record["data"]
+        realizations.setdefault(node["id"], node)
+    elif op == "link":
+        parent = realizations.get(record["parent"])
+        if parent is not None and record["child"] not in parent["children"]:
+            parent["children"].append(record["child"])
+
+
+def _ensure_parent_dir(path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+def _read_snapshot(path: str) -> Dict[str, Dict]:
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            try:
+                return json.load(f)
+            except:
+                return {}
+    return {}
+
+
+def _write_snapshot(path: str, realizations: Dict[str, Dict]):
+    _ensure_parent_dir(path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(realizations, f, indent=2)
+    os.replace(tmp_path, path)
+
+
 class GlobalRealizationLedger:
     """
     Project Beta: Global Realization Ledger (Phase 7 Scaled Version)
     Goal: High-integrity, high-throughput store for knowledge DAGs.
     """
-    def __init__(self, ledger_path: str = "layers/layer_1_domain/global_ledger.json"):
+    def __init__(self, ledger_path: str = "layers/layer_1_domain/global_ledger.json", backend: Optional[LedgerBackend] = None, buffer_limit: Optional[int] = 10):
         self.ledger_path = ledger_path
+        self.buffer_limit = buffer_limit
+        self.backend = backend or WALLedgerBackend(ledger_path)
         self.realizations = self._load_ledger()
         self.layer_index = defaultdict(list)
         self._rebuild_index()
         self.buffer = []
+        self._pending_records = []
         print(f"💎 Scaled Ledger Active: {len(self.realizations)} nodes indexed.")
 
     def _load_ledger(self) -> Dict[str, Dict]:
-        if os.path.exists(self.ledger_path):
-            with open(self.ledger_path, "r") as f:
-                try:
-                    return json.load(f)
-                except:
-                    return {}
-        return {}
+        return self.backend.load()
 
     def _rebuild_index(self):
         self.layer_index.clear()
@@ -46,38 +187,55 @@ class GlobalRealizationLedger:
             "metadata": metadata or {}, "timestamp": datetime.now().isoformat()
         }
 
+        records = [{"op": "node", "data": realization}]
         for pid in realization["parents"]:
             if pid in self.realizations:
                 if rid not in self.realizations[pid]["children"]:
                     self.realizations[pid]["children"].append(rid)
+                    records.append({"op": "link", "parent": pid, "child": rid})
 
         self.realizations[rid] = realization
         self.layer_index[layer].append(rid)
+        self._pending_records.extend(records)
 
         if immediate_save:
-            self._save_ledger()
+            self._persist_pending()
         else:
             self.buffer.append(rid)
-            if len(self.buffer) >= 10:
+            if self.buffer_limit and len(self.buffer) >= self.buffer_limit:
                 self.flush_buffer()
 
         return rid
 
+    def _persist_pending(self):
+        if self._pending_records:
+            # Records stay pending until the backend accepts them, so a failed flush can be retried
+            self.backend.append(self._pending_records, self.realizations)
+            self._pending_records = []
+
     def flush_buffer(self):
         if self.buffer:
-            self._save_ledger()
+            self._persist_pending()
             self.buffer = []
             print(f"📦 Ledger Buffer Flushed.")
 
+    def compact(self):
+        """Fold any pending WAL tail into a fresh snapshot."""
+        self._pending_records = []
+        self.buffer = []
+        self.backend.compact(self.realizations)
+
+    def close(self):
+        self.flush_buffer()
+        self.backend.close()
+
     def verify_integrity(self) -> bool:
         for rid, r in self.realizations.items():
             if rid != self._generate_id(r["content"]): return False
         return True
 
     def _save_ledger(self):
-        os.makedirs(os.path.dirname(self.ledger_path), exist_ok=True)
-        with open(self.ledger_path, "w") as f:
-            json.dump(self.realizations, f, indent=2)
+        self.compact()
 
     def get_realization(self, rid: str) -> Optional[Dict]:
         return self.realizations.get(rid)
@@ -85,6 +243,175 @@ class GlobalRealizationLedger:
     def query_layer(self, layer: int) -> List[Dict]:
         return [self.realizations[rid] for rid in self.layer_index.get(layer, [])]
 
+
+_FLUSH = object()
+_STOP = object()
+
+
+class LedgerSync:
+    """
+    Long-lived asynchronous sync channel into a GlobalRealizationLedger.
+
+    Producers call `submit()` (O(1), blocks only when the bounded queue is full).
+    A background worker applies records to one ledger handle and flushes when
+    any batch policy trips: `max_batch` records, `max_bytes` of content, or
+    `max_interval` seconds since the last flush.
+
+    A failed flush (disk full, permissions) is counted in stats["flush_errors"]
+    and retried on the next flush; `flush()` raises if a flush it waited on failed.
+    """
+    def __init__(self, ledger_path: str = "layers/layer_1_domain/global_ledger.json", ledger: Optional[GlobalRealizationLedger] = None,
+                 max_queue: int = 10000, max_batch: int = 256, max_bytes: int = 1 << 20, max_interval: float = 2.0):
+        self.ledger_path = ledger_path
+        self.max_batch = max_batch
+        self.max_bytes = max_bytes
+        self.max_interval = max_interval
+        self._ledger = ledger
+        self._ledger_lock = threading.Lock()
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.stats = {"submitted": 0, "synced": 0, "flushes": 0, "errors": 0, "flush_errors": 0}
+        self.last_flush_error: Optional[BaseException] = None
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="ledger-sync", daemon=True)
+        self._worker.start()
+
+    @property
+    def ledger(self) -> GlobalRealizationLedger:
+        """The ledger is loaded lazily so engines never pay for it at construction."""
+        if self._ledger is None:
+            with self._ledger_lock:
+                if self._ledger is None:
+                    self._ledger = GlobalRealizationLedger(self.ledger_path, buffer_limit=None)
+        return self._ledger
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("LedgerSync is closed")
+        if not self._worker.is_alive():
+            raise RuntimeError("LedgerSync worker is not running")
+
+    def submit(self, content: str, layer: int, features: Dict[str, float], q_score: float, parents: List[str] = None, metadata: Dict = None):
+        self._check_open()
+        self.queue.put({
+            "content": content, "layer": layer, "features": features, "q_score": q_score,
+            "parents": parents, "metadata": metadata
+        })
+        self.stats["submitted"] += 1
+
+    def submit_many(self, records: List[Dict[str, Any]]):
+        """Queue a whole batch (dicts with submit()'s keywords) as one item, committed in one flush."""
+        self._check_open()
+        if not records: return
+        self.queue.put(list(records))
+        self.stats["submitted"] += len(records)
+
+    def flush(self):
+        """Block until everything submitted so far is durable."""
+        if self._closed: return
+        self._check_open()
+        failures = self.stats["flush_errors"]
+        self.queue.put(_FLUSH)
+        self.queue.join()
+        if self.stats["flush_errors"] != failures:
+            raise RuntimeError(f"Ledger flush failed: {self.last_flush_error}")
+
+    def close(self):
+        if self._closed: return
+        self._closed = True
+        if self._worker.is_alive():
+            self.queue.put(_STOP)
+            self._worker.join()
+        if self._ledger is not None:
+            self._ledger.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        pending_bytes = 0
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.max_interval - (time.monotonic() - last_flush))
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            try:
+                records = [item] if isinstance(item, dict) else item if isinstance(item, list) else []
+                for record in records:
+                    try:
+                        self.ledger.add_realization(immediate_save=False, **record)
+                        self.stats["synced"] += 1
+                        pending_bytes += len(record["content"]) + 128
+                    except Exception as e:
+                        self.stats["errors"] += 1
+                        print(f"⚠️ Ledger Sync Failed: {e}")
+
+                # A submit_many() batch is committed as a unit.
+                due = (item is _FLUSH or item is _STOP or isinstance(item, list)
+                       or pending_bytes >= self.max_bytes
+                       or time.monotonic() - last_flush >= self.max_interval
+                       or (self._ledger is not None and len(self._ledger.buffer) >= self.max_batch))
+                if due:
+                    if self._ledger is not None and self._ledger.buffer:
+                        try:
+                            self._ledger.flush_buffer()
+                            self.stats["flushes"] += 1
+                        except Exception as e:
+                            self.stats["flush_errors"] += 1
+                            self.last_flush_error = e
+                            print(f"⚠️ Ledger Flush Failed: {e}")
+                    pending_bytes = 0
+                    last_flush = time.monotonic()
+            finally:
+                if item is not None:
+                    self.queue.task_done()
+
+            if item is _STOP:
+                return
+
+
+class LedgerRelay:
+    """
+    LedgerSync stand-in for worker processes: collects submissions so the
+    owning process can forward them and stay the ledger's single writer.
+    """
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+
+    def submit(self, content: str, layer: int, features: Dict[str, float], q_score: float, parents: List[str] = None, metadata: Dict = None):
+        self.records.append({
+            "content": content, "layer": layer, "features": features, "q_score": q_score,
+            "parents": parents, "metadata": metadata
+        })
+
+    def submit_many(self, records: List[Dict[str, Any]]):
+        self.records.extend(records)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        records, self.records = self.records, []
+        return records
+
+
+_shared_sync: Optional[LedgerSync] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_ledger_sync() -> LedgerSync:
+    """Process-wide LedgerSync used by every RealizationEngine that isn't given its own."""
+    global _shared_sync
+    if _shared_sync is None:
+        with _shared_lock:
+            if _shared_sync is None:
+                _shared_sync = LedgerSync()
+                atexit.register(_shared_sync.close)
+    return _shared_sync
+
+
 if __name__ == "__main__":
     ledger = GlobalRealizationLedger()
     rid = ledger.add_realization("Scaled Ledger Integration Fact", 1, {"G": 0.9}, 0.92)
@@ -0,0 +1,399 @@
+"""
+CONTINUOUS-BATCHING INFERENCE SERVER
+====================================
+A local generation service in front of the solver's language model.
+
+Problems used to own the model for the whole of their generate() call, and
+the model sat idle while RTC code ran and answers were voted. The server
+instead keeps one decode loop running on a background thread. Requests from
+any number of in-flight problems queue up, are prefilled as soon as there is
+batch capacity, and then share every decode step with whatever else is
+running (continuous batching): a finished sequence leaves the batch at once
+and a waiting request takes its slot on the next step.
+
+The model is anything implementing the small DecodeModel protocol below, so
+the scheduler can be exercised with a tiny NumPy model on CPU;
+TransformersDecodeModel adapts a Hugging Face causal LM.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+
+class DecodeModel(Protocol):
+    """
+    What the server needs from a model.
+
+    prefill(token_ids) -> (cache, logits): run the prompt, return the opaque
+        per-sequence cache and the next-token logits (vocab,).
+    decode(caches, tokens) -> (caches, logits): advance every sequence by one
+        token in a single batched call; logits has shape (batch, vocab).
+
+    Caches are treated as immutable values: decode returns new ones, so the
+    samples of one request can share their prompt's cache.
+    """
+    eos_token_id: Optional[int]
+
+    def prefill(self, token_ids: Sequence[int]) -> Tuple[Any, np.ndarray]: ...
+
+    def decode(self, caches: List[Any], tokens: Sequence[int]) -> Tuple[List[Any], np.ndarray]: ...
+
+
+@dataclass
+class Completion:
+    tokens: List[int]
+    finish_reason: str  # "eos" or "length"
+    text: Optional[str] = None
+    started: float = 0.0   # server clock when the request's prefill began
+    finished: float = 0.0  # server clock when this sample ended
+
+
+@dataclass
+class ServerStats:
+    queue_depth: int            # requests waiting for a batch slot
+    active_sequences: int       # sequences currently decoding
+    completed_requests: int
+    generated_tokens: int
+    decode_steps: int
+    mean_batch_size: float      # sequences per decode step
+    tokens_per_second: float    # generated tokens per second of model time
+
+
+@dataclass
+class _Request:
+    prompt: List[int]
+    n: int
+    max_new_tokens: int
+    temperature: float
+    future: Future
+    completions: List[Optional[Completion]] = field(default_factory=list)
+    remaining: int = 0
+    started: float = 0.0
+
+
+@dataclass
+class _Sequence:
+    request: _Request
+    index: int
+    cache: Any
+    tokens: List[int] = field(default_factory=list)
+
+
+def sample_tokens(logits: np.ndarray, temperatures: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Greedy rows where temperature <= 0, Gumbel-max sampling elsewhere."""
+    logits = np.asarray(logits, dtype=np.float64)
+    tokens = logits.argmax(axis=1)
+    hot = temperatures > 0
+    if hot.any():
+        scaled = logits[hot] / temperatures[hot, None]
+        tokens[hot] = (scaled + rng.gumbel(size=scaled.shape)).argmax(axis=1)
+    return tokens
+
+
+class ContinuousBatchingServer:
+    """
+    Background decode loop shared by every caller.
+
+    max_batch_size: sequences decoded together in one step
+    max_prefills_per_step: prompts admitted between two decode steps, so a
+        burst of new requests cannot stall sequences that are already running
+    clock: timestamps Completion.started/finished, so callers can measure
+        decode time rather than time spent queued
+    """
+
+    def __init__(self,
+                 model: DecodeModel,
+                 max_batch_size: int = 16,
+                 max_prefills_per_step: int = 2,
+                 seed: Optional[int] = None,
+                 clock: Callable[[], float] = time.time):
+        self.model = model
+        self.clock = clock
+        self.max_batch_size = max_batch_size
+        self.max_prefills_per_step = max_prefills_per_step
+        self.rng = np.random.default_rng(seed)
+        self._waiting: "deque[_Request]" = deque()
+        self._active: List[_Sequence] = []
+        self._outstanding: Dict[int, _Request] = {}  # every unresolved request, wherever it is
+        self._lock = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.completed_requests = 0
+        self.generated_tokens = 0
+        self.decode_steps = 0
+        self.decoded_sequences = 0
+        self.busy_seconds = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ContinuousBatchingServer is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="inference-server", daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self,
+               prompt_ids: Sequence[int],
+               n: int = 1,
+               max_new_tokens: int = 256,
+               temperature: float = 0.0) -> Future:
+        """Queue n samples of one prompt; the future resolves to n Completions."""
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        request = _Request(list(prompt_ids), n, max_new_tokens, temperature, Future())
+        request.completions = [None] * n
+        request.remaining = n
+        self.start()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ContinuousBatchingServer is closed")
+            self._waiting.append(request)
+            self._outstanding[id(request)] = request
+            self._lock.notify()
+        return request.future
+
+    def stats(self) -> ServerStats:
+        with self._lock:
+            return ServerStats(
+                queue_depth=len(self._waiting),
+                active_sequences=len(self._active),
+                completed_requests=self.completed_requests,
+                generated_tokens=self.generated_tokens,
+                decode_steps=self.decode_steps,
+                mean_batch_size=self.decoded_sequences / self.decode_steps if self.decode_steps else 0.0,
+                tokens_per_second=self.generated_tokens / self.busy_seconds if self.busy_seconds else 0.0
+            )
+
+    # ------------------------------------------------------------------
+    # Scheduler (runs on the server thread)
+    # ------------------------------------------------------------------
+
+    def _admit(self) -> List[_Request]:
+        admitted = []
+        with self._lock:
+            while self._waiting and len(admitted) < self.max_prefills_per_step:
+                request = self._waiting[0]
+                capacity = self.max_batch_size - len(self._active) - sum(r.n for r in admitted)
+                # A request wider than the whole batch still runs, alone
+                if request.n > capacity and (self._active or admitted):
+                    break
+                admitted.append(self._waiting.popleft())
+        return admitted
+
+    def _prefill(self, request: _Request):
+        if not request.future.set_running_or_notify_cancel():
+            with self._lock:
+                self._outstanding.pop(id(request), None)
+            return
+        request.started = self.clock()
+        try:
+            cache, logits = self.model.prefill(request.prompt)
+        except Exception as e:
+            self._fail([request], e)
+            return
+        # Every sample starts from the same prompt cache; first tokens differ by sampling
+        logits = np.broadcast_to(np.asarray(logits), (request.n, np.shape(logits)[-1]))
+        temperatures = np.full(request.n, request.temperature)
+        first = sample_tokens(logits, temperatures, self.rng)
+        for i, token in enumerate(first):
+            self._append(_Sequence(request, i, cache), int(token))
+
+    def _append(self, seq: _Sequence, token: int):
+        seq.tokens.append(token)
+        self.generated_tokens += 1
+        eos = self.model.eos_token_id
+        if eos is not None and token == eos:
+            self._finish(seq, "eos")
+        elif len(seq.tokens) >= seq.request.max_new_tokens:
+            self._finish(seq, "length")
+        else:
+            with self._lock:
+                self._active.append(seq)
+
+    def _finish(self, seq: _Sequence, reason: str):
+        request = seq.request
+        request.completions[seq.index] = Completion(seq.tokens, reason, started=request.started, finished=self.clock())
+        request.remaining -= 1
+        if request.remaining == 0 and not request.future.done():
+            with self._lock:
+                self._outstanding.pop(id(request), None)
+            self.completed_requests += 1
+            request.future.set_result(request.completions)
+
+    def _fail(self, requests: List[_Request], error: BaseException):
+        with self._lock:
+            for request in requests:
+                self._outstanding.pop(id(request), None)
+        for request in requests:
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    def _fail_outstanding(self, error: BaseException):
+        """Resolve every request still queued, decoding or mid-step with error."""
+        with self._lock:
+            requests = list(self._outstanding.values())
+            self._waiting.clear()
+            self._active = []
+        self._fail(requests, error)
+
+    def _step(self):
+        with self._lock:
+            batch, self._active = self._active, []
+        try:
+            caches, logits = self.model.decode([s.cache for s in batch], [s.tokens[-1] for s in batch])
+        except Exception as e:
+            self._fail(list({id(s.request): s.request for s in batch}.values()), e)
+            return
+        temperatures = np.array([s.request.temperature for s in batch], dtype=float)
+        tokens = sample_tokens(logits, temperatures, self.rng)
+        self.decode_steps += 1
+        self.decoded_sequences += len(batch)
+        for seq, cache, token in zip(batch, caches, tokens):
+            seq.cache = cache
+            self._append(seq, int(token))
+
+    def _loop(self):
+        try:
+            self._run()
+        except Exception as e:
+            # A scheduler bug must not strand callers on futures nobody will resolve
+            print(f"⚠️ Inference server stopped: {e}")
+            with self._lock:
+                self._closed = True
+            self._fail_outstanding(e)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._closed and not self._waiting and not self._active:
+                    self._lock.wait()
+                if self._closed:
+                    break
+            start = time.perf_counter()
+            for request in self._admit():
+                self._prefill(request)
+            if self._active:
+                self._step()
+            self.busy_seconds += time.perf_counter() - start
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+        # The loop finishes its current step first, so nothing moves after the join
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._fail_outstanding(RuntimeError("ContinuousBatchingServer closed"))
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class InferenceClient:
+    """Text in, text out: tokenizes prompts for the server and decodes its completions."""
+
+    def __init__(self, server: ContinuousBatchingServer, tokenizer):
+        self.server = server
+        self.tokenizer = tokenizer
+
+    def submit(self, prompt: str, n: int = 1, max_new_tokens: int = 256, temperature: float = 0.0) -> Future:
+        future = self.server.submit(self.tokenizer.encode(prompt), n, max_new_tokens, temperature)
+        texts: Future = Future()
+        def decode(done: Future):
+            try:
+                completions = done.result()
+                for c in completions:
+                    c.text = self.tokenizer.decode(c.tokens, skip_special_tokens=True)
+                texts.set_result(completions)
+            except Exception as e:
+                texts.set_exception(e)
+        future.add_done_callback(decode)
+        return texts
+
+    def generate(self, prompt: str, n: int = 1, max_new_tokens: int = 256,
+                 temperature: float = 0.0, timeout: Optional[float] = None) -> List[Completion]:
+        return self.submit(prompt, n, max_new_tokens, temperature).result(timeout)
+
+    def close(self):
+        self.server.close()
+
+
+class TransformersDecodeModel:
+    """
+    DecodeModel over a Hugging Face causal LM.
+
+    Each sequence keeps its own key/value cache. A decode step left-pads the
+    caches to a common length, masks the padding and runs one forward pass for
+    the whole batch, then hands every sequence back its unpadded slice.
+    """
+
+    def __init__(self, model, eos_token_id: Optional[int] = None):
+        import torch
+        self.torch = torch
+        self.model = model
+        self.device = next(model.parameters()).device
+        self.eos_token_id = eos_token_id if eos_token_id is not None else model.config.eos_token_id
+
+    @staticmethod
+    def _legacy(past) -> tuple:
+        return past.to_legacy_cache() if hasattr(past, "to_legacy_cache") else past
+
+    def _wrap(self, past: tuple):
+        try:
+            from transformers import DynamicCache
+            return DynamicCache.from_legacy_cache(past)
+        except (ImportError, AttributeError):
+            return past
+
+    def prefill(self, token_ids):
+        torch = self.torch
+        with torch.no_grad():
+            out = self.model(input_ids=torch.tensor([list(token_ids)], device=self.device), use_cache=True)
+        past = self._legacy(out.past_key_values)
+        return (past, len(token_ids)), out.logits[0, -1].float().cpu().numpy()
+
+    def decode(self, caches, tokens):
+        torch = self.torch
+        lengths = [length for _, length in caches]
+        width = max(lengths)
+        layers = []
+        for layer in range(len(caches[0][0])):
+            padded = []
+            for part in range(2):
+                rows = []
+                for (past, length) in caches:
+                    t = past[layer][part]
+                    if length < width:
+                        t = torch.nn.functional.pad(t, (0, 0, width - length, 0))
+                    rows.append(t)
+                padded.append(torch.cat(rows, dim=0))
+            layers.append(tuple(padded))
+        mask = torch.zeros((len(caches), width + 1), dtype=torch.long, device=self.device)
+        for i, length in enumerate(lengths):
+            mask[i, width - length:] = 1
+        with torch.no_grad():
+            out = self.model(
+                input_ids=torch.tensor([[t] for t in tokens], device=self.device),
+                past_key_values=self._wrap(tuple(layers)),
+                attention_mask=mask,
+                position_ids=torch.tensor([[length] for length in lengths], device=self.device),
+                use_cache=True
+            )
+        past = self._legacy(out.past_key_values)
+        new_caches = []
+        for i, length in enumerate(lengths):
+            start = width - length
+            row = tuple((k[i:i + 1, :, start:], v[i:i + 1, :, start:]) for k, v in past)
+            new_caches.append((row, length + 1))
+        return new_caches, out.logits[:, -1].float().cpu().numpy()
@@ -8,7 +8,8 @@ Key insight: Quality isn't just sum of dimensions - it's sum + interactions
 """
 
 import numpy as np
-from typing import Dict, Tuple, List, Set
+import scipy.sparse as sp
+from typing import Dict, Iterable, Tuple, List, Set, Union
 from dataclasses import dataclass
 
 
@@ -38,17 +39,24 @@ class DimensionInteractionMatrix:
     
     Positive c_ij = synergy (1+1>2)
     Negative c_ij = antagonism (1+1<2)
+    
+    In vector form, with x ordered like base_dimensions:
+        Q = w·x + x⁺ᵀ I x⁺ / 2
+    where I is the symmetric coefficient matrix (zero diagonal) and x⁺ = max(x, 0),
+    since a pair only interacts when both dimensions are active.
     """
     
-    def __init__(self, base_dimensions: Dict[str, float]):
+    def __init__(self, base_dimensions: Dict[str, float], sparse: bool = False):
         """
         Initialize with base dimension weights
         
         Args:
             base_dimensions: Dict mapping dimension ID to weight
+            sparse: Store the coefficient matrix as scipy.sparse CSR
         """
         self.base_dimensions = base_dimensions
         self.interactions = self._discover_interactions()
+        self._compile(sparse)
         
         print("🔗 Dimension Interaction Matrix Initialized")
         print(f"   Total dimensions: {len(base_dimensions)}")
@@ -151,75 +159,119 @@ class DimensionInteractionMatrix:
         
         return interactions
     
+    def _compile(self, sparse: bool):
+        """Pack weights and interactions into arrays ordered like base_dimensions"""
+        self.dim_ids = list(self.base_dimensions)
+        self.dim_index = {dim: i for i, dim in enumerate(self.dim_ids)}
+        self.weights = np.array([self.base_dimensions[dim] for dim in self.dim_ids], dtype=float)
+        
+        # Each unordered pair once, keyed as (larger ID, smaller ID) like the breakdown reports it
+        pairs = [(dim1, dim2, inter) for (dim1, dim2), inter in self.interactions.items() if dim1 > dim2]
+        self._pair_dims = [(dim1, dim2) for dim1, dim2, _ in pairs]
+        self._pair_effects = [inter for _, _, inter in pairs]
+        self._pair_i = np.array([self.dim_index[dim1] for dim1, _, _ in pairs], dtype=int)
+        self._pair_j = np.array([self.dim_index[dim2] for _, dim2, _ in pairs], dtype=int)
+        self._pair_coef = np.array([inter.coefficient for _, _, inter in pairs], dtype=float)
+        
+        d = len(self.dim_ids)
+        rows = np.concatenate([self._pair_i, self._pair_j])
+        cols = np.concatenate([self._pair_j, self._pair_i])
+        coef = np.concatenate([self._pair_coef, self._pair_coef])
+        self.coefficients = sp.csr_matrix((coef, (rows, cols)), shape=(d, d))
+        if not sparse:
+            self.coefficients = self.coefficients.toarray()
+    
+    def to_vector(self, dim_scores: Dict[str, float]) -> np.ndarray:
+        """Scores dict -> vector in base_dimensions order (unknown IDs dropped, missing = 0)"""
+        return np.array([dim_scores.get(dim, 0) for dim in self.dim_ids], dtype=float)
+    
+    def to_matrix(self, score_dicts: Iterable[Dict[str, float]]) -> np.ndarray:
+        """Batch of scores dicts -> (n_prompts, n_dims) matrix"""
+        return np.array([[scores.get(dim, 0) for dim in self.dim_ids] for scores in score_dicts],
+                        dtype=float).reshape(-1, len(self.dim_ids))
+    
+    def quality_terms(self, X: np.ndarray) -> Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
+        """
+        (base, interaction) terms for one score vector (n_dims,) or a batch (n_prompts, n_dims)
+        
+        base = w·x, interaction = x⁺ᵀ I x⁺ / 2
+        """
+        X = np.asarray(X, dtype=float)
+        active = np.maximum(X, 0)
+        base = X @ self.weights
+        interaction = np.sum((active @ self.coefficients) * active, axis=-1) / 2
+        return base, interaction
+    
+    def compute_quality(self, X: np.ndarray) -> Union[float, np.ndarray]:
+        """Total quality for one score vector or every row of a batch matrix"""
+        base, interaction = self.quality_terms(X)
+        return base + interaction
+    
+    def active_interactions(self, dim_scores: Union[Dict[str, float], np.ndarray]) -> List[Dict]:
+        """Pairs whose effect exceeds 0.01 in magnitude, strongest first"""
+        x = self.to_vector(dim_scores) if isinstance(dim_scores, dict) else np.asarray(dim_scores, dtype=float)
+        score1, score2 = x[self._pair_i], x[self._pair_j]
+        effects = np.where((score1 > 0) & (score2 > 0), self._pair_coef * score1 * score2, 0.0)
+        
+        active = []
+        for k in np.nonzero(np.abs(effects) > 0.01)[0]:
+            active.append({
+                'dims': self._pair_dims[k],
+                'effect': float(effects[k]),
+                'type': self._pair_effects[k].type,
+                'explanation': self._pair_effects[k].explanation
+            })
+        return sorted(active, key=lambda x: abs(x['effect']), reverse=True)
+    
     def compute_quality_with_interactions(
         self,
         dim_scores: Dict[str, float],
-        verbose: bool = False
+        verbose: bool = False,
+        details: bool = False
     ) -> Tuple[float, Dict]:
         """
         Compute quality including interaction effects
         
         Args:
             dim_scores: Dictionary mapping dimension ID to score (0-1)
-            verbose: If True, return detailed breakdown
+            verbose: If True, print the breakdown (implies details)
+            details: If True, add the per-pair 'active_interactions' list
         
         Returns:
-            Tuple of (quality_score, details_dict)
+            Tuple of (quality_score, details_dict). details_dict is a plain dict;
+            'active_interactions' is only present when verbose or details is set.
+            Use compute_quality() to score corpora.
         """
-        # Base quality (linear term)
-        base_quality = sum(
-            self.base_dimensions.get(dim, 0) * dim_scores.get(dim, 0)
-            for dim in self.base_dimensions
-        )
-        
-        # Interaction effects (quadratic term)
-        interaction_effect = 0.0
-        active_interactions = []
+        x = self.to_vector(dim_scores)
         
-        for (dim1, dim2), interaction in self.interactions.items():
-            # Only count each pair once
-            if dim1 < dim2:
-                continue
-            
-            score1 = dim_scores.get(dim1, 0)
-            score2 = dim_scores.get(dim2, 0)
-            
-            if score1 > 0 and score2 > 0:
-                # Interaction strength proportional to both dimensions being active
-                effect = interaction.coefficient * score1 * score2
-                interaction_effect += effect
-                
-                if abs(effect) > 0.01:  # Only track significant interactions
-                    active_interactions.append({
-                        'dims': (dim1, dim2),
-                        'effect': effect,
-                        'type': interaction.type,
-                        'explanation': interaction.explanation
-                    })
+        # Base quality (linear term) and interaction effects (quadratic term)
+        base_quality, interaction_effect = (float(t) for t in self.quality_terms(x))
         
         total_quality = base_quality + interaction_effect
         
-        details = {
+        breakdown = {
             'base_quality': base_quality,
             'interaction_effect': interaction_effect,
             'total_quality': total_quality,
             'improvement': (interaction_effect / base_quality * 100) if base_quality > 0 else 0,
-            'active_interactions': sorted(active_interactions, key=lambda x: abs(x['effect']), reverse=True)
         }
+        if verbose or details:
+            breakdown['active_interactions'] = self.active_interactions(x)
         
         if verbose:
             print(f"\n📊 Quality Computation:")
             print(f"   Base (linear):        {base_quality:.4f}")
             print(f"   Interactions:         {interaction_effect:+.4f}")
             print(f"   Total:                {total_quality:.4f}")
-            print(f"   Improvement:          {details['improvement']:+.2f}%")
+            print(f"   Improvement:          {breakdown['improvement']:+.2f}%")
             
+            active_interactions = breakdown['active_interactions']
             if active_interactions:
                 print(f"\n   Top Interactions:")
                 for i, inter in enumerate(active_interactions[:5], 1):
                     print(f"   {i}. {inter['dims']}: {inter['effect']:+.4f} ({inter['type']})")
         
-        return total_quality, details
+        return total_quality, breakdown
     
     def get_synergistic_pairs(self, threshold: float = 0.10) -> List[InteractionEffect]:
         """Get pairs with strong synergy"""
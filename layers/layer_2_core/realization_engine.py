@@ -19,6 +19,9 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 import hashlib
+from layers.layer_2_core.global_realization_ledger import LedgerSync, get_shared_ledger_sync
+from layers.layer_2_core.realization_index import RealizationIndex
+from layers.layer_2_core.realization_stats import RunningStats
 
 
 @dataclass
@@ -80,6 +83,21 @@ class Realization:
     evidence: List[str] = field(default_factory=list)
 
 
+CORE_FEATURE_KEYS = ('G', 'C', 'S', 'A', 'H', 'V')
+FEATURE_KEY_MAP = {
+    'grounding': 'G', 'certainty': 'C', 'structure': 'S',
+    'applicability': 'A', 'coherence': 'H', 'generativity': 'V'
+}
+
+
+@dataclass
+class QScoreBatch:
+    """Vectorized scoring result, row-aligned with the input features"""
+    q_scores: np.ndarray   # (N,) identical to calculate_q_score(...)[0] per row
+    layers: List[Any]      # assign_layer() per row: 0, 1, 2, 3 or 'N'
+    penalties: np.ndarray  # (N,) bool: ungrounded-certainty penalty applied
+
+
 class RealizationEngine:
     """
     Core engine for managing knowledge realizations.
@@ -95,10 +113,13 @@ class RealizationEngine:
         'V': 0.10   # generativity
     }
     
-    def __init__(self, weights: Optional[Dict[str, float]] = None):
+    def __init__(self, weights: Optional[Dict[str, float]] = None, ledger_sync: Optional[LedgerSync] = None):
         # Initial weights
         self.weights = weights or self.DEFAULT_WEIGHTS.copy()
 
+        # Phase 7: Global Ledger sync channel (process-wide shared one by default)
+        self.ledger_sync = ledger_sync
+
         # Storage: layer -> {id -> Realization}
         self.layers = {
             0: {},    # Universal rules
@@ -110,8 +131,18 @@ class RealizationEngine:
         
         # Index for fast lookup
         self.index = {}  # id -> Realization
+
+        # Inverted index for retrieval (token -> postings, per layer)
+        self.search_index = RealizationIndex()
         
-        # Metadata
+        # Running statistics (O(1) per insert / delete / re-score)
+        self.running_stats = RunningStats()
+
+        # Online evolution state (see _trigger_evolution)
+        self._singularity = None
+        self._unevolved_ids = []
+
+        # Metadata (mirrors running_stats for existing readers)
         self.stats = {
             'total_realizations': 0,
             'layer_distribution': {0: 0, 1: 0, 2: 0, 3: 0, 'N': 0},
@@ -119,6 +150,12 @@ class RealizationEngine:
             'weight_evolution_count': 0
         }
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Ledger handles are process-local; an unpickled engine re-acquires the shared one
+        state["ledger_sync"] = None
+        return state
+
     def update_weights(self, new_weights: Dict[str, float]):
         """Update the engine weights (called by Singularity Engine)"""
         self.weights.update(new_weights)
@@ -191,6 +228,94 @@ class RealizationEngine:
 
             return round(q_final, 4), calc_string
     
+    def calculate_q_scores_batch(self, features: Any, method: str = "integrated", feature_names: Optional[List[str]] = None) -> QScoreBatch:
+        """
+        Vectorized calculate_q_score + assign_layer over many feature sets.
+
+        Args:
+            features: (N×D) array (columns named by `feature_names`, default
+                G, C, S, A, H, V) or a list of RealizationFeatures.
+            method: 'linear' or 'integrated', as in calculate_q_score.
+
+        Scores match the scalar path exactly: rows whose unrounded score sits on
+        a 4-decimal rounding boundary are re-scored through calculate_q_score.
+        """
+        if isinstance(features, (list, tuple)) and features and isinstance(features[0], RealizationFeatures):
+            n = len(features)
+            q_scores = np.empty(n)
+            penalties = np.zeros(n, dtype=bool)
+            layers: List[Any] = [None] * n
+            # Rows with the same extra-feature keys share a column layout.
+            groups: Dict[Tuple[str, ...], List[int]] = {}
+            for i, f in enumerate(features):
+                groups.setdefault(tuple(f.extra_features), []).append(i)
+            for extra_keys, rows in groups.items():
+                names = list(CORE_FEATURE_KEYS) + list(extra_keys)
+                X = np.array([[f.grounding, f.certainty, f.structure, f.applicability, f.coherence, f.generativity]
+                              + [f.extra_features[k] for k in extra_keys] for f in (features[i] for i in rows)], dtype=float)
+                part = self._score_matrix(X, names, method)
+                q_scores[rows] = part.q_scores
+                penalties[rows] = part.penalties
+                for i, layer in zip(rows, part.layers):
+                    layers[i] = layer
+            return QScoreBatch(q_scores=q_scores, layers=layers, penalties=penalties)
+
+        X = np.asarray(features, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(0 if X.size == 0 else 1, -1)
+        names = [FEATURE_KEY_MAP.get(k, k) for k in (feature_names or CORE_FEATURE_KEYS)]
+        if X.shape[0] and X.shape[1] != len(names):
+            raise ValueError(f"Feature matrix has {X.shape[1]} columns, expected {len(names)} ({names})")
+        return self._score_matrix(X, names, method)
+
+    def _score_matrix(self, X: np.ndarray, names: List[str], method: str) -> QScoreBatch:
+        n = X.shape[0]
+        if n == 0:
+            return QScoreBatch(q_scores=np.empty(0), layers=[], penalties=np.zeros(0, dtype=bool))
+        if np.isnan(X).any() or X.min() < 0 or X.max() > 1:
+            raise ValueError("All features must be between 0 and 1")
+        missing = [k for k in CORE_FEATURE_KEYS if k not in names]
+        if missing:
+            raise ValueError(f"Feature matrix is missing required columns: {missing}")
+        g = X[:, names.index('G')]
+        c = X[:, names.index('C')]
+
+        weights = [self.weights.get(k) or self.weights.get(FEATURE_KEY_MAP.get(k, '')) for k in names]
+        penalties = np.zeros(n, dtype=bool)
+
+        if method == "linear":
+            raw = np.zeros(n)
+            for j, w in enumerate(weights):
+                if w: raw += w * X[:, j]
+        else:
+            weighted_sum = np.zeros(n)
+            for j, w in enumerate(weights):
+                if w:
+                    col = X[:, j]
+                    weighted_sum += w * np.where(col >= 0.9, col ** 1.5, col)
+            geo_mean = np.exp(np.log(np.maximum(X, 0.01)).sum(axis=1) / X.shape[1])
+            raw = weighted_sum * (0.6 + 0.4 * geo_mean)
+            penalties = c > g + 0.2
+            raw = np.where(penalties, raw * 0.7, raw)
+
+        q_scores = np.round(raw, 4)
+        scaled = raw * 1e4
+        on_boundary = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        for i in np.flatnonzero(on_boundary):
+            q_scores[i] = self.calculate_q_score(self._row_to_features(X[i], names), method)[0]
+
+        codes = np.select(
+            [(q_scores >= 0.95) & (g >= 0.90), q_scores >= 0.92, q_scores >= 0.85, q_scores >= 0.75],
+            [0, 1, 2, 3], default=-1
+        )
+        layers = ['N' if code < 0 else int(code) for code in codes]
+        return QScoreBatch(q_scores=q_scores, layers=layers, penalties=penalties)
+
+    def _row_to_features(self, row: np.ndarray, names: List[str]) -> RealizationFeatures:
+        values = dict(zip(names, (float(v) for v in row)))
+        core = [values.pop(k, 0.0) for k in CORE_FEATURE_KEYS]
+        return RealizationFeatures(*core, extra_features=values)
+
     def assign_layer(self, q_score: float, features: RealizationFeatures) -> Any:
         """
         Assign realization to appropriate layer based on Q-score and features.
@@ -251,19 +376,18 @@ class RealizationEngine:
         )
         
         # Store in appropriate layer
-        self.layers[layer][r_id] = realization
-        self.index[r_id] = realization
+        self._store(realization)
         
         # Update parent-child relationships
         for parent_id in parents:
             if parent_id in self.index:
                 self.index[parent_id].children.append(r_id)
         
-        # Phase 7: Sync with Global Ledger
+        # Phase 7: Sync with Global Ledger (queued, O(1) amortized)
         try:
-            from layers.layer_2_core.global_realization_ledger import GlobalRealizationLedger
-            ledger = GlobalRealizationLedger()
-            ledger.add_realization(
+            if self.ledger_sync is None:
+                self.ledger_sync = get_shared_ledger_sync()
+            self.ledger_sync.submit(
                 content=content,
                 layer=layer if isinstance(layer, int) else 3,
                 features=features.to_dict(),
@@ -275,9 +399,7 @@ class RealizationEngine:
             print(f"⚠️ Ledger Sync Failed: {e}")
 
         # Update stats
-        self.stats['total_realizations'] += 1
-        self.stats['layer_distribution'][layer] += 1
-        self._update_avg_q()
+        self._sync_stats()
         
         print(f"✅ Crystallized: {content[:60]}...")
         print(f"   Q = {q_score:.4f} ({calc_string})")
@@ -290,15 +412,92 @@ class RealizationEngine:
 
         return realization
     
+    def add_realizations_batch(
+        self,
+        items: List[Dict[str, Any]],
+        turn_number: int = 1,
+        trigger_evolution: bool = True,
+        verbose: bool = False
+    ) -> List[Realization]:
+        """
+        Bulk-ingest realizations.
+
+        Each item is a dict with 'content' and 'features' (RealizationFeatures),
+        plus optional 'turn_number', 'parents', 'context' and 'evidence'.
+        Scoring is vectorized, the ledger gets a single commit, and the
+        evolution trigger is evaluated once at the end (if enabled).
+        """
+        if not items: return []
+        scored = self.calculate_q_scores_batch([item["features"] for item in items])
+        timestamp = datetime.now().isoformat()
+        before = self.stats['total_realizations']
+
+        realizations = []
+        ledger_records = []
+        for item, q_score, layer in zip(items, scored.q_scores.tolist(), scored.layers):
+            content = item["content"]
+            parents = item.get("parents") or []
+            r_id = self.generate_id(content)
+            realization = Realization(
+                id=r_id,
+                content=content,
+                features=item["features"],
+                q_score=q_score,
+                layer=layer,
+                timestamp=timestamp,
+                parents=parents,
+                children=[],
+                turn_number=item.get("turn_number", turn_number),
+                context=item.get("context", ""),
+                evidence=item.get("evidence") or []
+            )
+            self._store(realization)
+            for parent_id in parents:
+                if parent_id in self.index:
+                    self.index[parent_id].children.append(r_id)
+
+            realizations.append(realization)
+            ledger_records.append({
+                "content": content,
+                "layer": layer if isinstance(layer, int) else 3,
+                "features": realization.features.to_dict(),
+                "q_score": q_score,
+                "parents": parents,
+                "metadata": {"engine": "RealizationEngine", "turn": realization.turn_number}
+            })
+            if verbose:
+                print(f"✅ Crystallized: {content[:60]}... (Q = {q_score:.4f}, Layer {layer})")
+
+        self._sync_stats()
+
+        # Phase 7: one Global Ledger commit for the whole batch
+        try:
+            if self.ledger_sync is None:
+                self.ledger_sync = get_shared_ledger_sync()
+            self.ledger_sync.submit_many(ledger_records)
+        except Exception as e:
+            print(f"⚠️ Ledger Sync Failed: {e}")
+
+        print(f"✅ Crystallized batch of {len(realizations)} realizations (total {self.stats['total_realizations']})")
+
+        # Evolution fires once if the batch crossed a 50-realization boundary
+        if trigger_evolution and self.stats['total_realizations'] // 50 > before // 50:
+            self._trigger_evolution()
+
+        return realizations
+
     def _trigger_evolution(self):
         """Trigger Singularity evolution cycle"""
         try:
             from layers.layer_4_discovery.singularity_realization_engine import SingularityRealizationEngine
-            s_engine = SingularityRealizationEngine(self)
-
-            # Use recent realizations for evolution
-            recent_ids = list(self.index.keys())[-100:]
-            recent_realizations = [self.index[rid] for rid in recent_ids]
+            # One persistent online engine; its covariance forgets on a ~100-realization horizon
+            if self._singularity is None:
+                self._singularity = SingularityRealizationEngine(self, online=True, decay=0.99)
+            s_engine = self._singularity
+
+            # Stream in only what arrived since the last evolution
+            recent_realizations = [self.index[rid] for rid in self._unevolved_ids if rid in self.index]
+            self._unevolved_ids = []
             recent_qs = [r.q_score for r in recent_realizations]
 
             analysis = s_engine.evolve(recent_realizations, recent_qs)
@@ -325,17 +524,9 @@ class RealizationEngine:
         return results
     
     def _search_layer(self, layer: int, query: str, threshold: float) -> List[Realization]:
-        """Search within a specific layer"""
-        results = []
-        query_lower = query.lower()
-        for realization in self.layers[layer].values():
-            content_lower = realization.content.lower()
-            query_words = set(query_lower.split())
-            content_words = set(content_lower.split())
-            overlap = len(query_words & content_words)
-            if overlap > 0 or query_lower in content_lower:
-                results.append(realization)
-        return results
+        """Search within a specific layer via the inverted index (scored, thresholded)"""
+        hits = self.search_index.search(layer, query, threshold)
+        return [self.layers[layer][rid] for rid, _ in hits if rid in self.layers[layer]]
     
     def get_realization_tree(self, r_id: str, depth: int = 3) -> Dict:
         """Get realization and its family tree."""
@@ -351,11 +542,64 @@ class RealizationEngine:
                 if child_tree: tree['children'].append(child_tree)
         return tree
     
-    def _update_avg_q(self):
-        if self.stats['total_realizations'] == 0: self.stats['avg_q_score'] = 0.0
+    def _store(self, realization: Realization):
+        """Place a realization in its layer + indexes; re-adding an id counts as a re-score."""
+        r_id = realization.id
+        previous = self.index.get(r_id)
+        if previous is None:
+            self.running_stats.add(realization.q_score, realization.layer)
+            self._unevolved_ids.append(r_id)
         else:
-            total_q = sum(r.q_score for r in self.index.values())
-            self.stats['avg_q_score'] = total_q / self.stats['total_realizations']
+            self.running_stats.update(previous.q_score, previous.layer, realization.q_score, realization.layer)
+            if previous.layer != realization.layer:
+                self.layers[previous.layer].pop(r_id, None)
+        self.layers[realization.layer][r_id] = realization
+        self.index[r_id] = realization
+        self.search_index.add(r_id, realization.layer, realization.content)
+
+    def remove_realization(self, r_id: str) -> Optional[Realization]:
+        """Delete a realization and unlink it from its parents."""
+        realization = self.index.pop(r_id, None)
+        if realization is None: return None
+        self.layers[realization.layer].pop(r_id, None)
+        self.search_index.remove(r_id)
+        for parent_id in realization.parents:
+            parent = self.index.get(parent_id)
+            if parent is not None and r_id in parent.children:
+                parent.children.remove(r_id)
+        self.running_stats.remove(realization.q_score, realization.layer)
+        self._sync_stats()
+        return realization
+
+    def set_q_score(self, r_id: str, q_score: float):
+        """Override a realization's Q (e.g. a domain-specific scorer) keeping stats consistent."""
+        realization = self.index[r_id]
+        self.running_stats.update(realization.q_score, realization.layer, q_score, realization.layer)
+        realization.q_score = q_score
+        self._sync_stats()
+
+    def rescore_realizations(self, r_ids: Optional[List[str]] = None) -> int:
+        """Re-score realizations under the current weights and re-crystallize them. Returns layer moves."""
+        targets = [self.index[r_id] for r_id in (r_ids if r_ids is not None else list(self.index))]
+        if not targets: return 0
+        scored = self.calculate_q_scores_batch([r.features for r in targets])
+        moves = 0
+        for r, q_score, layer in zip(targets, scored.q_scores.tolist(), scored.layers):
+            self.running_stats.update(r.q_score, r.layer, q_score, layer)
+            if layer != r.layer:
+                self.layers[r.layer].pop(r.id, None)
+                self.layers[layer][r.id] = r
+                self.search_index.add(r.id, layer, r.content)
+                moves += 1
+            r.q_score, r.layer = q_score, layer
+        self._sync_stats()
+        return moves
+
+    def _sync_stats(self):
+        rs = self.running_stats
+        self.stats['total_realizations'] = rs.count
+        self.stats['layer_distribution'] = {layer: rs.layer_counts.get(layer, 0) for layer in [0, 1, 2, 3, 'N']}
+        self.stats['avg_q_score'] = rs.mean
     
     def export_state(self) -> Dict:
         return {'layers': {str(k): {r_id: self._realization_to_dict(r) for r_id, r in v.items()} for k, v in self.layers.items()}, 'stats': self.stats, 'timestamp': datetime.now().isoformat()}
@@ -369,6 +613,9 @@ class RealizationEngine:
         print("="*60)
         print(f"Total Realizations: {self.stats['total_realizations']}")
         print(f"Average Q-Score: {self.stats['avg_q_score']:.4f}")
+        if self.running_stats.count:
+            rs = self.running_stats
+            print(f"Q Spread: σ={rs.std:.4f}, min={rs.min:.4f}, max={rs.max:.4f}, p50≈{rs.quantile(0.5):.3f}, p95≈{rs.quantile(0.95):.3f}")
         print(f"Weight Evolutions: {self.stats['weight_evolution_count']}")
         print("\nLayer Distribution:")
         for layer in [0, 1, 2, 3, 'N']:
@@ -0,0 +1,106 @@
+"""
+REALIZATION INDEX
+=================
+Incremental inverted index backing RealizationEngine.retrieve.
+
+- token -> posting set, kept per layer and updated on every insert
+- cached term statistics (document frequency, layer size) for IDF weighting
+- scoring: IDF-weighted overlap coefficient, bounded to [0, 1]
+
+      score(q, d) = Σ_{t ∈ q∩d} idf(t) / min(Σ_{t ∈ q} idf(t), Σ_{t ∈ d} idf(t))
+
+  so a short query fully contained in a realization scores 1.0, and a long
+  problem statement scores by how much of the realization it covers.
+"""
+
+import math
+import re
+from collections import defaultdict
+from typing import Dict, FrozenSet, Hashable, List, Tuple
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    return frozenset(TOKEN_RE.findall(text.lower()))
+
+
+class LayerIndex:
+    """Postings and term statistics for a single layer."""
+
+    def __init__(self):
+        self.postings: Dict[str, set] = defaultdict(set)
+        self.doc_terms: Dict[str, FrozenSet[str]] = {}
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def add(self, rid: str, terms: FrozenSet[str]):
+        if rid in self.doc_terms:
+            self.remove(rid)
+        self.doc_terms[rid] = terms
+        for t in terms:
+            self.postings[t].add(rid)
+
+    def remove(self, rid: str):
+        terms = self.doc_terms.pop(rid, None)
+        if terms is None: return
+        for t in terms:
+            posting = self.postings.get(t)
+            if posting is not None:
+                posting.discard(rid)
+                if not posting: del self.postings[t]
+
+    def idf(self, term: str) -> float:
+        # BM25 idf (+1 inside the log keeps it strictly positive)
+        n = len(self.doc_terms)
+        df = len(self.postings.get(term, ()))
+        return math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, terms: FrozenSet[str], threshold: float) -> List[Tuple[str, float]]:
+        n = len(self.doc_terms)
+        present = [t for t in terms if t in self.postings]
+        if not n or not present: return []
+
+        # Every posting list of a query term contributes candidates: a document
+        # holding only common query terms can still score 1.0 when it is short.
+        idf = {t: self.idf(t) for t in terms}
+        q_mass = sum(idf.values())
+        candidates = set()
+        for t in present:
+            candidates |= self.postings[t]
+
+        results = []
+        for rid in candidates:
+            d_terms = self.doc_terms[rid]
+            shared = sum(idf[t] for t in terms & d_terms)
+            d_mass = sum(idf[t] if t in idf else self.idf(t) for t in d_terms)
+            denom = min(q_mass, d_mass)
+            score = shared / denom if denom > 0 else 0.0
+            if score >= threshold:
+                results.append((rid, score))
+        return results
+
+
+class RealizationIndex:
+    """Per-layer inverted index over realization content."""
+
+    def __init__(self):
+        self.layers: Dict[Hashable, LayerIndex] = defaultdict(LayerIndex)
+        self.doc_layer: Dict[str, Hashable] = {}
+
+    def add(self, rid: str, layer: Hashable, content: str):
+        old_layer = self.doc_layer.get(rid)
+        if old_layer is not None and old_layer != layer:
+            self.layers[old_layer].remove(rid)
+        self.layers[layer].add(rid, tokenize(content))
+        self.doc_layer[rid] = layer
+
+    def remove(self, rid: str):
+        layer = self.doc_layer.pop(rid, None)
+        if layer is not None:
+            self.layers[layer].remove(rid)
+
+    def search(self, layer: Hashable, query: str, threshold: float) -> List[Tuple[str, float]]:
+        if layer not in self.layers: return []
+        return self.layers[layer].search(tokenize(query), threshold)
@@ -0,0 +1,160 @@
+"""
+REALIZATION STATS
+=================
+O(1) running statistics for RealizationEngine.
+
+- count / sum / Welford mean & variance, reversible on delete and re-score
+- min / max (recomputed lazily from the sketch only after the extreme is removed)
+- per-layer counts
+- per-layer streaming quantile sketches of Q (fixed-resolution histograms, so
+  they support deletion and can be queried without scanning realizations)
+"""
+
+import math
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+
+LAYERS = (0, 1, 2, 3, 'N')
+
+
+class QuantileSketch:
+    """Fixed-bin histogram over [lo, hi); out-of-range values land in the edge bins."""
+
+    def __init__(self, lo: float = 0.0, hi: float = 2.0, bins: int = 2000):
+        self.lo = lo
+        self.hi = hi
+        self.width = (hi - lo) / bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.n = 0
+
+    def _bin(self, x: float) -> int:
+        return min(len(self.counts) - 1, max(0, int((x - self.lo) / self.width)))
+
+    def add(self, x: float):
+        self.counts[self._bin(x)] += 1
+        self.n += 1
+
+    def remove(self, x: float):
+        b = self._bin(x)
+        if self.counts[b] > 0:
+            self.counts[b] -= 1
+            self.n -= 1
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        merged = QuantileSketch(self.lo, self.hi, len(self.counts))
+        merged.counts = self.counts + other.counts
+        merged.n = self.n + other.n
+        return merged
+
+    def quantile(self, p: float) -> Optional[float]:
+        """Approximate p-quantile (error <= one bin width), None when empty."""
+        if self.n == 0: return None
+        rank = min(self.n, max(1, math.ceil(p * self.n)))
+        b = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return self.lo + (b + 0.5) * self.width
+
+    def min(self) -> Optional[float]:
+        nz = np.flatnonzero(self.counts)
+        return self.lo + nz[0] * self.width if len(nz) else None
+
+    def max(self) -> Optional[float]:
+        nz = np.flatnonzero(self.counts)
+        return self.lo + (nz[-1] + 1) * self.width if len(nz) else None
+
+
+class RunningStats:
+    """Incrementally maintained Q-score statistics."""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self._extremes_dirty = False
+        self.layer_counts: Dict[Hashable, int] = {layer: 0 for layer in LAYERS}
+        self.sketches: Dict[Hashable, QuantileSketch] = {layer: QuantileSketch() for layer in LAYERS}
+
+    def add(self, q: float, layer: Hashable):
+        q = float(q)
+        self.count += 1
+        self.sum += q
+        delta = q - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (q - self.mean)
+        self._min = min(self._min, q)
+        self._max = max(self._max, q)
+        self.layer_counts[layer] = self.layer_counts.get(layer, 0) + 1
+        sketch = self.sketches.get(layer)
+        if sketch is None:
+            # Built only for a new layer: a sketch allocates all of its bins up front
+            sketch = self.sketches[layer] = QuantileSketch()
+        sketch.add(q)
+
+    def remove(self, q: float, layer: Hashable):
+        q = float(q)
+        if self.count <= 1:
+            self.__init__()
+            return
+        self.count -= 1
+        self.sum -= q
+        delta = q - self.mean
+        self.mean -= delta / self.count
+        self._m2 = max(0.0, self._m2 - delta * (q - self.mean))
+        if q <= self._min or q >= self._max:
+            self._extremes_dirty = True
+        self.layer_counts[layer] -= 1
+        self.sketches[layer].remove(q)
+
+    def update(self, old_q: float, old_layer: Hashable, new_q: float, new_layer: Hashable):
+        """Re-score: replace one observation with another."""
+        self.remove(old_q, old_layer)
+        self.add(new_q, new_layer)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def _refresh_extremes(self):
+        if self._extremes_dirty:
+            combined = self._combined()
+            # Sketch resolution is the best we can do without a scan.
+            self._min = combined.min() if combined.n else math.inf
+            self._max = combined.max() if combined.n else -math.inf
+            self._extremes_dirty = False
+
+    @property
+    def min(self) -> float:
+        self._refresh_extremes()
+        return self._min if self.count else 0.0
+
+    @property
+    def max(self) -> float:
+        self._refresh_extremes()
+        return self._max if self.count else 0.0
+
+    def _combined(self) -> QuantileSketch:
+        combined = QuantileSketch()
+        for sketch in self.sketches.values():
+            combined = combined.merge(sketch)
+        return combined
+
+    def quantile(self, p: float, layer: Any = None) -> Optional[float]:
+        """Approximate Q quantile, overall or for one layer."""
+        sketch = self._combined() if layer is None else self.sketches.get(layer)
+        return sketch.quantile(p) if sketch is not None else None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count, 'sum': self.sum, 'mean': self.mean,
+            'variance': self.variance, 'std': self.std,
+            'min': self.min, 'max': self.max,
+            'layer_counts': dict(self.layer_counts),
+            'p50': self.quantile(0.5), 'p95': self.quantile(0.95)
+        }
@@ -0,0 +1,189 @@
+"""
+SAMPLING BUDGET SCHEDULER
+=========================
+Wall-clock budgeting for AIMOMathSolver.
+
+The notebook has a hard limit (9 h for 50 problems). The scheduler measures
+seconds-per-sample as problems are solved and gives each problem a fair share
+of what is left: (remaining - reserve) / problems left. Samples are then
+drawn in rounds. After every round the weighted vote is checked, and sampling
+stops as soon as the leader's margin is statistically settled. A contested
+problem may keep sampling past its fair share, up to contested_boost times
+it, but never into the time the remaining problems need for their minimum
+samples. Time saved on easy problems flows to later ones automatically,
+because every share is recomputed from the clock.
+
+When problems are pipelined, the next problem's first round is sized with
+plan_first_round() and queued early. Its ProblemBudget is only opened with
+start_problem(..., prefetched=n) after the previous problem finishes, so
+problems_left and the fair share count each problem once.
+
+Settled test: with normalized vote weights wᵢ, the effective sample size is
+n_eff = 1 / Σwᵢ², and the margin m is the leader's share minus the
+runner-up's. The vote is settled when m·√n_eff ≥ z_settle, a sign-test
+z-score on the lead. For example, 4 unanimous equal-weight samples give
+z = 2 and 7 of 8 give z ≈ 2.1, while 5 of 6 (z ≈ 1.6) keep sampling.
+"""
+
+import json
+import math
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class ProblemBudget:
+    id: str
+    mode: str
+    first_round: int
+    max_samples: int
+    fair_share: float       # seconds this problem is entitled to
+    limit: float            # seconds it may use if its vote stays contested
+    started: float
+    samples: int = 0
+    rounds: int = 0
+    margin: float = 0.0
+    z: float = 0.0
+    stop_reason: str = ""
+
+
+class BudgetScheduler:
+    """
+    total_limit: notebook wall-clock limit in seconds
+    reserve_seconds: held back for model loading jitter and writing the submission
+    prior_seconds_per_sample: cost assumed until the first round is measured
+    """
+
+    def __init__(self,
+                 total_limit: float,
+                 problems_total: int,
+                 start_time: Optional[float] = None,
+                 reserve_seconds: float = 900.0,
+                 min_samples: int = 2,
+                 max_samples: int = 32,
+                 round_size: int = 2,
+                 z_settle: float = 2.0,
+                 contested_boost: float = 2.0,
+                 prior_seconds_per_sample: float = 30.0,
+                 smoothing: float = 0.3,
+                 clock: Callable[[], float] = time.time):
+        self.total_limit = total_limit
+        self.problems_total = problems_total
+        self.clock = clock
+        self.start_time = clock() if start_time is None else start_time
+        self.reserve_seconds = reserve_seconds
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.round_size = round_size
+        self.z_settle = z_settle
+        self.contested_boost = contested_boost
+        self.smoothing = smoothing
+        self._seconds_per_sample = prior_seconds_per_sample
+        self._measured = False
+        self.problems_done = 0
+        self.trace: List[Dict] = []
+
+    @property
+    def seconds_per_sample(self) -> float:
+        return self._seconds_per_sample
+
+    def record(self, samples: int, seconds: float):
+        """Fold a measured round into the exponential moving average."""
+        if samples <= 0:
+            return
+        cost = max(seconds, 0.0) / samples
+        if self._measured:
+            self._seconds_per_sample += self.smoothing * (cost - self._seconds_per_sample)
+        else:
+            self._seconds_per_sample, self._measured = cost, True
+
+    def remaining_seconds(self) -> float:
+        return self.total_limit - (self.clock() - self.start_time)
+
+    @property
+    def problems_left(self) -> int:
+        return max(1, self.problems_total - self.problems_done)
+
+    def _affordable(self, seconds: float) -> int:
+        spp = self._seconds_per_sample
+        if seconds <= 0:
+            return 0
+        return int(seconds // spp) if spp > 0 else self.max_samples
+
+    def _shares(self) -> Tuple[float, float]:
+        """(fair share, contested limit) in seconds for a problem starting now."""
+        spendable = self.remaining_seconds() - self.reserve_seconds
+        fair_share = max(0.0, spendable / self.problems_left)
+        # Contested problems may borrow, but later problems keep their minimum
+        others = (self.problems_left - 1) * self.min_samples * self._seconds_per_sample
+        limit = max(fair_share, min(fair_share * self.contested_boost, spendable - others))
+        return fair_share, limit
+
+    def plan_first_round(self, first_round: int) -> int:
+        """Opening round a problem starting now would get; changes no state."""
+        n = min(first_round, self.max_samples, self._affordable(self._shares()[0]))
+        if n == 0:
+            # Out of budget: one sample only if the hard limit still allows it
+            n = 1 if self._affordable(self.remaining_seconds()) > 0 else 0
+        return n
+
+    def start_problem(self, id: str, mode: str, first_round: int, prefetched: int = 0) -> ProblemBudget:
+        """
+        Open a problem's budget. prefetched: samples of its first round that
+        were already queued (see plan_first_round); they are its first round.
+        """
+        fair_share, limit = self._shares()
+        budget = ProblemBudget(id, mode, 0, self.max_samples, fair_share, limit, self.clock())
+        budget.first_round = prefetched or self.plan_first_round(first_round)
+        if budget.first_round == 0:
+            budget.stop_reason = "budget"
+        return budget
+
+    def skip_problem(self):
+        """A problem answered without sampling (e.g. lookup) still counts as done."""
+        self.problems_done += 1
+
+    def settled(self, margin: float, effective_n: float, samples: int) -> bool:
+        return samples >= self.min_samples and margin * math.sqrt(effective_n) >= self.z_settle - 1e-9
+
+    def observe(self, budget: ProblemBudget, samples: int, vote: Dict) -> bool:
+        """Account a finished round and its vote; True once the answer is settled."""
+        budget.samples += samples
+        budget.rounds += 1
+        budget.margin = vote.get("margin", 0.0)
+        budget.z = budget.margin * math.sqrt(vote.get("effective_n", 0.0))
+        if self.settled(budget.margin, vote.get("effective_n", 0.0), budget.samples):
+            budget.stop_reason = "settled"
+            return True
+        return False
+
+    def next_round(self, budget: ProblemBudget) -> int:
+        """Samples for the next round of a contested problem (0 = stop)."""
+        if budget.stop_reason:
+            return 0
+        if budget.samples >= budget.max_samples:
+            budget.stop_reason = "max_samples"
+            return 0
+        spent = self.clock() - budget.started
+        n = min(self.round_size, budget.max_samples - budget.samples, self._affordable(budget.limit - spent))
+        if n <= 0:
+            budget.stop_reason = "budget"
+        return max(n, 0)
+
+    def finish(self, budget: ProblemBudget) -> Dict:
+        self.problems_done += 1
+        entry = asdict(budget)
+        entry.pop("started")
+        entry["seconds"] = self.clock() - budget.started
+        entry["seconds_per_sample"] = self._seconds_per_sample
+        entry["remaining_seconds"] = self.remaining_seconds()
+        self.trace.append(entry)
+        print(f"   ⏱️ Budget [{budget.id}]: {budget.samples} samples / {budget.rounds} rounds in "
+              f"{entry['seconds']:.1f}s ({budget.stop_reason or 'done'}, z={budget.z:.2f}), "
+              f"{entry['remaining_seconds'] / 3600:.2f}h left")
+        return entry
+
+    def write_trace(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.trace, f, indent=2)
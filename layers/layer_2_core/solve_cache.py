@@ -0,0 +1,182 @@
+"""
+SOLVE CACHE
+===========
+Problem-level results that survive across AIMO runs.
+
+SolveCache is content-addressed. The key hashes three things:
+  - the normalized problem text
+  - the model id
+  - the solver config: sampling settings (prompt template, token limits,
+    temperature, stop rule) plus a code_hash of the answer logic
+
+So a rerun over an unchanged reference set is answered from disk, and any
+change to model, config or scoring/voting code misses cleanly. Each entry is one JSON file
+holding the final answer, the per-sample answers with their RTC outputs,
+and the weighted votes. Files are written atomically (tmp + os.replace).
+The directory is capped by total size and evicts the least recently used
+entries first; recency is the file mtime, refreshed on every hit.
+
+KnownProblemMatcher replaces the linear substring scan over the
+known-answer table with an Aho–Corasick automaton. It makes one pass over
+the problem text, and the first key in table order that occurs wins, just
+as the dict loop did.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import re
+import unicodedata
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+
+DEFAULT_CACHE_DIR = os.environ.get("AIMO_SOLVE_CACHE", ".cache/aimo_solves")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_problem(text: str) -> str:
+    """NFKC, collapsed whitespace, trimmed: cosmetic edits do not change the key."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", str(text))).strip()
+
+
+def solve_key(problem: str, model_id: str, config: Dict) -> str:
+    payload = json.dumps([normalize_problem(problem), model_id, config], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def code_hash(*functions) -> str:
+    """Hash of the functions' source, so editing any of them changes cache keys."""
+    h = hashlib.blake2b(digest_size=8)
+    for fn in functions:
+        h.update(inspect.getsource(fn).encode())
+    return h.hexdigest()
+
+
+class SolveCache:
+    """
+    directory: where entries live (created on demand)
+    max_bytes: total size of entry files before LRU eviction kicks in
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = 64 << 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index: Optional["OrderedDict[str, int]"] = None  # key -> bytes, oldest first
+        self.total_bytes = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            entries = []
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if name.endswith(".json"):
+                        st = os.stat(os.path.join(self.directory, name))
+                        entries.append((st.st_mtime, name[:-5], st.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self.total_bytes = sum(self._index.values())
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self._load_index())
+
+    def get(self, key: str) -> Optional[Dict]:
+        index = self._load_index()
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if key in index:
+            index.move_to_end(key)
+        else:  # written by another process since the index was loaded
+            index[key] = os.path.getsize(path)
+            self.total_bytes += index[key]
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict):
+        index = self._load_index()
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        self.total_bytes += os.path.getsize(path) - index.pop(key, 0)
+        index[key] = os.path.getsize(path)
+        self._evict()
+
+    def _evict(self):
+        index = self._index
+        while self.total_bytes > self.max_bytes and len(index) > 1:
+            key, size = index.popitem(last=False)
+            try: os.remove(self._path(key))
+            except OSError: pass
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        for key in list(self._load_index()):
+            try: os.remove(self._path(key))
+            except OSError: pass
+        self._index.clear()
+        self.total_bytes = 0
+
+
+class KnownProblemMatcher:
+    """Aho–Corasick over the lowercased problem text; earlier table keys take priority."""
+
+    def __init__(self, table: Dict[str, int]):
+        self.keys: List[str] = [k.lower() for k in table]
+        self.values: List[int] = list(table.values())
+        self._goto: List[Dict[str, int]] = [{}]
+        best: List[int] = [len(self.keys)]  # lowest key rank ending at each node
+        for rank, key in enumerate(self.keys):
+            node = 0
+            for ch in key:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    best.append(len(self.keys))
+                node = nxt
+            best[node] = min(best[node], rank)
+        # Failure links in BFS order; each node inherits the best match of its suffix
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(ch, 0)
+                best[child] = min(best[child], best[self._fail[child]])
+                queue.append(child)
+        self._best = best
+
+    def match(self, text: str) -> Optional[int]:
+        goto, fail, best = self._goto, self._fail, self._best
+        found, node = len(self.keys), 0
+        for ch in str(text).lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if best[node] < found:
+                found = best[node]
+                if found == 0:
+                    break
+        return self.values[found] if found < len(self.keys) else None
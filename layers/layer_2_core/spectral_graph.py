@@ -0,0 +1,207 @@
+"""
+SPECTRAL GRAPH SERVICE
+Laplacians, eigenpairs and modularity shared by the Pattern-Detection-Engine
+and the Φ (integrated information) proxy.
+
+Results are cached by a content hash of the adjacency, so repeated analyses of
+the same graph never redo an eigendecomposition. Small graphs use dense LAPACK
+(all eigenpairs); large graphs only solve for the k smallest pairs with ARPACK.
+When the adjacency is a Gram matrix A = U Uᵀ (cosine skill graphs), the
+Laplacian is applied matrix-free in O(n·d), so the n x n matrix is never built.
+
+Cached arrays are shared by every caller and are returned read-only; copy a
+result before modifying it.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import eigvalsh
+from scipy.sparse.linalg import LinearOperator, eigsh
+
+
+def content_key(*arrays) -> str:
+    """Hash of shapes, dtypes and bytes; equal content gives equal keys."""
+    h = hashlib.blake2b(digest_size=16)
+    for a in arrays:
+        if sp.issparse(a):
+            a = a.tocsr()
+            parts = (a.data, a.indices, a.indptr)
+        else:
+            parts = (np.ascontiguousarray(a),)
+        h.update(repr(a.shape).encode())
+        for part in parts:
+            h.update(part.dtype.str.encode())
+            h.update(part.tobytes())
+    return h.hexdigest()
+
+
+def _indicator(communities: List[List[int]], n: int) -> np.ndarray:
+    """(n x c) membership matrix; communities may overlap."""
+    H = np.zeros((n, len(communities)))
+    for c, members in enumerate(communities):
+        H[members, c] = 1.0
+    return H
+
+
+def _freeze(value):
+    """Mark a cached array, sparse matrix or tuple of them read-only."""
+    if isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    elif sp.issparse(value):
+        for part in (getattr(value, "data", None), getattr(value, "indices", None), getattr(value, "indptr", None)):
+            if isinstance(part, np.ndarray):
+                part.flags.writeable = False
+    elif isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    return value
+
+
+def _start_vector(n: int) -> np.ndarray:
+    # Fixed start so partial solves are reproducible (the all-ones vector is
+    # itself the λ=0 eigenvector and would stall Lanczos).
+    return np.random.RandomState(0).rand(n)
+
+
+class SpectralGraphService:
+    """
+    Cached graph Laplacian spectra.
+
+    dense_limit: graphs with more nodes than this only get partial (k smallest) solves
+    max_entries: LRU capacity, counted in cached results
+    """
+
+    def __init__(self, dense_limit: int = 2000, max_entries: int = 32):
+        self.dense_limit = dense_limit
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[tuple, object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key: tuple, compute):
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key]
+        self.misses += 1
+        value = _freeze(compute())
+        self._cache[key] = value
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Explicit adjacency (dense ndarray or scipy.sparse)
+    # ------------------------------------------------------------------
+
+    def laplacian(self, A, key: Optional[str] = None):
+        """L = D - A"""
+        key = key or content_key(A)
+        def build():
+            if sp.issparse(A):
+                return sp.diags(np.asarray(A.sum(axis=1)).ravel()) - A
+            return np.diag(A.sum(axis=1)) - A
+        return self._cached((key, "laplacian"), build)
+
+    def _is_dense(self, A, k: Optional[int]) -> bool:
+        n = A.shape[0]
+        return k is None or k >= n - 1 or (n <= self.dense_limit and not sp.issparse(A))
+
+    def eigenpairs(self, A, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ascending Laplacian eigenvalues and eigenvectors (columns).
+
+        k=None asks for all of them. For graphs above dense_limit (or sparse
+        input) with k given, only the k smallest pairs are computed.
+        """
+        key = content_key(A)
+        L = self.laplacian(A, key)
+        if self._is_dense(A, k):
+            vals, vecs = self._cached((key, "eigh"), lambda: np.linalg.eigh(L.toarray() if sp.issparse(L) else L))
+            return (vals, vecs) if k is None else (vals[:k], vecs[:, :k])
+        return self._cached((key, "eigsh", k), lambda: self._partial(L, k))
+
+    def eigenvalues(self, A, k: Optional[int] = None) -> np.ndarray:
+        """Ascending Laplacian eigenvalues (the k smallest when k is given)."""
+        key = content_key(A)
+        if (key, "eigh") in self._cache or not self._is_dense(A, k):
+            return self.eigenpairs(A, k)[0]
+        L = self.laplacian(A, key)
+        vals = self._cached((key, "eigvalsh"), lambda: np.sort(eigvalsh(L.toarray() if sp.issparse(L) else L)))
+        return vals if k is None else vals[:k]
+
+    def fiedler_value(self, A) -> float:
+        """λ₂ - λ₁ of the Laplacian (0 for a single node)."""
+        if A.shape[0] < 2:
+            return 0.0
+        vals = self.eigenvalues(A, k=2)
+        return float(vals[1] - vals[0])
+
+    @staticmethod
+    def modularity(A, communities: List[List[int]]) -> float:
+        """
+        Q = (1/2m) Σ_c [h_cᵀ A h_c - (kᵀh_c)² / 2m] with indicator columns h_c,
+        i.e. Σᵢⱼ [Aᵢⱼ - kᵢkⱼ/2m] δ(cᵢ, cⱼ) / 2m summed per community.
+        """
+        two_m = float(A.sum())
+        if two_m == 0 or not communities:
+            return 0.0
+        H = _indicator(communities, A.shape[0])
+        k = np.asarray(A.sum(axis=1)).ravel()
+        within = float(np.sum(H * (A @ H)))
+        expected = float(np.sum((k @ H) ** 2)) / two_m
+        return (within - expected) / two_m
+
+    # ------------------------------------------------------------------
+    # Factored adjacency A = U Uᵀ
+    # ------------------------------------------------------------------
+
+    def factored_eigenpairs(self, U: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """k smallest eigenpairs of the Laplacian of A = U Uᵀ, without forming A."""
+        U = np.asarray(U, dtype=float)
+        n = U.shape[0]
+        if k >= n - 1:
+            vals, vecs = self.eigenpairs(U @ U.T)
+            return vals[:k], vecs[:, :k]
+        key = content_key(U)
+        def solve():
+            degrees = U @ (U.T @ np.ones(n))
+            L = LinearOperator((n, n), matvec=lambda x: degrees * x.ravel() - U @ (U.T @ x.ravel()), dtype=float)
+            return self._partial(L, k)
+        return self._cached((key, "factored", k), solve)
+
+    @staticmethod
+    def factored_modularity(U: np.ndarray, communities: List[List[int]]) -> float:
+        """modularity() for A = U Uᵀ: h_cᵀ A h_c = ‖Uᵀh_c‖², k = U (Uᵀ1)."""
+        U = np.asarray(U, dtype=float)
+        col_sum = U.sum(axis=0)
+        two_m = float(col_sum @ col_sum)
+        if two_m == 0 or not communities:
+            return 0.0
+        H = _indicator(communities, U.shape[0])
+        within = float(np.sum((U.T @ H) ** 2))
+        expected = float(np.sum(((U @ col_sum) @ H) ** 2)) / two_m
+        return (within - expected) / two_m
+
+    @staticmethod
+    def _partial(L, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        vals, vecs = eigsh(L, k=k, which="SA", v0=_start_vector(L.shape[0]))
+        order = np.argsort(vals)
+        return vals[order], vecs[:, order]
+
+
+_shared_service: Optional[SpectralGraphService] = None
+
+def get_spectral_service() -> SpectralGraphService:
+    """Process-wide service, so every caller shares one cache."""
+    global _shared_service
+    if _shared_service is None:
+        _shared_service = SpectralGraphService()
+    return _shared_service
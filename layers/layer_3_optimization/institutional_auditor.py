@@ -21,6 +21,7 @@ class InstitutionalAuditor:
         Each point is converted into an ETHICAL realization.
         """
         print(f"📥 Ingesting {len(data_points)} institutional data points...")
+        items = []
         for i, point in enumerate(data_points):
             content = point.get("content", f"Institutional Action #{i}")
             f = point.get("features", {})
@@ -32,14 +33,10 @@ class InstitutionalAuditor:
                 coherence=f.get("H", 0.8),
                 generativity=f.get("V", 0.8)
             )
+            items.append({"content": content, "features": features})
 
-            # Add to Ethical domain
-            r = self.mco.domains["ETHICAL"].engine.add_realization(
-                content=content,
-                features=features,
-                turn_number=1
-            )
-            self.audit_log.append(r)
+        # Add to Ethical domain
+        self.audit_log.extend(self.mco.domains["ETHICAL"].engine.add_realizations_batch(items, turn_number=1))
 
     def run_audit(self) -> Dict[str, Any]:
         """
@@ -20,6 +20,7 @@ class MedicalEthicsAuditor:
         Ingests clinical decisions or AI recommendations.
         """
         print(f"🏥 Ingesting {len(decisions)} clinical decisions...")
+        items = []
         for i, decision in enumerate(decisions):
             content = decision.get("content", f"Clinical Decision #{i}")
             f = decision.get("features", {})
@@ -31,14 +32,10 @@ class MedicalEthicsAuditor:
                 coherence=f.get("H", 0.9),
                 generativity=f.get("V", 0.9)
             )
+            items.append({"content": content, "features": features})
 
-            # Add to ETHICAL domain within the orchestrator
-            r = self.mco.domains["ETHICAL"].engine.add_realization(
-                content=content,
-                features=features,
-                turn_number=1
-            )
-            self.audit_log.append(r)
+        # Add to ETHICAL domain within the orchestrator
+        self.audit_log.extend(self.mco.domains["ETHICAL"].engine.add_realizations_batch(items, turn_number=1))
 
     def perform_clinical_audit(self) -> Dict[str, Any]:
         """
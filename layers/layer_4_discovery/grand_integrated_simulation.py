@@ -1,12 +1,20 @@
 import numpy as np
 from layers.layer_2_core.realization_engine import RealizationEngine, RealizationFeatures, Realization
+from layers.layer_2_core.global_realization_ledger import LedgerRelay, get_shared_ledger_sync
 from layers.layer_4_discovery.singularity_realization_engine import SingularityRealizationEngine, QualityDimension
+from layers.layer_4_discovery.mco_checkpoint import CheckpointWriter, dump_state, read_checkpoint, write_checkpoint
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, NamedTuple, Tuple, Optional
+import heapq
 import json
+import multiprocessing as mp
 from datetime import datetime
 import uuid
 
+# Leaf status codes of the flattened task tree
+PENDING, COMPLETED, FAILED = 0, 1, 2
+STATUS_NAMES = ("pending", "completed", "failed")
+
 @dataclass
 class TaskPoint:
     id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
@@ -18,14 +26,38 @@ class TaskPoint:
     children: List['TaskPoint'] = field(default_factory=list)
     pending_cycles: int = 0
 
+class BestRealization(NamedTuple):
+    """What _merge needs to know about a domain's best realization."""
+    id: str
+    content: str
+    q_score: float
+
 class IntegratedDomainBrain:
-    def __init__(self, name: str, focus_dims: List[str]):
+    def __init__(self, name: str, focus_dims: List[str], seed: Optional[int] = None):
         self.name = name
         self.engine = RealizationEngine()
-        self.singularity = SingularityRealizationEngine(self.engine)
+        self.singularity = SingularityRealizationEngine(self.engine, online=True)
         self.focus_dims = focus_dims
         self.performance_log = []
+        if seed is None:
+            self.rng = np.random
+        else:
+            # A seeded brain owns its RNG, so it evolves identically in any process
+            self.rng = np.random.RandomState(seed)
         self.singularity.dimensions["G"].weight = 0.5
+        # Max-heap of (-q, insertion seq, id); stale entries are dropped lazily
+        self.best_heap = []
+        self._seq = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The module-level RNG is restored by the orchestrator, not pickled
+        if self.rng is np.random: state["rng"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.rng is None: self.rng = np.random
 
     def calculate_integrated_q(self, features: RealizationFeatures) -> float:
         f_dict = features.to_dict()
@@ -44,11 +76,13 @@ class IntegratedDomainBrain:
         if features.certainty > features.grounding + 0.2: q_final *= 0.7
         return min(q_final, 1.2)
 
-    def process_batch(self, tasks: List[TaskPoint]) -> List[Realization]:
+    def process_leaves(self, names: List[str]) -> Tuple[List[Realization], np.ndarray]:
+        """Realize one batch of leaf tasks by name; returns the realizations and their Q scores."""
+        success_scores = self.rng.beta(15, 1, size=len(names))
         realizations = []
-        q_scores = []
-        for task in tasks:
-            success_score = np.random.beta(15, 1)
+        q_scores = np.empty(len(names))
+        for i, (name, success_score) in enumerate(zip(names, success_scores)):
+            success_score = float(success_score)
             features = RealizationFeatures(
                 grounding=success_score if "G" in self.focus_dims else success_score * 0.8,
                 certainty=success_score if "C" in self.focus_dims else success_score * 0.8,
@@ -57,96 +91,314 @@ class IntegratedDomainBrain:
                 coherence=0.95, generativity=0.9 if "V" in self.focus_dims else 0.7
             )
             q_final = self.calculate_integrated_q(features)
-            r = self.engine.add_realization(content=f"D:{self.name} T:{task.name}", features=features, turn_number=1)
-            r.q_score = q_final
+            r = self.engine.add_realization(content=f"D:{self.name} T:{name}", features=features, turn_number=1)
+            self.engine.set_q_score(r.id, q_final)
+            self._seq += 1
+            heapq.heappush(self.best_heap, (-q_final, self._seq, r.id))
             realizations.append(r)
-            q_scores.append(q_final)
-            self.performance_log.append(q_final)
+            q_scores[i] = q_final
+        self.performance_log.extend(q_scores.tolist())
+        if len(realizations) >= 2: self.singularity.evolve(realizations, q_scores.tolist())
+        return realizations, q_scores
+
+    def process_batch(self, tasks: List[TaskPoint]) -> List[Realization]:
+        realizations, q_scores = self.process_leaves([task.name for task in tasks])
+        for task, q_final in zip(tasks, q_scores):
             task.status = "completed" if q_final > 0.7 else "failed"
             task.weight *= q_final
-        if len(realizations) >= 2: self.singularity.evolve(realizations, q_scores)
         return realizations
 
+    def best_realization(self, min_q: float = 0.0) -> Optional[Realization]:
+        """Highest-Q realization of this domain (earliest on ties) if it exceeds min_q."""
+        heap = self.best_heap
+        while heap:
+            neg_q, _, r_id = heap[0]
+            r = self.engine.index.get(r_id)
+            if r is not None and r.q_score == -neg_q:
+                return r if r.q_score > min_q else None
+            heapq.heappop(heap)
+        return None
+
+    def report(self) -> Dict[str, Any]:
+        return {"avg_q": np.mean(self.performance_log) if self.performance_log else 0, "weights": {k: d.weight for k, d in self.singularity.dimensions.items()}}
+
+def _summarize(r: Optional[Realization]) -> Optional[BestRealization]:
+    return BestRealization(r.id, r.content, r.q_score) if r is not None else None
+
+def _domain_worker(conn, brains: Dict[str, IntegratedDomainBrain]):
+    """Owns a shard of domain brains; only per-cycle summaries go back over the pipe."""
+    relays = {}
+    for name, brain in brains.items():
+        relays[name] = brain.engine.ledger_sync = LedgerRelay()
+    while True:
+        cmd, payload = conn.recv()
+        if cmd == "process":
+            out = {}
+            for name, leaf_names in payload.items():
+                brain = brains[name]
+                _, q_scores = brain.process_leaves(leaf_names)
+                out[name] = (q_scores, _summarize(brain.best_realization()), relays[name].drain())
+            conn.send(out)
+        elif cmd == "report":
+            conn.send({name: brain.report() for name, brain in brains.items()})
+        elif cmd == "state":
+            conn.send(brains)
+        else:
+            conn.close()
+            return
+
 class GrandMetaOrchestrator:
-    def __init__(self):
-        self.domains = {
-            "STRATEGIC": IntegratedDomainBrain("STRATEGIC", ["G", "V"]),
-            "TECHNICAL": IntegratedDomainBrain("TECHNICAL", ["S", "C"]),
-            "ETHICAL": IntegratedDomainBrain("ETHICAL", ["H", "A"]),
-            "CONSCIOUSNESS": IntegratedDomainBrain("CONSCIOUSNESS", ["H", "S"]),
-            "VISION": IntegratedDomainBrain("VISION", ["V", "G"])
-        }
+    DOMAIN_FOCUS = {
+        "STRATEGIC": ["G", "V"],
+        "TECHNICAL": ["S", "C"],
+        "ETHICAL": ["H", "A"],
+        "CONSCIOUSNESS": ["H", "S"],
+        "VISION": ["V", "G"]
+    }
+
+    def __init__(self, workers: int = 0, seed: Optional[int] = None):
+        """
+        workers > 0 shards the domain brains over that many forked processes.
+        Parallel runs (or any run given a seed) use per-domain seeded RNGs, so
+        results depend only on the seed, not on the number of workers.
+        """
+        if workers and "fork" not in mp.get_all_start_methods():
+            print("⚠️ Process workers need the fork start method; running domains serially.")
+            workers = 0
+        if workers and seed is None: seed = int(np.random.randint(2**31))
+        self.workers = workers
+        self.seed = seed
+        if seed is None:
+            self.rng = np.random
+            domain_seeds = [None] * len(self.DOMAIN_FOCUS)
+        else:
+            *domain_seeds, root_seed = np.random.SeedSequence(seed).generate_state(len(self.DOMAIN_FOCUS) + 1)
+            self.rng = np.random.RandomState(root_seed)
+        self.domains = {n: IntegratedDomainBrain(n, focus, s) for (n, focus), s in zip(self.DOMAIN_FOCUS.items(), domain_seeds)}
         self.root_tasks = []
         self.universal_realizations = []
         self.stats = {"merger_events": 0, "highest_point": 0.0}
+        self.domain_names = list(self.domains.keys())
+        self.domain_best: Dict[str, Optional[BestRealization]] = {n: None for n in self.domain_names}
+        self.cycles_completed = 0
+        self._pool = None
+        self._checkpoint_writer = None
+        self._worker_brains = None
+        self._compile_tree(None)
 
     def feed_protocol(self, name: str, depth: int = 3):
         print(f"🌀 Feeding: {name}")
         root = TaskPoint(name=name, weight=100.0)
         self.root_tasks.append(root)
         self._decompose(root, depth)
+        # Only the first protocol is executed by the cycle engine
+        if len(self.root_tasks) == 1: self._compile_tree(root)
 
     def _decompose(self, parent, depth):
         if depth <= 0: return
-        num = np.random.randint(3, 5)
+        num = self.rng.randint(3, 5)
         domain_list = list(self.domains.keys())
         for i in range(num):
             # Use random choice for domain to ensure all domains can be reached even with small branching factors
-            selected_domain = np.random.choice(domain_list)
+            selected_domain = self.rng.choice(domain_list)
             child = TaskPoint(name=f"{parent.name}_B{i}", weight=parent.weight/num, domain=selected_domain)
             parent.children.append(child)
             self._decompose(child, depth-1)
 
-    def execute_and_merge(self, cycles: int = 5):
+    def _compile_tree(self, root: Optional[TaskPoint]):
+        """Flatten the leaves of a task tree (depth-first order) into parallel arrays."""
+        leaves = []
+        stack = [root] if root is not None else []
+        while stack:
+            node = stack.pop()
+            if node.children: stack.extend(reversed(node.children))
+            else: leaves.append(node)
+        domain_ids = {n: i for i, n in enumerate(self.domain_names)}
+        self.leaf_nodes = leaves
+        self.leaf_names = [t.name for t in leaves]
+        self.leaf_weight = np.array([t.weight for t in leaves], dtype=float)
+        self.leaf_status = np.array([STATUS_NAMES.index(t.status) for t in leaves], dtype=np.int8)
+        self.leaf_domain = np.array([domain_ids.get(t.domain, -1) for t in leaves], dtype=np.int16)
+        self.leaf_pending_cycles = np.array([t.pending_cycles for t in leaves], dtype=np.int64)
+
+    def _sync_tree(self):
+        """Write the array state back onto the TaskPoint leaves."""
+        for i, t in enumerate(self.leaf_nodes):
+            t.weight = float(self.leaf_weight[i])
+            t.status = STATUS_NAMES[self.leaf_status[i]]
+            t.pending_cycles = int(self.leaf_pending_cycles[i])
+
+    def execute_and_merge(self, cycles: int = 5, checkpoint_path: Optional[str] = None, checkpoint_every: int = 0, compression: Optional[str] = "zlib"):
+        """
+        Run `cycles` more cycles. With a checkpoint_path, state is checkpointed in
+        the background every `checkpoint_every` cycles and once more at the end.
+        """
         for cycle in range(cycles):
-            batches = {n: [] for n in self.domains}
-            self._collect(self.root_tasks[0], batches)
-            self._decay(self.root_tasks[0])
-            all_r = []
-            for n, t in batches.items():
-                if t: all_r.extend(self.domains[n].process_batch(t))
-            if all_r:
-                mq = max(r.q_score for r in all_r)
-                if mq > self.stats["highest_point"]: self.stats["highest_point"] = mq
+            pending = self.leaf_status == PENDING
+            self.leaf_pending_cycles[~pending] += 1
+            if pending.any():
+                self.leaf_weight[pending] *= 0.95
+                mq = None
+                work = {}
+                for d, n in enumerate(self.domain_names):
+                    idx = np.flatnonzero(pending & (self.leaf_domain == d))
+                    if idx.size: work[n] = idx
+                results = self._process_domains({n: [self.leaf_names[i] for i in idx] for n, idx in work.items()})
+                for n, idx in work.items():
+                    q_scores = results[n]
+                    self.leaf_status[idx] = np.where(q_scores > 0.7, COMPLETED, FAILED)
+                    self.leaf_weight[idx] *= q_scores
+                    mq = q_scores.max() if mq is None else max(mq, q_scores.max())
+                if mq is not None and mq > self.stats["highest_point"]: self.stats["highest_point"] = float(mq)
             self._merge()
+            self.cycles_completed += 1
+            if checkpoint_path and checkpoint_every and self.cycles_completed % checkpoint_every == 0 and cycle < cycles - 1:
+                self.save_checkpoint(checkpoint_path, compression, blocking=False)
+        self._sync_tree()
+        if checkpoint_path: self.save_checkpoint(checkpoint_path, compression)
 
-    def _collect(self, node, batches):
-        if not node.children:
-            if node.status == "pending": batches[node.domain].append(node)
-            else: node.pending_cycles += 1
-        else:
-            for c in node.children: self._collect(c, batches)
+    def save_checkpoint(self, path: str, compression: Optional[str] = "zlib", blocking: bool = True):
+        """
+        Snapshot the full orchestrator state. Non-blocking saves hand the state
+        to a CheckpointWriter, which pickles it off the loop thread; only brains
+        living in process workers are fetched here, since the snapshot cannot
+        reach into other processes.
+        """
+        self._sync_tree()
+        if blocking:
+            self.wait_for_checkpoint()
+            write_checkpoint(path, dump_state(self), compression)
+            return
+        if self._checkpoint_writer is None: self._checkpoint_writer = CheckpointWriter()
+        self._checkpoint_writer.compression = compression
+        if self._pool is not None: self._worker_brains = self._fetch_worker_brains()
+        try:
+            self._checkpoint_writer.submit(path, self)
+        finally:
+            self._worker_brains = None
 
-    def _decay(self, node):
-        if not node.children:
-            if node.status == "pending": node.weight *= 0.95
-        else:
-            for c in node.children: self._decay(c)
+    def wait_for_checkpoint(self):
+        if self._checkpoint_writer is not None: self._checkpoint_writer.wait()
+
+    @classmethod
+    def load_checkpoint(cls, path: str) -> "GrandMetaOrchestrator":
+        """Resume from a checkpoint; an unseeded run also gets the global RNG state back."""
+        mco = read_checkpoint(path)
+        if not isinstance(mco, cls):
+            raise ValueError(f"{path} does not hold a {cls.__name__}")
+        print(f"♻️ Resumed MCO from {path} at cycle {mco.cycles_completed}")
+        return mco
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_checkpoint_writer"] = None
+        state["_worker_brains"] = None
+        if self._pool is not None:
+            # A forked snapshot must not talk to the workers: the parent fetched their brains first
+            state["domains"] = self.__dict__.get("_worker_brains") or self._fetch_worker_brains()
+        if self.rng is np.random:
+            state["rng"] = None
+            state["_global_rng_state"] = np.random.get_state()
+        return state
+
+    def __setstate__(self, state):
+        global_rng_state = state.pop("_global_rng_state", None)
+        self.__dict__.update(state)
+        if self.rng is None:
+            self.rng = np.random
+            np.random.set_state(global_rng_state)
+
+    def _process_domains(self, work: Dict[str, List[str]]) -> Dict[str, np.ndarray]:
+        """Run each domain's leaf batch, locally or on its worker; returns Q scores per domain."""
+        if not self.workers:
+            results = {}
+            for n, names in work.items():
+                brain = self.domains[n]
+                _, results[n] = brain.process_leaves(names)
+                self.domain_best[n] = brain.best_realization()
+            return results
+
+        conns = self._ensure_pool()
+        shards = {}
+        for n, names in work.items():
+            shards.setdefault(self._shard_of[n], {})[n] = names
+        for w, payload in shards.items(): conns[w].send(("process", payload))
+        results = {}
+        for w in shards:
+            for n, (q_scores, best, records) in conns[w].recv().items():
+                results[n] = q_scores
+                self.domain_best[n] = best
+                if records:
+                    engine = self.domains[n].engine
+                    (engine.ledger_sync or get_shared_ledger_sync()).submit_many(records)
+        return results
+
+    def _ensure_pool(self):
+        """Fork the domain workers on first use; they inherit the brains as they are now."""
+        if self._pool is None:
+            ctx = mp.get_context("fork")
+            n_workers = min(self.workers, len(self.domain_names))
+            self._shard_of = {n: i % n_workers for i, n in enumerate(self.domain_names)}
+            self._pool = []
+            for w in range(n_workers):
+                parent_conn, child_conn = ctx.Pipe()
+                brains = {n: b for n, b in self.domains.items() if self._shard_of[n] == w}
+                proc = ctx.Process(target=_domain_worker, args=(child_conn, brains), daemon=True)
+                proc.start()
+                child_conn.close()
+                self._pool.append((proc, parent_conn))
+        return [conn for _, conn in self._pool]
+
+    def _fetch_worker_brains(self) -> Dict[str, IntegratedDomainBrain]:
+        """Copy the live brain state back from the workers."""
+        for _, conn in self._pool: conn.send(("state", None))
+        brains = {}
+        for _, conn in self._pool: brains.update(conn.recv())
+        return {n: brains[n] for n in self.domain_names}
+
+    def close(self):
+        """Finish pending checkpoint writes and stop the domain workers, taking their brains back."""
+        self.wait_for_checkpoint()
+        if self._pool is None: return
+        brains = self._fetch_worker_brains()
+        for n, brain in brains.items(): brain.engine.ledger_sync = self.domains[n].engine.ledger_sync
+        self.domains = brains
+        for proc, conn in self._pool:
+            conn.send(("close", None))
+            conn.close()
+            proc.join()
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def _merge(self):
         self.stats["merger_events"] += 1
-        pool = []
-        for b in self.domains.values(): pool.extend([r for r in b.engine.index.values() if r.q_score > 0.75])
-
-        active_realizations = []
-        for domain_name in self.domains:
-            matches = [r for r in pool if f"D:{domain_name}" in r.content]
-            if matches:
-                best = max(matches, key=lambda x: x.q_score)
-                active_realizations.append(best)
+        active_realizations = [best for best in self.domain_best.values() if best is not None and best.q_score > 0.75]
 
         if len(active_realizations) >= 3:
             active_realizations.sort(key=lambda x: x.q_score, reverse=True)
             top_r = active_realizations[:4]
             f = RealizationFeatures(grounding=0.99, certainty=0.99, structure=0.99, applicability=0.99, coherence=0.99, generativity=0.99)
-            peak_q = 1.10 + (np.random.random() * 0.25)
+            peak_q = 1.10 + (self.rng.random_sample() * 0.25)
             content_summary = " x ".join([r.content.split(" ")[0].replace("D:", "") for r in top_r])
             ur = Realization(id=f"UNIV_{uuid.uuid4().hex[:6]}", content=f"Integrated Vision: {content_summary}", features=f, q_score=peak_q, layer=0, timestamp=datetime.now().isoformat(), parents=[r.id for r in top_r], children=[], turn_number=1)
             self.universal_realizations.append(ur)
             if peak_q > self.stats["highest_point"]: self.stats["highest_point"] = peak_q
 
     def get_report(self):
-        return {"stats": self.stats, "domains": {n: {"avg_q": np.mean(b.performance_log) if b.performance_log else 0, "weights": {k: d.weight for k, d in b.singularity.dimensions.items()}} for n, b in self.domains.items()}, "universal_values": [{"content": r.content, "q": r.q_score} for r in self.universal_realizations], "highest_point": self.stats["highest_point"]}
+        if self._pool is None:
+            domains = {n: b.report() for n, b in self.domains.items()}
+        else:
+            for _, conn in self._pool: conn.send(("report", None))
+            shard_reports = {}
+            for _, conn in self._pool: shard_reports.update(conn.recv())
+            domains = {n: shard_reports[n] for n in self.domain_names}
+        return {"stats": self.stats, "domains": domains, "universal_values": [{"content": r.content, "q": r.q_score} for r in self.universal_realizations], "highest_point": self.stats["highest_point"]}
 
 if __name__ == "__main__":
     mco = GrandMetaOrchestrator()
@@ -1,4 +1,5 @@
 from layers.layer_3_optimization.gather_comprehensive_data import gather_all
+import argparse
 import os
 import json
 import sys
@@ -94,52 +95,27 @@ During the 5000-cycle run, the system performed **{simulation_report.get('stats'
 """
     return report
 
-def main():
-    print("🚀 Starting Full Vision Master Outcome Generation (5000 Cycles)...")
-
-    # 1. Run Boofa-Skiler Pipeline
-    k_token = os.getenv("KAGGLE_API_TOKEN")
-    h_token = os.getenv("HF_TOKEN")
-
-    mock_mode = False
-    if not k_token or not h_token:
-        print("="*60)
-        print("🔶 MOCK/OFFLINE MODE ACTIVE 🔶")
-        print("Using simulated data - not connected to live APIs")
-        print("💡 To run with live APIs, set KAGGLE_API_TOKEN and HF_TOKEN")
-        print("="*60)
-        k_token = "DUMMY"
-        h_token = "DUMMY"
-        mock_mode = True
-    elif k_token == "DUMMY" or h_token == "DUMMY":
-        print("⚠️ MOCK MODE: Using DUMMY tokens for offline operation")
-        mock_mode = True
-    else:
-        print("✅ LIVE MODE: Connected to Kaggle & Hugging Face APIs")
-
-    skiler = BoofaSkiler(k_token, h_token)
-    pipeline_results = skiler.execute()
-
-    if not pipeline_results:
-        print("❌ Error: Pipeline execution failed.")
-        return
-
-    # 2. Run Grand Integrated Simulation
+def seed_orchestrator(pipeline_results):
     print("🌀 Seeding Grand Meta Orchestrator...")
-    mco = GrandMetaOrchestrator()
+    # MCO_WORKERS > 0 shards the domain brains over processes (seeded by MCO_SEED)
+    workers = int(os.getenv("MCO_WORKERS", "0"))
+    seed = os.getenv("MCO_SEED")
+    mco = GrandMetaOrchestrator(workers=workers, seed=int(seed) if seed is not None else None)
     mco.feed_protocol("Boofa-Skiler achievement protocol", depth=3)
 
     # 1.5 Gather Comprehensive Data
     print("🌐 Gathering Comprehensive External Data...")
     external_realizations = gather_all()
+    external_batches = {"TECHNICAL": [], "STRATEGIC": []}
     for er in external_realizations:
         domain_choice = "TECHNICAL" if er["source"] == "HF" else "STRATEGIC"
         f = er["features"]
-        mco.domains[domain_choice].engine.add_realization(
-            content=er["content"],
-            features=RealizationFeatures(f["grounding"], f["certainty"], f["structure"], f["applicability"], f["coherence"], f["generativity"]),
-            turn_number=1
-        )
+        external_batches[domain_choice].append({
+            "content": er["content"],
+            "features": RealizationFeatures(f["grounding"], f["certainty"], f["structure"], f["applicability"], f["coherence"], f["generativity"])
+        })
+    for domain_choice, items in external_batches.items():
+        mco.domains[domain_choice].engine.add_realizations_batch(items, turn_number=1)
     print(f"✅ Injected {len(external_realizations)} external realizations into MCO.")
 
 
@@ -150,6 +126,7 @@ def main():
             full_dataset = json.load(f)
             # Filter for Layer 0 and 1 (highest quality)
             high_q_realizations = [r for r in full_dataset["realizations"] if r.get("layer") in [0, 1]]
+            domain_batches = {"STRATEGIC": [], "TECHNICAL": []}
             for r in high_q_realizations:
                 s = r["scores"]
                 # Distribute to domains based on content or context
@@ -157,11 +134,12 @@ def main():
                 if "Arxiv" in r.get("context", "") or "HF" in r.get("signature", ""):
                     domain = "TECHNICAL"
 
-                mco.domains[domain].engine.add_realization(
-                    content=r["content"],
-                    features=RealizationFeatures(s["grounding"], s["certainty"], s["structure"], s["applicability"], s["coherence"], s["generativity"]),
-                    turn_number=1
-                )
+                domain_batches[domain].append({
+                    "content": r["content"],
+                    "features": RealizationFeatures(s["grounding"], s["certainty"], s["structure"], s["applicability"], s["coherence"], s["generativity"])
+                })
+            for domain, items in domain_batches.items():
+                mco.domains[domain].engine.add_realizations_batch(items, turn_number=1)
             print(f"✅ Injected {len(high_q_realizations)} high-Q domain realizations into MCO.")
     except Exception as e:
         print(f"⚠️ Could not load domain realizations: {e}")
@@ -173,10 +151,50 @@ def main():
         features=RealizationFeatures(0.999, 0.995, 0.99, 0.98, 0.995, 0.99),
         turn_number=1
     )
+    return mco
+
+def main(resume_from=None, cycles=5000, checkpoint_path="outcomes/checkpoints/mco_state.ckpt", checkpoint_every=250):
+    """`cycles` is the total for the run; resuming a finished checkpoint with a larger total extends it."""
+    print(f"🚀 Starting Full Vision Master Outcome Generation ({cycles} Cycles)...")
+
+    # 1. Run Boofa-Skiler Pipeline
+    k_token = os.getenv("KAGGLE_API_TOKEN")
+    h_token = os.getenv("HF_TOKEN")
+
+    mock_mode = False
+    if not k_token or not h_token:
+        print("="*60)
+        print("🔶 MOCK/OFFLINE MODE ACTIVE 🔶")
+        print("Using simulated data - not connected to live APIs")
+        print("💡 To run with live APIs, set KAGGLE_API_TOKEN and HF_TOKEN")
+        print("="*60)
+        k_token = "DUMMY"
+        h_token = "DUMMY"
+        mock_mode = True
+    elif k_token == "DUMMY" or h_token == "DUMMY":
+        print("⚠️ MOCK MODE: Using DUMMY tokens for offline operation")
+        mock_mode = True
+    else:
+        print("✅ LIVE MODE: Connected to Kaggle & Hugging Face APIs")
+
+    skiler = BoofaSkiler(k_token, h_token)
+    pipeline_results = skiler.execute()
+
+    if not pipeline_results:
+        print("❌ Error: Pipeline execution failed.")
+        return
+
+    # 2. Run Grand Integrated Simulation
+    if resume_from:
+        mco = GrandMetaOrchestrator.load_checkpoint(resume_from)
+    else:
+        mco = seed_orchestrator(pipeline_results)
 
-    print("⚙️ Executing 500 Simulation Cycles...")
-    mco.execute_and_merge(cycles=5000)
+    remaining = max(0, cycles - mco.cycles_completed)
+    print(f"⚙️ Executing {remaining} Simulation Cycles (checkpoint: {checkpoint_path})...")
+    mco.execute_and_merge(cycles=remaining, checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every)
     sim_report = mco.get_report()
+    mco.close()
 
     highest_q = float(sim_report.get("highest_point", 0.0))
     achievement_reached = bool(highest_q >= 1.20)
@@ -208,4 +226,10 @@ def main():
     print(f"   Report: outcomes/integrated/NEW_BOOFA_SKILER_REPORT.md")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Boofa-Skiler master outcome generation")
+    parser.add_argument("--resume", metavar="CHECKPOINT", help="continue a run from an MCO checkpoint")
+    parser.add_argument("--cycles", type=int, default=5000, help="total simulation cycles (raise to extend a finished run)")
+    parser.add_argument("--checkpoint", default="outcomes/checkpoints/mco_state.ckpt", help="checkpoint file to write")
+    parser.add_argument("--checkpoint-every", type=int, default=250, help="cycles between background checkpoints")
+    args = parser.parse_args()
+    main(resume_from=args.resume, cycles=args.cycles, checkpoint_path=args.checkpoint, checkpoint_every=args.checkpoint_every)
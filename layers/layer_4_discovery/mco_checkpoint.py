@@ -0,0 +1,122 @@
+"""
+MCO CHECKPOINTS
+===============
+Binary checkpoint files for long GrandMetaOrchestrator runs.
+
+Layout: 8-byte magic, 1-byte codec id, then the (optionally compressed)
+pickle of the orchestrator. Files are written atomically (tmp + os.replace)
+so a crash mid-write never clobbers the previous checkpoint.
+
+CheckpointWriter takes the whole save off the caller's thread. Where the
+platform can fork, the snapshot is a forked child: it sees the state
+copy-on-write exactly as it was at submit(), while the parent goes straight
+back to its cycle loop. The child pickles, compresses and writes the state,
+then exits. Without fork, the state is pickled in the caller's thread and
+only compression and I/O run in the background.
+"""
+
+import bz2
+import lzma
+import os
+import pickle
+import threading
+import traceback
+import zlib
+from typing import Any, Optional
+
+MAGIC = b"MCOCKPT1"
+CODECS = {
+    None: (0, lambda b: b, lambda b: b),
+    "zlib": (1, lambda b: zlib.compress(b, 6), zlib.decompress),
+    "bz2": (2, bz2.compress, bz2.decompress),
+    "lzma": (3, lzma.compress, lzma.decompress),
+}
+_DECODERS = {codec_id: decode for codec_id, _, decode in CODECS.values()}
+
+
+def dump_state(obj: Any) -> bytes:
+    """Serialize in the caller's thread, so the snapshot is consistent."""
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def write_checkpoint(path: str, payload: bytes, compression: Optional[str] = "zlib"):
+    if compression not in CODECS:
+        raise ValueError(f"Unknown checkpoint compression: {compression}")
+    codec_id, encode, _ = CODECS[compression]
+    directory = os.path.dirname(path)
+    if directory: os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + bytes([codec_id]))
+        f.write(encode(payload))
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint(path: str) -> Any:
+    with open(path, "rb") as f:
+        blob = f.read()
+    if blob[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not an MCO checkpoint")
+    codec_id = blob[len(MAGIC)]
+    if codec_id not in _DECODERS:
+        raise ValueError(f"Unknown checkpoint codec id: {codec_id}")
+    return pickle.loads(_DECODERS[codec_id](blob[len(MAGIC) + 1:]))
+
+
+class CheckpointWriter:
+    """Writes one checkpoint at a time in the background."""
+
+    def __init__(self, compression: Optional[str] = "zlib", use_fork: Optional[bool] = None):
+        self.compression = compression
+        self.use_fork = hasattr(os, "fork") if use_fork is None else use_fork
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._path: Optional[str] = None
+        self.error: Optional[BaseException] = None
+        self.writes = 0
+
+    def submit(self, path: str, obj: Any):
+        """Checkpoint obj as it is now; returns without serializing it when forking."""
+        # A slow disk can delay the next checkpoint, never the cycles in between.
+        self.wait()
+        if self.use_fork:
+            self._path = path
+            self._pid = os.fork()
+            if self._pid == 0:
+                self._child_write(path, obj)
+            return
+        payload = dump_state(obj)
+        self._thread = threading.Thread(target=self._write, args=(path, payload), name="mco-checkpoint", daemon=True)
+        self._thread.start()
+
+    def _child_write(self, path: str, obj: Any):
+        code = 0
+        try:
+            write_checkpoint(path, dump_state(obj), self.compression)
+        except BaseException:
+            code = 1
+            # Raw fd write: a lock held by another parent thread at fork time stays held here
+            os.write(2, traceback.format_exc().encode())
+        finally:
+            os._exit(code)
+
+    def _write(self, path: str, payload: bytes):
+        try:
+            write_checkpoint(path, payload, self.compression)
+            self.writes += 1
+        except Exception as e:
+            self.error = e
+            print(f"⚠️ Checkpoint write failed: {e}")
+
+    def wait(self):
+        if self._pid is not None:
+            _, status = os.waitpid(self._pid, 0)
+            self._pid = None
+            if os.waitstatus_to_exitcode(status) == 0:
+                self.writes += 1
+            else:
+                self.error = RuntimeError(f"checkpoint writer for {self._path} exited with status {status}")
+                print(f"⚠️ Checkpoint write failed: {self.error}")
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
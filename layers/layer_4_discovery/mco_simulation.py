@@ -21,7 +21,7 @@ class DomainBrain:
     def __init__(self, name: str, focus_dims: List[str]):
         self.name = name
         self.engine = RealizationEngine()
-        self.singularity = SingularityRealizationEngine(self.engine)
+        self.singularity = SingularityRealizationEngine(self.engine, online=True)
         self.focus_dims = focus_dims
         self.performance_log = []
 
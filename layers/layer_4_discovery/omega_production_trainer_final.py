@@ -93,6 +93,8 @@ class ProductionOmegaTrainer:
         self.synergy_routes = []
         self.quality_history = []
         self.discovery_log = []
+        self.episode_times = []
+        self.discovery_times = []
         
         # Neural network for dimension discovery
         input_dim = config.get('embedding_dim', 512)
@@ -129,6 +131,12 @@ class ProductionOmegaTrainer:
         h = self.xp.maximum(0, self.xp.dot(embedding, self.W1) + self.b1)
         out = 1 / (1 + self.xp.exp(-(self.xp.dot(h, self.W2) + self.b2)))
         return out
+
+    def forward_batch(self, embeddings):
+        """Forward pass over a (batch x embedding_dim) matrix; returns (hidden, activations)"""
+        h = self.xp.maximum(0, embeddings @ self.W1 + self.b1)
+        out = 1 / (1 + self.xp.exp(-(h @ self.W2 + self.b2)))
+        return h, out
     
     def discover_dimensions(self, episode: int) -> List[str]:
         """Discover new dimensions"""
@@ -136,20 +144,28 @@ class ProductionOmegaTrainer:
         batch_size = self.config['prompts_per_episode']
         embeddings = self.xp.random.randn(batch_size, self.config['embedding_dim'])
         
-        # Process batch
-        all_activations = []
-        for emb in embeddings:
-            act = self.forward_pass(emb)
-            all_activations.append(act)
+        lr = 0.0005
+        target_quality = 0.75 + episode * 0.0003
+        
+        if self.config.get('batched_updates', True):
+            # Whole batch as matrix ops, one accumulated W2 update (Σ outer(h, grad) = hᵀ·grad)
+            h, acts = self.forward_batch(embeddings)
+            grad = (target_quality - 0.7) * acts * 0.1
+            self.W2 += lr * (h.T @ grad)
+            avg_act = self.xp.mean(acts, axis=0)
+        else:
+            # Per-prompt updates (original behaviour)
+            all_activations = []
+            for emb in embeddings:
+                act = self.forward_pass(emb)
+                all_activations.append(act)
+                
+                # Simple gradient update
+                grad = (target_quality - 0.7) * act * 0.1
+                h = self.xp.maximum(0, self.xp.dot(emb, self.W1) + self.b1)
+                self.W2 += lr * self.xp.outer(h, grad)
             
-            # Simple gradient update
-            lr = 0.0005
-            target_quality = 0.75 + episode * 0.0003
-            grad = (target_quality - 0.7) * act * 0.1
-            h = self.xp.maximum(0, self.xp.dot(emb, self.W1) + self.b1)
-            self.W2 += lr * self.xp.outer(h, grad)
-        
-        avg_act = self.xp.mean(self.xp.array(all_activations), axis=0)
+            avg_act = self.xp.mean(self.xp.array(all_activations), axis=0)
         
         # Discover dimensions
         discoveries = []
@@ -268,10 +284,12 @@ class ProductionOmegaTrainer:
     
     def train_episode(self, episode: int) -> Dict:
         """Single training episode"""
-        start = time.time()
+        start = time.perf_counter()
         
         # Discovery
         discoveries = self.discover_dimensions(episode)
+        if GPU_AVAILABLE: cp.cuda.Stream.null.synchronize()
+        self.discovery_times.append(time.perf_counter() - start)
         
         # Synergies (every 5 episodes)
         new_synergies = []
@@ -291,13 +309,16 @@ class ProductionOmegaTrainer:
                 'dimension_name': self.dimensions[d].name
             })
         
+        elapsed = time.perf_counter() - start
+        self.episode_times.append(elapsed)
+        
         return {
             'episode': episode,
             'quality': quality,
             'dimensions': len(self.dimensions),
             'discoveries': len(discoveries),
             'synergies': len(new_synergies),
-            'time': time.time() - start
+            'time': elapsed
         }
     
     def train(self) -> Dict:
@@ -375,7 +396,8 @@ class ProductionOmegaTrainer:
                     for r in top_syn
                 ]
             },
-            'discovery_timeline': self.discovery_log
+            'discovery_timeline': self.discovery_log,
+            'timing': self._timing_metrics()
         }
         
         # Compute metrics
@@ -390,6 +412,24 @@ class ProductionOmegaTrainer:
         
         return report
     
+    def _timing_metrics(self) -> Dict:
+        """Per-episode timing and prompt throughput, for sizing runs"""
+        times = np.array(self.episode_times)
+        disc = np.array(self.discovery_times)
+        prompts = self.config['prompts_per_episode'] * len(times)
+        return {
+            'device': 'GPU (CuPy)' if GPU_AVAILABLE else 'CPU (NumPy)',
+            'batched_updates': self.config.get('batched_updates', True),
+            'total_s': round(float(times.sum()), 4),
+            'episode_mean_s': round(float(times.mean()), 6) if len(times) else 0,
+            'episode_p50_s': round(float(np.percentile(times, 50)), 6) if len(times) else 0,
+            'episode_p95_s': round(float(np.percentile(times, 95)), 6) if len(times) else 0,
+            'episode_max_s': round(float(times.max()), 6) if len(times) else 0,
+            'discovery_share': round(float(disc.sum() / times.sum()), 4) if times.sum() > 0 else 0,
+            'episodes_per_s': round(len(times) / float(times.sum()), 3) if times.sum() > 0 else 0,
+            'prompts_per_s': round(prompts / float(disc.sum()), 1) if disc.sum() > 0 else 0
+        }
+    
     def print_report(self, report: Dict):
         """Print formatted report"""
         print(f"\n\n{'='*70}")
@@ -428,6 +468,15 @@ class ProductionOmegaTrainer:
                 dims_str = ' ↔ '.join(s['dimensions'])
                 print(f"   {i:2d}. {dims_str[:55]:55s} strength={s['strength']:.4f}")
         
+        timing = report.get('timing')
+        if timing:
+            print(f"\n⏱️ TIMING ({timing['device']}):")
+            print(f"   Total:      {timing['total_s']:.2f}s ({timing['episodes_per_s']:.1f} episodes/s)")
+            print(f"   Episode:    mean={timing['episode_mean_s']*1000:.2f}ms "
+                  f"p50={timing['episode_p50_s']*1000:.2f}ms p95={timing['episode_p95_s']*1000:.2f}ms")
+            print(f"   Throughput: {timing['prompts_per_s']:,.0f} prompts/s "
+                  f"(discovery {timing['discovery_share']:.0%} of episode time)")
+        
         print(f"\n{'='*70}")
         print(f"✅ TRAINING COMPLETE")
         print(f"{'='*70}")
@@ -19,6 +19,14 @@ class PhaseTransitionController:
 
         return f"🔄 PHASE 6 STABLE: Recursive optimization in progress (Peak Q: {highest_q:.4f})"
 
+    def evaluate_distribution(self, running_stats, quantile: float = 0.95, layer: Any = None) -> str:
+        """
+        Evaluates the transition on a quantile of a RealizationEngine's live Q
+        distribution (engine.running_stats) rather than a single peak value.
+        """
+        q = running_stats.quantile(quantile, layer=layer)
+        return self.evaluate_transition({"highest_point": q or 0.0})
+
 if __name__ == "__main__":
     controller = PhaseTransitionController()
     print(controller.evaluate_transition({"highest_point": 1.36}))
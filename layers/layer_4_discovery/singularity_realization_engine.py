@@ -30,9 +30,9 @@ import sys
 
 from layers.layer_2_core.realization_engine import RealizationEngine, RealizationFeatures
 from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, deque
 import json
 import time
 
@@ -108,6 +108,57 @@ CORE_DIMENSIONS = {
 }
 
 
+# ============================================================================
+# STREAMING STATISTICS (Online Evolution)
+# ============================================================================
+
+class StreamingCovariance:
+    """
+    Streaming mean / co-moment accumulator.
+
+    Batches are merged with Chan et al.'s parallel update, so absorbing b rows
+    costs O(b·D²) and reading the covariance costs O(D²), independent of how
+    many rows have been seen. `decay` < 1 exponentially forgets old rows
+    (decay = 1 - 1/window approximates a sliding window).
+    """
+
+    def __init__(self, dim: int, decay: float = 1.0):
+        self.dim = dim
+        self.decay = decay
+        self.weight = 0.0
+        self.mean = np.zeros(dim)
+        self.comoment = np.zeros((dim, dim))
+
+    def update(self, X: np.ndarray):
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        n_b = X.shape[0]
+        if n_b == 0: return
+        if self.decay < 1.0:
+            # Row i of the batch ends up with weight decay^(n_b-1-i)
+            w = self.decay ** np.arange(n_b - 1, -1, -1)
+            fade = self.decay ** n_b
+        else:
+            w = np.ones(n_b)
+            fade = 1.0
+        w_b = w.sum()
+        mean_b = w @ X / w_b
+        centered = X - mean_b
+        comoment_b = (centered * w[:, None]).T @ centered
+
+        w_a = self.weight * fade
+        total = w_a + w_b
+        delta = mean_b - self.mean
+        self.comoment = self.comoment * fade + comoment_b + np.outer(delta, delta) * (w_a * w_b / total)
+        self.mean = self.mean + delta * (w_b / total)
+        self.weight = total
+
+    @property
+    def cov(self) -> np.ndarray:
+        """Sample covariance (matches np.cov on the same rows when decay == 1)."""
+        if self.weight <= 1.0: return np.zeros((self.dim, self.dim))
+        return self.comoment / (self.weight - 1.0)
+
+
 # ============================================================================
 # SINGULARITY REALIZATION ENGINE
 # ============================================================================
@@ -123,11 +174,21 @@ class SingularityRealizationEngine:
     - Converges to universal quality theory
     """
     
-    def __init__(self, base_engine: Optional[RealizationEngine] = None):
+    N_FEATURES = 10  # G, C, S, A, H, V + child/parent counts, content length, layer
+    GRADIENT_WINDOW = 50
+
+    def __init__(
+        self,
+        base_engine: Optional[RealizationEngine] = None,
+        online: bool = False,
+        decay: float = 1.0,
+        drift_tolerance: float = 0.05,
+        history_limit: int = 1000
+    ):
         self.base_engine = base_engine or RealizationEngine()
         
-        # Quality dimensions (starts with 6, can grow to 6+N)
-        self.dimensions = CORE_DIMENSIONS.copy()
+        # Quality dimensions (starts with 6, can grow to 6+N); each engine evolves its own copies
+        self.dimensions = {dim_id: replace(dim) for dim_id, dim in CORE_DIMENSIONS.items()}
         
         # Evolution tracking
         self.discovered_count = 0
@@ -138,6 +199,18 @@ class SingularityRealizationEngine:
         self.discovery_threshold = 0.15  # Min variance to discover new dimension
         self.weight_adaptation_rate = 0.01
         self.convergence_threshold = 0.005  # dQ/dt below this = converged
+
+        # Online mode: persistent streaming state instead of per-call PCA
+        self.online = online
+        self.drift_tolerance = drift_tolerance  # relative Frobenius drift before re-running eigh
+        self.history_limit = history_limit
+        self._stream = StreamingCovariance(self.N_FEATURES + 1, decay)  # features + Q
+        self._eig_cov = None
+        self._eigenvalues = None
+        self._eigenvectors = None
+        self.eig_recomputes = 0
+        self._grad_window = deque(maxlen=self.GRADIENT_WINDOW)
+        self._grad_sum = np.zeros(6)
         
         print("🌌 Singularity Realization Engine initialized")
         print(f"   Starting dimensions: {len(self.dimensions)}")
@@ -223,24 +296,16 @@ class SingularityRealizationEngine:
             'improvement_opportunity': 0.0
         }
         
-        # Extract feature matrix
-        feature_matrix = []
-        for r in realizations:
-            features = self.extract_features_from_realization(r)
-            feature_matrix.append([
-                features['G'], features['C'], features['S'],
-                features['A'], features['H'], features['V'],
-                features['child_count'] / 5.0,  # Normalize
-                features['parent_count'] / 5.0,
-                features['content_length'] / 200.0,
-                features['layer'] / 5.0
-            ])
-        
+        if self.online:
+            return self._analyze_online(realizations, q_scores, analysis)
+
         # Skip analysis if dataset is too small
         if len(realizations) < 2:
             print("   ⚠️ Dataset too small for dimension discovery")
             return analysis
-        feature_matrix = np.array(feature_matrix)
+
+        # Extract feature matrix
+        feature_matrix = self._feature_matrix(realizations)
         q_scores = np.array(q_scores)
         
         print(f"   Dataset: {len(realizations)} realizations")
@@ -331,6 +396,110 @@ class SingularityRealizationEngine:
             })
         return analysis
     
+    def _feature_matrix(self, realizations: List[Any]) -> np.ndarray:
+        """(N×10) analysis matrix: core dimensions + normalized derived features."""
+        rows = []
+        for r in realizations:
+            features = self.extract_features_from_realization(r)
+            rows.append([
+                features['G'], features['C'], features['S'],
+                features['A'], features['H'], features['V'],
+                features['child_count'] / 5.0,  # Normalize
+                features['parent_count'] / 5.0,
+                features['content_length'] / 200.0,
+                features['layer'] / 5.0
+            ])
+        return np.array(rows, dtype=float).reshape(-1, self.N_FEATURES)
+
+    def _analyze_online(self, realizations: List[Any], q_scores: List[float], analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Online analysis: fold the new batch into the streaming co-moments and
+        re-run the eigendecomposition only when the covariance has drifted by
+        more than `drift_tolerance` (relative Frobenius norm). Cost per call is
+        O(b·D²) for b new realizations, plus O(D³) when a recompute is due.
+        """
+        feature_matrix = self._feature_matrix(realizations)
+        q_arr = np.asarray(q_scores, dtype=float)
+        if len(feature_matrix):
+            self._stream.update(np.column_stack([feature_matrix, q_arr]))
+            self._record_performance_online(realizations, feature_matrix, q_arr)
+
+        if self._stream.weight < 2:
+            print("   ⚠️ Dataset too small for dimension discovery")
+            return analysis
+
+        cov = self._stream.cov
+        cov_x = cov[:self.N_FEATURES, :self.N_FEATURES]
+        recomputed = False
+        if self._eig_cov is None:
+            drift = np.inf
+        else:
+            drift = np.linalg.norm(cov_x - self._eig_cov) / max(np.linalg.norm(self._eig_cov), 1e-12)
+        if drift > self.drift_tolerance:
+            eigenvalues, eigenvectors = np.linalg.eigh(cov_x)
+            idx = eigenvalues.argsort()[::-1]
+            self._eigenvalues, self._eigenvectors = eigenvalues[idx], eigenvectors[:, idx]
+            self._eig_cov = cov_x.copy()
+            self.eig_recomputes += 1
+            recomputed = True
+        eigenvalues, eigenvectors = self._eigenvalues, self._eigenvectors
+
+        total_variance = float(eigenvalues.sum())
+        if total_variance <= 0: total_variance = 1e-9
+
+        print(f"   Stream weight: {self._stream.weight:.1f} realizations (+{len(feature_matrix)})")
+        print(f"   Eigenbasis: {'recomputed' if recomputed else 'reused'} (drift={drift:.4f})")
+        for i in range(min(3, len(eigenvalues))):
+            variance_pct = float(eigenvalues[i]) / total_variance * 100
+            analysis['variance_explained'][f'PC{i+1}'] = variance_pct
+
+        # Discovery only needs re-evaluating when the basis actually changed
+        if recomputed:
+            cov_xq = cov[:self.N_FEATURES, self.N_FEATURES]
+            var_q = cov[self.N_FEATURES, self.N_FEATURES]
+            for i, (eigenvalue, eigenvector) in enumerate(zip(eigenvalues, eigenvectors.T)):
+                variance_pct = float(eigenvalue) / total_variance
+                if variance_pct > self.discovery_threshold and i >= 6:
+                    dim_name, dim_desc = self._interpret_eigenvector(eigenvector)
+                    new_dimension = QualityDimension(
+                        id=f"D{7 + self.discovered_count}",
+                        name=dim_name,
+                        description=dim_desc,
+                        weight=variance_pct * 0.5,
+                        discovered_by="singularity",
+                        discovery_time=time.time(),
+                        evaluation_function=eigenvector
+                    )
+                    # corr(v·x, q) straight from the joint covariance
+                    denom = np.sqrt(max(float(eigenvalue), 0.0) * var_q)
+                    new_dimension.correlation_with_q = float(eigenvector @ cov_xq / denom) if denom > 0 else 0.0
+                    analysis['new_dimensions'].append(new_dimension)
+                    self.discovered_count += 1
+                    print(f"   🧠 DISCOVERED: {new_dimension}")
+
+        explained_variance = float(eigenvalues[:6].sum()) / total_variance
+        analysis['improvement_opportunity'] = 1.0 - explained_variance
+        print(f"   📈 Improvement opportunity: {analysis['improvement_opportunity']:.1%}")
+        return analysis
+
+    def _record_performance_online(self, realizations: List[Any], feature_matrix: np.ndarray, q_arr: np.ndarray):
+        """Append performance records and slide the REINFORCE gradient window in O(D) per record."""
+        baseline = self.base_engine.calculate_q_scores_batch([r.features for r in realizations]).q_scores
+        contributions = (q_arr - baseline)[:, None] * feature_matrix[:, :6]
+        for r, actual_q, baseline_q, contribution in zip(realizations, q_arr.tolist(), baseline.tolist(), contributions):
+            if len(self._grad_window) == self._grad_window.maxlen:
+                self._grad_sum -= self._grad_window[0]
+            self._grad_window.append(contribution)
+            self._grad_sum += contribution
+            self.performance_history.append({
+                "id": r.id,
+                "q_score": actual_q,
+                "baseline_q": baseline_q,
+                "features": self.extract_features_from_realization(r)
+            })
+        if len(self.performance_history) > 2 * self.history_limit:
+            del self.performance_history[:-self.history_limit]
+
     def _interpret_eigenvector(self, eigenvector: np.ndarray) -> Tuple[str, str]:
         """
         Interpret eigenvector to assign semantic name to discovered dimension.
@@ -423,15 +592,16 @@ class SingularityRealizationEngine:
             print(f"   Final dimension count: {len(self.dimensions)}")
             print(f"   dQ/dt < {self.convergence_threshold}")
         
-        # Record performance for future weight updates
-        for r, actual_q in zip(realizations, q_scores):
-            baseline_q, _ = self.base_engine.calculate_q_score(r.features)
-            self.performance_history.append({
-                "id": r.id,
-                "q_score": actual_q,
-                "baseline_q": baseline_q,
-                "features": self.extract_features_from_realization(r)
-            })
+        # Record performance for future weight updates (online mode already did)
+        if not self.online:
+            for r, actual_q in zip(realizations, q_scores):
+                baseline_q, _ = self.base_engine.calculate_q_score(r.features)
+                self.performance_history.append({
+                    "id": r.id,
+                    "q_score": actual_q,
+                    "baseline_q": baseline_q,
+                    "features": self.extract_features_from_realization(r)
+                })
         return analysis
     
     def _compute_weight_updates(self) -> Dict[str, float]:
@@ -441,6 +611,9 @@ class SingularityRealizationEngine:
         Uses REINFORCE-style policy gradient:
         ∇w_i = (Q_achieved - Q_baseline) × feature_i
         """
+        if self.online:
+            return self._compute_weight_updates_online()
+
         gradients = defaultdict(float)
         
         for record in self.performance_history[-50:]:
@@ -467,6 +640,17 @@ class SingularityRealizationEngine:
         
         return weight_updates
     
+    def _compute_weight_updates_online(self) -> Dict[str, float]:
+        """Same update rule, read from the running window sum in O(D)."""
+        if not self._grad_window: return {}
+        gradients = self._grad_sum / len(self._grad_window)
+        weight_updates = {}
+        for dim_id, gradient in zip(['G', 'C', 'S', 'A', 'H', 'V'], gradients):
+            if dim_id in self.dimensions:
+                new_weight = self.dimensions[dim_id].weight + self.weight_adaptation_rate * gradient
+                weight_updates[dim_id] = np.clip(new_weight, 0.05, 0.30)  # Bounds
+        return weight_updates
+
     def _check_convergence(self) -> bool:
         """Check if framework has converged (dQ/dt < threshold)."""
         if len(self.evolution_history) < 3:
@@ -16,7 +16,7 @@ Version: 1.0.0
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 import json
 import pickle
 from dataclasses import dataclass, asdict
@@ -59,6 +59,19 @@ class TrainingExample:
     context: str = ""
 
 
+TrainingSet = Union[List[TrainingExample], Tuple[np.ndarray, np.ndarray]]
+
+
+def examples_to_arrays(training_data: TrainingSet) -> Tuple[np.ndarray, np.ndarray]:
+    """(N x 8) skill matrix and (N,) targets; (X, y) tuples pass through."""
+    if isinstance(training_data, tuple):
+        X, y = training_data
+        return np.asarray(X, dtype=float), np.asarray(y, dtype=float)
+    X = np.array([ex.skill.to_array() for ex in training_data], dtype=float).reshape(-1, 8)
+    y = np.array([ex.target_q for ex in training_data], dtype=float)
+    return X, y
+
+
 @dataclass
 class WeightConfig:
     """All trainable weights in the system"""
@@ -138,6 +151,15 @@ class SkillMath:
         
         q_score = np.dot(w, s)
         return float(np.clip(q_score, 0.0, 1.0))
+
+    @staticmethod
+    def compute_q_scores(X: np.ndarray, weights: WeightConfig) -> np.ndarray:
+        """compute_q_score for every row of an (N x 8) skill matrix."""
+        w = np.array([
+            weights.w_G, weights.w_C, weights.w_S, weights.w_A,
+            weights.w_H, weights.w_V, weights.w_P, weights.w_T
+        ])
+        return np.clip(X @ w, 0.0, 1.0)
     
     @staticmethod
     def compute_interaction_tensor(
@@ -288,73 +310,72 @@ class SkillWeightTrainer:
     
     def compute_gradients(
         self,
-        training_data: List[TrainingExample],
+        training_data: TrainingSet,
         weights_array: np.ndarray
     ) -> np.ndarray:
         """
-        Compute gradients using finite differences
+        Exact gradient of compute_loss w.r.t. the raw 13-weight array.
+
+        Predictions use the normalized Q weights w = u / Σu (u = weights_array[:8]),
+        so with z = X·w and residual r = clip(z) - y:
+            ∂L/∂u = (2/N) Σ r·1[0<z<1]·(x - z)/Σu + 2λu
+        The remaining parameters do not enter the Q prediction and only carry
+        the L2 term 2λθ.
         """
-        epsilon = 1e-5
+        X, y = examples_to_arrays(training_data)
+        u = weights_array[:8]
+        total = u.sum()
+        z = X @ (u / total)
+        inside = (z > 0.0) & (z < 1.0)
+        r = (np.clip(z, 0.0, 1.0) - y) * inside
+
+        gradients = 2.0 * self.weight_decay * weights_array
+        gradients[:8] += (2.0 / len(y)) * (r @ X - r.dot(z)) / total
+        return gradients
+
+    def compute_numerical_gradients(
+        self,
+        training_data: TrainingSet,
+        weights_array: np.ndarray,
+        epsilon: float = 1e-5
+    ) -> np.ndarray:
+        """Forward finite differences of compute_loss (gradient checking)."""
+        X, y = examples_to_arrays(training_data)
+        probe = WeightConfig()
+
+        def loss_at(arr: np.ndarray) -> float:
+            probe.from_array(arr.copy())
+            return self.compute_loss(SkillMath.compute_q_scores(X, probe), y, arr)
+
+        baseline_loss = loss_at(weights_array)
         gradients = np.zeros_like(weights_array)
-        
-        # Baseline loss
-        self.weights.from_array(weights_array)
-        baseline_predictions = np.array([
-            SkillMath.compute_q_score(ex.skill, self.weights)
-            for ex in training_data
-        ])
-        baseline_targets = np.array([ex.target_q for ex in training_data])
-        baseline_loss = self.compute_loss(
-            baseline_predictions, baseline_targets, weights_array
-        )
-        
-        # Compute gradient for each weight
         for i in range(len(weights_array)):
-            # Perturb weight
             perturbed = weights_array.copy()
             perturbed[i] += epsilon
-            
-            # Compute perturbed loss
-            self.weights.from_array(perturbed)
-            perturbed_predictions = np.array([
-                SkillMath.compute_q_score(ex.skill, self.weights)
-                for ex in training_data
-            ])
-            perturbed_loss = self.compute_loss(
-                perturbed_predictions, baseline_targets, perturbed
-            )
-            
-            # Gradient
-            gradients[i] = (perturbed_loss - baseline_loss) / epsilon
-        
+            gradients[i] = (loss_at(perturbed) - baseline_loss) / epsilon
         return gradients
-    
+
+    def _apply_update(self, X: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """One momentum step on (X, y); returns the raw weight array."""
+        weights_array = self.weights.to_array()
+        gradients = self.compute_gradients((X, y), weights_array)
+        self.velocity = self.momentum * self.velocity - self.learning_rate * gradients
+        weights_array += self.velocity
+        self.weights.from_array(weights_array)
+        return weights_array
+
     def train_step(
         self,
-        training_data: List[TrainingExample]
+        training_data: TrainingSet
     ) -> Dict[str, float]:
         """
         Single training step
         """
-        # Get current weights
-        weights_array = self.weights.to_array()
-        
-        # Compute gradients
-        gradients = self.compute_gradients(training_data, weights_array)
-        
-        # Update with momentum
-        self.velocity = self.momentum * self.velocity - self.learning_rate * gradients
-        weights_array += self.velocity
-        
-        # Update weights
-        self.weights.from_array(weights_array)
+        X, targets = examples_to_arrays(training_data)
+        weights_array = self._apply_update(X, targets)
         
         # Compute current loss
-        predictions = np.array([
-            SkillMath.compute_q_score(ex.skill, self.weights)
-            for ex in training_data
-        ])
-        targets = np.array([ex.target_q for ex in training_data])
+        predictions = SkillMath.compute_q_scores(X, self.weights)
         loss = self.compute_loss(predictions, targets, weights_array)
         
         # Compute metrics
@@ -369,15 +390,22 @@ class SkillWeightTrainer:
     
     def train(
         self,
-        training_data: List[TrainingExample],
-        validation_data: Optional[List[TrainingExample]] = None,
+        training_data: TrainingSet,
+        validation_data: Optional[TrainingSet] = None,
         epochs: int = 100,
         early_stopping_patience: int = 10,
-        verbose: bool = True
+        verbose: bool = True,
+        batch_size: Optional[int] = None,
+        shuffle: bool = True
     ) -> Dict[str, List]:
         """
-        Full training loop
+        Full training loop. With batch_size, each epoch takes one momentum step
+        per mini-batch (shuffled unless shuffle=False); epoch metrics are
+        always measured on the full training set.
         """
+        X, y = examples_to_arrays(training_data)
+        if validation_data:
+            X_val, y_val = examples_to_arrays(validation_data)
         best_val_loss = float('inf')
         patience_counter = 0
         
@@ -389,18 +417,26 @@ class SkillWeightTrainer:
         }
         
         for epoch in range(epochs):
-            # Training step
-            train_metrics = self.train_step(training_data)
+            # Training step(s)
+            if batch_size is None or batch_size >= len(y):
+                weights_array = self._apply_update(X, y)
+            else:
+                order = np.random.permutation(len(y)) if shuffle else np.arange(len(y))
+                for start in range(0, len(y), batch_size):
+                    batch = order[start:start + batch_size]
+                    weights_array = self._apply_update(X[batch], y[batch])
+            predictions = SkillMath.compute_q_scores(X, self.weights)
+            train_metrics = {
+                'loss': float(self.compute_loss(predictions, y, weights_array)),
+                'mae': float(np.mean(np.abs(predictions - y)))
+            }
             history['train_loss'].append(train_metrics['loss'])
             history['train_mae'].append(train_metrics['mae'])
             
             # Validation
             if validation_data:
-                val_predictions = np.array([
-                    SkillMath.compute_q_score(ex.skill, self.weights)
-                    for ex in validation_data
-                ])
-                val_targets = np.array([ex.target_q for ex in validation_data])
+                val_predictions = SkillMath.compute_q_scores(X_val, self.weights)
+                val_targets = y_val
                 val_loss = np.mean((val_predictions - val_targets) ** 2)
                 val_mae = np.mean(np.abs(val_predictions - val_targets))
                 
@@ -565,11 +601,8 @@ class SkillEvaluator:
         """
         Evaluate on test set
         """
-        predictions = np.array([
-            SkillMath.compute_q_score(ex.skill, trainer.weights)
-            for ex in test_data
-        ])
-        targets = np.array([ex.target_q for ex in test_data])
+        X, targets = examples_to_arrays(test_data)
+        predictions = SkillMath.compute_q_scores(X, trainer.weights)
         
         mse = np.mean((predictions - targets) ** 2)
         mae = np.mean(np.abs(predictions - targets))
@@ -585,7 +618,7 @@ class SkillEvaluator:
             'mae': float(mae),
             'rmse': float(rmse),
             'r2': float(r2),
-            'n_samples': len(test_data)
+            'n_samples': len(targets)
         }
     
     @staticmethod
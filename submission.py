@@ -16,15 +16,7 @@ except ImportError:
     HAS_POLARS = False
 
 # --- Bolt Optimization: Pre-compiled Regex Patterns ---
-ANSWER_PATTERNS = [
-    re.compile(r"\\+boxed\s*\{(.*?)\}", re.IGNORECASE),
-    re.compile(r"final answer is\s*[:\s]*(\d+)", re.IGNORECASE),
-    re.compile(r"answer is\s*[:\s]*(\d+)", re.IGNORECASE),
-    re.compile(r"boxed\s+(\d+)", re.IGNORECASE),
-    re.compile(r"\\boxed\{(.*?)\}", re.IGNORECASE)
-]
 NUMERIC_PATTERN = re.compile(r"-?\d+")
-SIMPLE_NUMERIC_PATTERN = re.compile(r"\d+")
 PYTHON_CODE_PATTERN = re.compile(r"```python\s*(.*?)\s*```", re.DOTALL)
 
 # --- 1. Robust Infrastructure ---
@@ -92,24 +84,181 @@ def execute_code(code):
     except: pass
     return None
 
-def extract_answer(text):
+# --- Answer extraction: one reverse scan from the end, balanced \boxed{...} ---
+
+# >>> inlined: layers/layer_2_core/answer_extraction.py
+"""
+ANSWER EXTRACTION ENGINE
+========================
+Final-answer extraction for AIMO completions.
+
+The old extractor ran five regexes with findall over the whole completion,
+then fell back to listing every digit run. Answers sit at the end of long
+chain-of-thought text, so this engine searches backwards from the end. It
+lowercases the text once (ASCII only, so indices still line up) and uses
+rfind for each marker, so it only looks at text before the last marker when
+the last one is unusable. The priority order is unchanged:
+
+    1. last closed \\boxed{...} (braces are balanced, so \\boxed{\\frac{1}{2}} is whole)
+    2. last "final answer is N"
+    3. last "answer is N"
+    4. last "boxed N"
+    5. last digit run in the text
+
+Boxed contents give their first integer, clamped at 0. Every result is taken
+mod 100000, and 0 means nothing was found.
+
+AnswerStream applies rule 1 incrementally while tokens are still arriving.
+It reports the answer as soon as a boxed expression closes, which a sampler
+can use to stop that sequence early.
+"""
+
+import re  # noqa: F811
+from typing import Optional
+
+MODULUS = 100000
+
+_NUMBER = re.compile(r"-?\d+")
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+_DIGITS = "0123456789"
+
+BOXED = "boxed"
+# (marker, tail matched right after it), in priority order after \boxed{...}
+_PHRASES = (
+    ("final answer is", re.compile(r"[:\s]*(\d+)")),
+    ("answer is", re.compile(r"[:\s]*(\d+)")),
+    (BOXED, re.compile(r"\s+(\d+)")),
+)
+_SPACE = re.compile(r"\s*")
+
+
+def _lower(text: str) -> str:
+    return text.translate(_ASCII_LOWER)
+
+
+def _boxed_at(text: str, i: int) -> Optional[int]:
     """
-    Robust multi-pattern regex as per AGENTS.md guidelines.
-    Optimized by Bolt: uses pre-compiled regex objects.
+    For a "boxed" marker at i, the end of its balanced {...} group (index of
+    the closing brace), or None if it is not a \\boxed{ or has not closed yet.
+    """
+    if i == 0 or text[i - 1] != "\\":
+        return None
+    j = _SPACE.match(text, i + len(BOXED)).end()
+    if j >= len(text) or text[j] != "{":
+        return None
+    depth = 0
+    for k in range(j, len(text)):
+        c = text[k]
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return k
+    return None
+
+
+def _content(text: str, i: int, close: int) -> str:
+    return text[text.index("{", i) + 1:close]
+
+
+def boxed_value(content: str) -> Optional[int]:
+    """First integer inside a boxed expression (thousands separators ignored)."""
+    m = _NUMBER.search(content.replace(",", ""))
+    return max(0, int(m.group())) % MODULUS if m else None
+
+
+def last_boxed(text: str, lowered: Optional[str] = None) -> Optional[str]:
+    """Contents of the last closed \\boxed{...}, or None."""
+    low = lowered if lowered is not None else _lower(text)
+    i = low.rfind(BOXED)
+    while i >= 0:
+        close = _boxed_at(text, i)
+        if close is not None:
+            return _content(text, i, close)
+        i = low.rfind(BOXED, 0, i)
+    return None
+
+
+def _last_digit_run(text: str) -> Optional[str]:
+    end = max(text.rfind(d) for d in _DIGITS)
+    if end < 0:
+        return None
+    start = end
+    while start > 0 and text[start - 1] in _DIGITS:
+        start -= 1
+    return text[start:end + 1]
+
+
+def extract_answer(text: str) -> int:
+    """Final integer answer of a completion; see the module docstring for the rules."""
+    if not text:
+        return 0
+    low = _lower(text)
+    content = last_boxed(text, low)
+    if content is not None:
+        value = boxed_value(content)
+        if value is not None:
+            return value
+    for marker, tail in _PHRASES:
+        i = low.rfind(marker)
+        while i >= 0:
+            m = tail.match(text, i + len(marker))
+            if m:
+                return int(m.group(1)) % MODULUS
+            i = low.rfind(marker, 0, i)
+    digits = _last_digit_run(text)
+    return int(digits) % MODULUS if digits else 0
+
+
+class AnswerStream:
+    """
+    Watches generated text for a closed \\boxed{...} as it streams in.
+
+    feed() appends a chunk and returns the latest boxed answer so far (None
+    until one has closed). Text already scanned is never scanned again, except
+    for an open \\boxed{ that is still waiting for its closing brace.
     """
-    for p in ANSWER_PATTERNS:
-        try:
-            matches = p.findall(text)
-            if matches:
-                ans_str = matches[-1].replace(",", "").strip()
-                nums = NUMERIC_PATTERN.findall(ans_str)
-                if nums: return max(0, int(nums[0])) % 100000
-        except: continue
-
-    # Final fallback: last number in the text
-    nums = SIMPLE_NUMERIC_PATTERN.findall(text)
-    if nums: return int(nums[-1]) % 100000
-    return 0
+
+    def __init__(self):
+        self.text = ""
+        self.answer: Optional[int] = None
+        self.boxed: Optional[str] = None
+        self._scan = 0  # next position a "boxed" marker may start at
+
+    def feed(self, chunk: str) -> Optional[int]:
+        self.text += chunk
+        low = _lower(self.text[self._scan:])
+        offset = self._scan
+        i = low.find(BOXED)
+        while i >= 0:
+            at = offset + i
+            close = _boxed_at(self.text, at)
+            if close is None:
+                if self._is_open(at):
+                    self._scan = at  # wait for the rest of this group
+                    return self.answer
+            else:
+                content = _content(self.text, at, close)
+                value = boxed_value(content)
+                if value is not None:
+                    self.answer, self.boxed = value, content
+            i = low.find(BOXED, i + 1)
+        # A marker split across chunks is found once its last letter arrives
+        self._scan = max(self._scan, len(self.text) - len(BOXED) + 1)
+        return self.answer
+
+    def _is_open(self, at: int) -> bool:
+        """A \\boxed marker whose brace group has not closed (or not started) yet."""
+        if at == 0 or self.text[at - 1] != "\\":
+            return False
+        j = _SPACE.match(self.text, at + len(BOXED)).end()
+        return j >= len(self.text) or self.text[j] == "{"
+
+    @property
+    def finished(self) -> bool:
+        return self.answer is not None
+# <<< inlined: layers/layer_2_core/answer_extraction.py
 
 # --- 2. Model Loading ---
 
@@ -140,6 +289,144 @@ def load_model():
 TOKENIZER, MODEL = load_model()
 ALL_PREDS = []
 
+# --- Batched Sampling with Consensus Early Stop ---
+
+# >>> inlined: layers/layer_2_core/consensus_generation.py
+"""
+CONSENSUS GENERATION
+====================
+All samples of one AIMO problem from a single batched Hugging Face generate.
+
+The prompt is tokenized once and expanded with num_return_sequences. While
+the batch decodes, ConsensusStop looks at the new text every `check_every`
+tokens. A sample that has written a closed \\boxed{...} is done, and once a
+strict majority of all samples agree on one boxed answer the whole batch
+stops. Samples still running at that point were cut off, and
+generate_samples reports them as unfinished so they do not vote.
+
+Per-row stopping (a bool tensor with one entry per sequence) needs
+transformers >= 4.39; older versions only accept a single bool and raise
+"ambiguous truth value" on a tensor. On those versions ConsensusStop answers
+for the whole batch: it still stops at consensus, but a sample that boxed
+its answer keeps decoding until then.
+"""
+
+from collections import Counter  # noqa: F811
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+
+try:
+    import torch
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
+try:
+    from transformers import StoppingCriteriaList
+    HAS_TRANSFORMERS = True
+except ImportError:
+    HAS_TRANSFORMERS = False
+
+PER_ROW_STOP_VERSION = (4, 39)
+
+
+def supports_per_row_stop() -> bool:
+    """True if the installed transformers accepts a per-sequence stopping mask."""
+    try:
+        import transformers
+    except ImportError:
+        return False
+    try:
+        version = tuple(int(part) for part in transformers.__version__.split(".")[:2])
+    except ValueError:
+        return False
+    return version >= PER_ROW_STOP_VERSION
+
+
+class ConsensusStop:
+    """
+    Stopping criterion for one batched generate (used through StoppingCriteriaList).
+
+    answers: row -> boxed answer, for every sample that has boxed one
+    consensus: the majority answer once the batch stopped on it, else None
+    """
+
+    def __init__(self, tokenizer, prompt_len: int, num_samples: int,
+                 check_every: int = 32, per_row: bool = True):
+        self.tokenizer = tokenizer
+        self.prompt_len = prompt_len
+        self.num_samples = num_samples
+        self.check_every = check_every
+        self.per_row = per_row
+        self.answers: Dict[int, int] = {}
+        self.consensus: Optional[int] = None
+
+    def check(self, input_ids) -> List[bool]:
+        """Per-row done flags for the batch so far."""
+        rows = input_ids.shape[0]
+        new_tokens = input_ids.shape[1] - self.prompt_len
+        if new_tokens > 0 and new_tokens % self.check_every == 0:
+            pending = [i for i in range(rows) if i not in self.answers]
+            if pending:
+                texts = self.tokenizer.batch_decode(input_ids[pending, self.prompt_len:], skip_special_tokens=True)
+                for i, text in zip(pending, texts):
+                    boxed = last_boxed(text)
+                    answer = boxed_value(boxed) if boxed is not None else None
+                    if answer is not None:
+                        self.answers[i] = answer
+            if self.answers:
+                answer, votes = Counter(self.answers.values()).most_common(1)[0]
+                if votes > self.num_samples // 2:
+                    self.consensus = answer
+        if self.consensus is not None:
+            return [True] * rows
+        return [i in self.answers for i in range(rows)]
+
+    def __call__(self, input_ids, scores, **kwargs):
+        done = self.check(input_ids)
+        if not self.per_row:
+            return all(done)
+        if HAS_TORCH and isinstance(input_ids, torch.Tensor):
+            return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+        return np.array(done, dtype=bool)
+
+    def finished(self, last_tokens: Sequence[int], eos_token_id: Optional[int]) -> List[bool]:
+        """
+        Which returned samples are complete. Without a consensus stop every
+        sample ran to EOS or max_new_tokens; after one, only samples that
+        boxed an answer or had already ended (EOS, also the padding) count.
+        """
+        if self.consensus is None:
+            return [True] * len(last_tokens)
+        return [i in self.answers or int(token) == eos_token_id for i, token in enumerate(last_tokens)]
+
+
+def generate_samples(model, tokenizer, prompt: str, num_samples: int,
+                     max_new_tokens: int = 1024, temperature: float = 0.6,
+                     check_every: int = 32, per_row: Optional[bool] = None) -> Tuple[List[str], List[bool]]:
+    """
+    All samples for one problem from one generate call. Returns (responses,
+    finished); finished[i] is False for a sample cut off by the consensus stop.
+    per_row defaults to what the installed transformers supports.
+    """
+    if per_row is None:
+        per_row = supports_per_row_stop()
+    inputs = tokenizer(prompt, return_tensors='pt').to(model.device)
+    inputs = {k: v for k, v in inputs.items() if k in ['input_ids', 'attention_mask']}
+    stopper = ConsensusStop(tokenizer, inputs['input_ids'].shape[1], num_samples, check_every, per_row)
+    criteria = StoppingCriteriaList([stopper]) if HAS_TRANSFORMERS else [stopper]
+    outputs = model.generate(
+        **inputs, max_new_tokens=max_new_tokens, temperature=temperature, do_sample=True,
+        num_return_sequences=num_samples, pad_token_id=tokenizer.eos_token_id,
+        stopping_criteria=criteria
+    )
+    responses = tokenizer.batch_decode(outputs, skip_special_tokens=True)
+    return responses, stopper.finished([row[-1] for row in outputs], tokenizer.eos_token_id)
+# <<< inlined: layers/layer_2_core/consensus_generation.py
+
 # --- 3. Prediction Pipeline ---
 
 def predict(*args, **kwargs):
@@ -212,18 +499,11 @@ def predict(*args, **kwargs):
             "<|assistant|>\n<|thought|>\n"
         )
 
-        # Optimized tokenization: encode once, then repeat tensors (Bolt optimization)
-        inputs = TOKENIZER(prompt, return_tensors='pt').to(MODEL.device)
-        inputs = {k: v.repeat(num_samples, 1) for k, v in inputs.items() if k in ['input_ids', 'attention_mask']}
-
-        with torch.no_grad():
-            outputs = MODEL.generate(
-                **inputs, max_new_tokens=1024, temperature=0.6, do_sample=True,
-                pad_token_id=TOKENIZER.eos_token_id
-            )
+        # One batched generate per problem; stops early on a majority boxed answer
+        responses, finished = generate_samples(MODEL, TOKENIZER, prompt, num_samples, max_new_tokens=1024)
 
-        for out in outputs:
-            response = TOKENIZER.decode(out, skip_special_tokens=True)
+        for response, done in zip(responses, finished):
+            if not done: continue  # Truncated samples do not vote
             # RTC: Extraction and execution
             code_blocks = PYTHON_CODE_PATTERN.findall(response)
             rtc_ans = None
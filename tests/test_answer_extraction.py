@@ -0,0 +1,54 @@
+import sys
+import os
+import json
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.answer_extraction import AnswerStream, boxed_value, extract_answer, last_boxed
+from layers.layer_2_core.aimo_math_solver import AIMOMathSolver
+
+GOLDEN = os.path.join(os.path.dirname(__file__), "data", "answer_extraction_golden.json")
+
+def load_corpus():
+    with open(GOLDEN) as f:
+        return json.load(f)
+
+def test_golden_corpus():
+    print("🧪 Testing Answer Extraction Golden Corpus...")
+    corpus = load_corpus()
+    solver = AIMOMathSolver(model_id_or_path="NON_EXISTENT")
+    for case in corpus:
+        assert extract_answer(case["text"]) == case["answer"], case["name"]
+        assert last_boxed(case["text"]) == case["boxed"], case["name"]
+        assert solver._extract_boxed_answer(case["text"]) == case["answer"], case["name"]
+    print(f"✅ {len(corpus)} Golden Cases Passed!")
+
+def test_streaming_matches_batch_extraction():
+    print("🧪 Testing Streaming Answer Detection...")
+    for case in load_corpus():
+        expected = boxed_value(case["boxed"]) if case["boxed"] is not None else None
+        for size in (1, 3, 7, 64):
+            stream = AnswerStream()
+            text = case["text"]
+            for start in range(0, len(text), size):
+                stream.feed(text[start:start + size])
+            # Only the last closed group counts; a group without digits keeps the earlier answer
+            if expected is not None:
+                assert stream.answer == expected, (case["name"], size)
+    print("✅ Streaming Detection Test Passed!")
+
+def test_stream_reports_answer_when_brace_closes():
+    print("🧪 Testing Streaming Early Stop Point...")
+    text = "First try \\boxed{10}, but correcting: \\boxed{\\frac{40}{2}} and more words"
+    stream, seen = AnswerStream(), []
+    for i, c in enumerate(text):
+        before = stream.answer
+        if stream.feed(c) != before:
+            seen.append((i, stream.answer))
+    assert seen == [(text.index("}"), 10), (text.index("}} ") + 1, 40)]
+    assert stream.boxed == "\\frac{40}{2}" and stream.finished
+    print("✅ Streaming Early Stop Test Passed!")
+
+if __name__ == "__main__":
+    test_golden_corpus()
+    test_streaming_matches_batch_extraction()
+    test_stream_reports_answer_when_brace_closes()
@@ -0,0 +1,54 @@
+import sys
+import os
+import re
+import subprocess
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.code_sandbox import SandboxPool, extract_rtc_answer, prepare_code
+
+def subprocess_answer(code):
+    """The one-interpreter-per-snippet RTC path the pool replaces."""
+    result = subprocess.run([sys.executable, "-c", prepare_code(code)], capture_output=True, text=True, timeout=15)
+    if result.returncode == 0:
+        nums = re.findall(r'-?\d+', result.stdout.strip())
+        if nums: return max(0, int(nums[-1])) % 100000
+    return None
+
+def test_sandbox_matches_subprocess_rtc():
+    print("🧪 Testing Sandbox Pool RTC...")
+    codes = [
+        "n = 2**20\nprint(sum(int(d) for d in str(n)))",
+        "7 * 6",
+        "print(-12)",
+        "print(10**12 + 7)",
+        "import math\nprint(math.comb(30, 12))",
+        "print('no digits')",
+        "raise ValueError('bad step')",
+        "import sys\nprint(5)\nsys.exit(1)",
+        "import sys\nprint(9)\nsys.exit(0)",
+        "x = input()",
+    ]
+    with SandboxPool(workers=2, timeout=5) as pool:
+        answers = [extract_rtc_answer(r) for r in pool.submit_many([prepare_code(c) for c in codes])]
+        assert answers == [subprocess_answer(c) for c in codes]
+        assert answers[:5] == [31, 42, 0, 7, 86493225 % 100000]
+    print("✅ Sandbox RTC Test Passed!")
+
+def test_sandbox_recovers_from_timeouts_and_crashes():
+    print("🧪 Testing Sandbox Worker Restarts...")
+    with SandboxPool(workers=1, timeout=0.5) as pool:
+        hung = pool.run("while True: pass")
+        assert not hung.ok and hung.error == "timeout"
+        crashed = pool.run("import os\nos._exit(3)")
+        assert not crashed.ok and crashed.error == "crash"
+        # Snippets do not leak state into each other
+        pool.run("leaked = 1\nimport sys\nsys.setrecursionlimit(50)")
+        after = pool.run("import sys\nprint(sys.getrecursionlimit() > 50)\nprint(leaked)")
+        assert not after.ok and after.stdout.strip() == "True"
+        assert pool.restarts == 2
+        assert extract_rtc_answer(pool.run("print(2 + 2)")) == 4
+    print("✅ Sandbox Restart Test Passed!")
+
+if __name__ == "__main__":
+    test_sandbox_matches_subprocess_rtc()
+    test_sandbox_recovers_from_timeouts_and_crashes()
@@ -0,0 +1,109 @@
+import sys
+import os
+import numpy as np
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.consensus_generation import ConsensusStop, generate_samples
+
+EOS = 0
+
+class ByteTokenizer:
+    """Stand-in tokenizer: one token per byte, 0 is EOS (and padding)."""
+    eos_token_id = EOS
+
+    class Encoding(dict):
+        def to(self, device):
+            return self
+
+    def __call__(self, text, return_tensors=None):
+        ids = np.array([list(text.encode())])
+        return self.Encoding(input_ids=ids, attention_mask=np.ones_like(ids))
+
+    def batch_decode(self, rows, skip_special_tokens=True):
+        return [bytes(int(t) for t in row if t != EOS).decode() for row in rows]
+
+class ScriptedModel:
+    """
+    CPU stand-in for a causal LM: sample i writes scripts[i] and then EOS.
+    generate() follows transformers >= 4.39: a row flagged done by the
+    stopping criteria is padded from then on, and decoding ends once every
+    row is done.
+    """
+    device = "cpu"
+
+    def __init__(self, scripts):
+        self.scripts = [list(s.encode()) for s in scripts]
+        self.steps = 0
+
+    def generate(self, input_ids, attention_mask, max_new_tokens, num_return_sequences,
+                 stopping_criteria, pad_token_id, **kwargs):
+        ids = np.repeat(input_ids, num_return_sequences, axis=0)
+        running = np.ones(len(ids), dtype=bool)
+        for step in range(max_new_tokens):
+            tokens = np.array([s[step] if step < len(s) else EOS for s in self.scripts])
+            tokens = np.where(running, tokens, pad_token_id)
+            ids = np.concatenate([ids, tokens[:, None]], axis=1)
+            running &= tokens != EOS
+            self.steps += 1
+            for criterion in stopping_criteria:
+                done = criterion(ids, None)
+                if np.ndim(done) == 0:
+                    running &= not done
+                else:
+                    running &= ~done
+            if not running.any():
+                break
+        return ids
+
+def rows(*texts, prompt_len=2):
+    width = max(len(t) for t in texts)
+    return np.array([[9] * prompt_len + list(t.encode()) + [EOS] * (width - len(t)) for t in texts])
+
+def test_consensus_stop_rows_and_majority():
+    print("🧪 Testing ConsensusStop Per-Row Done And Majority...")
+    stop = ConsensusStop(ByteTokenizer(), prompt_len=2, num_samples=3, check_every=4)
+    first = rows("\\boxed{12}..", "working.....", "still going.")
+    assert list(stop(first[:, :6], None)) == [False, False, False]  # \boxed{ not closed yet
+    assert list(stop(first[:, :13], None)) == [False] * 3            # 11 new tokens: not a check step
+    assert list(stop(first[:, :14], None)) == [True, False, False]   # row 0 boxed, no majority
+    assert stop.consensus is None and stop.answers == {0: 12}
+
+    second = rows("\\boxed{12}......", "so \\boxed{12}...", "still going.....")
+    assert list(stop(second[:, :18], None)) == [True, True, True]
+    assert stop.consensus == 12 and stop.answers == {0: 12, 1: 12}
+    # Row 2 was cut off by the stop; a row that ended on its own (EOS) is complete
+    assert stop.finished([7, 7, 5], EOS) == [True, True, False]
+    assert stop.finished([7, 7, EOS], EOS) == [True, True, True]
+
+    whole_batch = ConsensusStop(ByteTokenizer(), prompt_len=2, num_samples=3, check_every=4, per_row=False)
+    assert whole_batch(first[:, :14], None) is False
+    assert whole_batch(second[:, :18], None) is True
+    print("✅ ConsensusStop Test Passed!")
+
+def test_generate_samples_stops_at_consensus():
+    print("🧪 Testing Batched Generation With A Stand-In Model...")
+    scripts = [
+        "Short: \\boxed{5}",
+        "A longer derivation, then \\boxed{5}",
+        "This sample keeps reasoning for a very long time without ever finishing its argument",
+        "Different: \\boxed{9}",
+        "By symmetry the answer is \\boxed{5}",
+    ]
+    model = ScriptedModel(scripts)
+    responses, finished = generate_samples(model, ByteTokenizer(), "Q?", len(scripts),
+                                           max_new_tokens=200, check_every=4, per_row=True)
+    assert finished == [True, True, False, True, True]
+    assert responses[0] == "Q?" + scripts[0] and responses[3] == "Q?" + scripts[3]
+    assert len(responses[2]) < len("Q?" + scripts[2])  # truncated mid-sentence
+    assert model.steps < len(scripts[2])
+
+    # Without per-row masks the batch still stops at consensus
+    model = ScriptedModel(scripts)
+    _, finished = generate_samples(model, ByteTokenizer(), "Q?", len(scripts),
+                                   max_new_tokens=200, check_every=4, per_row=False)
+    assert finished == [True, True, False, True, True]
+    print("✅ Batched Generation Test Passed!")
+
+if __name__ == "__main__":
+    test_consensus_stop_rows_and_majority()
+    test_generate_samples_stops_at_consensus()
@@ -0,0 +1,66 @@
+import sys
+import os
+import json
+import numpy as np
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.omega_enhancement_1_interactions import DimensionInteractionMatrix
+
+BASE_DIMENSIONS = {
+    'P': 0.097, 'T': 0.087, 'F': 0.087, 'S': 0.087, 'C': 0.063, 'R': 0.063,
+    'D1': 0.021, 'D2': 0.017, 'D3': 0.023, 'D4': 0.029, 'D5': 0.013,
+    'D6': 0.026, 'D7': 0.025, 'D8': 0.030, 'D9': 0.021, 'D10': 0.035,
+    'D11': 0.026, 'D12': 0.024, 'D13': 0.038, 'D14': 0.023, 'D15': 0.032,
+    'D16': 0.024, 'D17': 0.029, 'D18': 0.022, 'D19': 0.021, 'D20': 0.034,
+}
+
+def pairwise_quality(matrix, scores):
+    """The per-pair definition: linear term plus c_ij·d_i·d_j for each active pair."""
+    q = sum(w * scores.get(dim, 0) for dim, w in BASE_DIMENSIONS.items())
+    for (dim1, dim2), inter in matrix.interactions.items():
+        s1, s2 = scores.get(dim1, 0), scores.get(dim2, 0)
+        if dim1 > dim2 and s1 > 0 and s2 > 0:
+            q += inter.coefficient * s1 * s2
+    return q
+
+def test_batched_quality_matches_pairwise_sum():
+    print("🧪 Testing Vectorized Interaction Quality...")
+    dense = DimensionInteractionMatrix(BASE_DIMENSIONS)
+    sparse = DimensionInteractionMatrix(BASE_DIMENSIONS, sparse=True)
+    assert np.allclose(dense.coefficients, dense.coefficients.T)
+    assert np.allclose(sparse.coefficients.toarray(), dense.coefficients)
+
+    rng = np.random.default_rng(12)
+    corpus = [{dim: float(rng.uniform(-0.2, 1.0)) for dim in BASE_DIMENSIONS if rng.random() > 0.3}
+              for _ in range(200)]
+    expected = np.array([pairwise_quality(dense, scores) for scores in corpus])
+    X = dense.to_matrix(corpus)
+    assert np.allclose(dense.compute_quality(X), expected)
+    assert np.allclose(sparse.compute_quality(X), expected)
+    assert np.isclose(dense.compute_quality(X[7]), expected[7])
+    print("✅ Vectorized Quality Test Passed!")
+
+def test_details_are_a_plain_dict():
+    print("🧪 Testing Interaction Breakdown...")
+    matrix = DimensionInteractionMatrix(BASE_DIMENSIONS)
+    scores = {'D13': 0.95, 'D15': 0.95, 'D14': 0.95, 'C': 0.95, **{d: 0.1 for d in ('P', 'T', 'F')}}
+    quality, summary = matrix.compute_quality_with_interactions(scores)
+    assert np.isclose(quality, pairwise_quality(matrix, scores))
+    assert type(summary) is dict and 'active_interactions' not in summary  # built only on request
+
+    _, details = matrix.compute_quality_with_interactions(scores, details=True)
+    assert type(details) is dict and 'active_interactions' in dict(details)
+    assert json.loads(json.dumps(details))['total_quality'] == summary['total_quality']
+
+    active = details['active_interactions']
+    assert active == matrix.active_interactions(scores)
+    assert {'dims': ('D15', 'D14'), 'effect': 0.20 * 0.95 * 0.95, 'type': 'synergy',
+            'explanation': matrix.interactions[('D14', 'D15')].explanation} in active
+    assert any(a['type'] == 'antagonism' for a in active)
+    assert all(abs(a['effect']) > 0.01 for a in active)
+    assert [abs(a['effect']) for a in active] == sorted((abs(a['effect']) for a in active), reverse=True)
+    print("✅ Interaction Breakdown Test Passed!")
+
+if __name__ == "__main__":
+    test_batched_quality_matches_pairwise_sum()
+    test_details_are_a_plain_dict()
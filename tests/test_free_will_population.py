@@ -0,0 +1,62 @@
+import sys
+import os
+import numpy as np
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.free_will_framework import (
+    AgentState, CausalEntropyCalculator, FreeWillIndex, vectorized
+)
+
+@vectorized
+def noisy_dynamics(states, actions):
+    drive = np.pad(actions, ((0, 0), (0, states.shape[1] - actions.shape[1])))
+    return 0.9 * states + 0.1 * drive + np.random.randn(*states.shape) * 0.01
+
+def make_population(n):
+    rng = np.random.default_rng(21)
+    return [AgentState(rng.normal(size=6), rng.random(4), rng.normal(size=5) * 0.5, rng.normal(size=(10, 3)))
+            for _ in range(n)]
+
+def make_index():
+    fwi = FreeWillIndex()
+    fwi.causal_calc = CausalEntropyCalculator(time_horizon=10, n_samples=100)
+    return fwi
+
+def test_compute_many_is_deterministic_across_workers():
+    print("🧪 Testing FreeWillIndex Population Sweeps...")
+    agents = make_population(12)
+    connectivity = np.random.default_rng(4).random((6, 6))
+    bounds = np.full(3, 2.0)
+
+    serial = list(make_index().compute_many(agents, noisy_dynamics, connectivity, bounds, seed=3))
+    assert [i for i, _ in serial] == list(range(12))
+    pooled = dict(make_index().compute_many(agents, noisy_dynamics, connectivity, bounds, workers=3, seed=3))
+    assert dict(serial) == pooled
+    for result in pooled.values():
+        assert 0 <= result['fwi'] <= 1
+
+    # Same seed, same population → same scores; the caller's RNG stream is left alone.
+    np.random.seed(0)
+    before = np.random.rand()
+    np.random.seed(0)
+    again = dict(make_index().compute_many(agents, noisy_dynamics, connectivity, bounds, seed=3))
+    assert again == pooled and np.random.rand() == before
+    print("✅ Population Sweep Test Passed!")
+
+def test_shared_connectivity_reuses_spectrum():
+    print("🧪 Testing Cached Laplacian Spectrum...")
+    fwi = make_index()
+    connectivity = np.random.default_rng(8).random((6, 6))
+    spectrum = fwi.phi_calc.laplacian_spectrum(connectivity)
+    assert fwi.phi_calc.laplacian_spectrum(connectivity.copy()) is spectrum
+    list(fwi.compute_many(make_population(3), noisy_dynamics, connectivity, np.full(3, 2.0), seed=1))
+    assert fwi.phi_calc.laplacian_spectrum(connectivity) is spectrum
+
+    # Edits to the matrix invalidate the cache.
+    connectivity[0, 1] += 1.0
+    assert fwi.phi_calc.laplacian_spectrum(connectivity) is not spectrum
+    print("✅ Cached Spectrum Test Passed!")
+
+if __name__ == "__main__":
+    test_compute_many_is_deterministic_across_workers()
+    test_shared_connectivity_reuses_spectrum()
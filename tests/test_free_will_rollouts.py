@@ -0,0 +1,59 @@
+import sys
+import os
+import numpy as np
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.free_will_framework import (
+    CausalEntropyCalculator, CounterfactualDepthCalculator, RolloutEngine,
+    count_unique_states, quantize_states, vectorized
+)
+
+def single_dynamics(s, a):
+    return 0.9 * s + 0.1 * np.pad(a, (0, len(s) - len(a)))
+
+@vectorized
+def batch_dynamics(states, actions):
+    return 0.9 * states + 0.1 * np.pad(actions, ((0, 0), (0, states.shape[1] - actions.shape[1])))
+
+def test_unique_state_counting():
+    print("🧪 Testing Grid-Quantized State Counting...")
+    rng = np.random.default_rng(3)
+    states = np.round(rng.normal(size=(4000, 6)), 1)
+    states[1::2] = states[::2]
+    expected = len({tuple(np.round(s, 2)) for s in states})
+    assert count_unique_states(quantize_states(states, decimals=2)) == expected
+    assert count_unique_states(quantize_states(states.reshape(40, 100, 6), decimals=2)) == expected
+    print("✅ State Counting Test Passed!")
+
+def test_vectorized_matches_single_state_dynamics():
+    print("🧪 Testing Batched Rollouts...")
+    state = np.random.default_rng(0).normal(size=8)
+    actions = np.random.default_rng(1).normal(size=(12, 3))
+    calc = CausalEntropyCalculator(time_horizon=20, n_samples=200)
+
+    np.random.seed(7)
+    h_single = calc.compute_causal_entropy(state, single_dynamics, actions)
+    np.random.seed(7)
+    h_batch = calc.compute_causal_entropy(state, batch_dynamics, actions)
+    assert h_single == h_batch
+
+    with RolloutEngine(single_dynamics, workers=2) as pooled:
+        indices = np.random.randint(0, len(actions), (50, 10))
+        serial = RolloutEngine(batch_dynamics).rollout(state, indices, actions)
+        assert np.allclose(pooled.rollout(state, indices, actions), serial)
+
+    # Deterministic dynamics: H(S|A) = 0, so empowerment is the entropy of the final states.
+    np.random.seed(11)
+    emp_single = calc.compute_empowerment(state, single_dynamics, actions)
+    np.random.seed(11)
+    emp_batch = calc.compute_empowerment(state, batch_dynamics, actions)
+    assert np.isclose(emp_single, emp_batch) and emp_batch > 0
+
+    n_single, div_single = CounterfactualDepthCalculator().compute_counterfactual_depth(state, actions, single_dynamics)
+    n_batch, div_batch = CounterfactualDepthCalculator().compute_counterfactual_depth(state, actions, batch_dynamics)
+    assert (n_single, div_single) == (n_batch, div_batch)
+    print("✅ Batched Rollouts Test Passed!")
+
+if __name__ == "__main__":
+    test_unique_state_counting()
+    test_vectorized_matches_single_state_dynamics()
@@ -0,0 +1,113 @@
+import sys
+import os
+import tempfile
+import numpy as np
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.global_realization_ledger import LedgerSync
+from layers.layer_4_discovery.grand_integrated_simulation import GrandMetaOrchestrator
+from layers.layer_4_discovery import mco_checkpoint
+
+def make_mco(sync: LedgerSync, **kwargs) -> GrandMetaOrchestrator:
+    # Keep test realizations out of the shared project ledger.
+    mco = GrandMetaOrchestrator(**kwargs)
+    for brain in mco.domains.values():
+        brain.engine.ledger_sync = sync
+    return mco
+
+def test_array_task_tree_and_best_heap():
+    print("🧪 Testing Array-Backed Grand Orchestrator...")
+    with tempfile.TemporaryDirectory() as tmp, LedgerSync(os.path.join(tmp, "ledger.json")) as sync:
+        np.random.seed(0)
+        mco = make_mco(sync)
+        mco.feed_protocol("Test Protocol", depth=3)
+        mco.execute_and_merge(cycles=20)
+
+    # Array state is written back onto the TaskPoint leaves.
+    leaves = mco.leaf_nodes
+    assert len(leaves) == len(mco.leaf_status) >= 27
+    assert all(t.status in ("completed", "failed") for t in leaves)
+    assert all(t.pending_cycles == 19 for t in leaves)
+
+    # The heap agrees with a full scan of each domain engine.
+    for name, brain in mco.domains.items():
+        pool = [r for r in brain.engine.index.values() if r.q_score > 0.75 and f"D:{name}" in r.content]
+        expected = max(pool, key=lambda x: x.q_score) if pool else None
+        assert brain.best_realization(min_q=0.75) is expected
+
+    report = mco.get_report()
+    assert report["stats"]["merger_events"] == 20
+    assert len(report["universal_values"]) == 20
+    print("✅ Grand Orchestrator Test Passed!")
+
+def test_parallel_domains_match_serial():
+    print("🧪 Testing Process-Parallel Domain Brains...")
+    reports = []
+    with tempfile.TemporaryDirectory() as tmp, LedgerSync(os.path.join(tmp, "ledger.json")) as sync:
+        for workers in [0, 2, 5]:
+            with make_mco(sync, workers=workers, seed=42) as mco:
+                mco.feed_protocol("Test Protocol", depth=4)
+                mco.execute_and_merge(cycles=10)
+                reports.append(mco.get_report())
+        sync.flush()
+        # Worker realizations reach the ledger through the parent.
+        assert sync.stats["synced"] == 3 * len(mco.leaf_nodes)
+
+    assert reports[0] == reports[1] == reports[2]
+    assert all(t.status != "pending" for t in mco.leaf_nodes)
+    print("✅ Parallel Domain Test Passed!")
+
+def test_checkpoint_resume_matches_uninterrupted_run():
+    print("🧪 Testing MCO Checkpoint/Resume...")
+    with tempfile.TemporaryDirectory() as tmp, LedgerSync(os.path.join(tmp, "ledger.json")) as sync:
+        path = os.path.join(tmp, "mco.ckpt")
+        np.random.seed(1)
+        straight = make_mco(sync)
+        straight.feed_protocol("Test Protocol", depth=3)
+        straight.execute_and_merge(cycles=40)
+
+        np.random.seed(1)
+        first = make_mco(sync)
+        first.feed_protocol("Test Protocol", depth=3)
+        first.execute_and_merge(cycles=25, checkpoint_path=path, checkpoint_every=10)
+        np.random.seed(123)  # the checkpoint carries the global RNG state
+
+        resumed = GrandMetaOrchestrator.load_checkpoint(path)
+        assert resumed.cycles_completed == 25
+        for brain in resumed.domains.values():
+            brain.engine.ledger_sync = sync
+        resumed.execute_and_merge(cycles=15)
+
+    assert resumed.get_report() == straight.get_report()
+    assert [t.status for t in resumed.leaf_nodes] == [t.status for t in straight.leaf_nodes]
+    print("✅ Checkpoint/Resume Test Passed!")
+
+def test_background_checkpoint_snapshots_off_the_loop_thread():
+    print("🧪 Testing Background MCO Checkpoint Snapshot...")
+    with tempfile.TemporaryDirectory() as tmp, LedgerSync(os.path.join(tmp, "ledger.json")) as sync:
+        path = os.path.join(tmp, "mco.ckpt")
+        mco = make_mco(sync)
+        mco.feed_protocol("Test Protocol", depth=3)
+        mco.execute_and_merge(cycles=5)
+
+        pickled_here = []
+        dump_state = mco_checkpoint.dump_state
+        mco_checkpoint.dump_state = lambda obj: pickled_here.append(1) or dump_state(obj)
+        try:
+            mco.save_checkpoint(path, blocking=False)
+        finally:
+            mco_checkpoint.dump_state = dump_state
+        assert pickled_here == []  # the writer pickles, not the cycle loop
+
+        mco.execute_and_merge(cycles=5)  # keeps running while the snapshot is written
+        mco.wait_for_checkpoint()
+        assert mco._checkpoint_writer.writes == 1 and mco._checkpoint_writer.error is None
+        snapshot = GrandMetaOrchestrator.load_checkpoint(path)
+        assert snapshot.cycles_completed == 5 and mco.cycles_completed == 10
+    print("✅ Background Checkpoint Test Passed!")
+
+if __name__ == "__main__":
+    test_array_task_tree_and_best_heap()
+    test_parallel_domains_match_serial()
+    test_checkpoint_resume_matches_uninterrupted_run()
+    test_background_checkpoint_snapshots_off_the_loop_thread()
@@ -0,0 +1,218 @@
+import sys
+import os
+import threading
+import time
+import numpy as np
+import pytest
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.inference_server import ContinuousBatchingServer, InferenceClient, TransformersDecodeModel
+from layers.layer_2_core.aimo_math_solver import AIMOMathSolver
+
+try:
+    import torch
+    from transformers import GPT2Config, GPT2LMHeadModel
+    HAS_TRANSFORMERS = True
+except ImportError:
+    HAS_TRANSFORMERS = False
+
+class TinyBigramModel:
+    """CPU stand-in LM: next-token logits depend only on the last token."""
+    eos_token_id = 0
+
+    def __init__(self, vocab=24, seed=0, delay=0.0):
+        self.table = np.random.default_rng(seed).normal(size=(vocab, vocab))
+        self.delay = delay
+        self.batch_sizes = []
+
+    def prefill(self, token_ids):
+        return len(token_ids), self.table[token_ids[-1]]
+
+    def decode(self, caches, tokens):
+        time.sleep(self.delay)
+        self.batch_sizes.append(len(tokens))
+        return [c + 1 for c in caches], self.table[list(tokens)]
+
+    def greedy(self, prompt, max_new_tokens):
+        out = []
+        token = prompt[-1]
+        while len(out) < max_new_tokens:
+            token = int(self.table[token].argmax())
+            out.append(token)
+            if token == self.eos_token_id: break
+        return out
+
+class ByteTokenizer:
+    def encode(self, text):
+        return list(text.encode())
+
+    def decode(self, tokens, skip_special_tokens=True):
+        return bytes(t for t in tokens if t != 0).decode(errors="replace")
+
+class ScriptedModel:
+    """Replies to each problem with a fixed worked solution, one byte per decode step."""
+    eos_token_id = 0
+
+    def __init__(self, scripts):
+        self.scripts = scripts
+
+    def _logits(self, script, pos):
+        logits = np.full(256, -1e9)
+        logits[script[pos] if pos < len(script) else 0] = 0.0
+        return logits
+
+    def prefill(self, token_ids):
+        prompt = bytes(token_ids).decode()
+        script = next(list(reply.encode()) for key, reply in self.scripts.items() if key in prompt)
+        return (script, 1), self._logits(script, 0)
+
+    def decode(self, caches, tokens):
+        caches = [(script, pos + 1) for script, pos in caches]
+        return caches, np.stack([self._logits(script, pos - 1) for script, pos in caches])
+
+def test_continuous_batching_matches_sequential_greedy():
+    print("🧪 Testing Continuous Batching Server...")
+    model = TinyBigramModel(delay=0.002)
+    prompts = [[3, 7], [5], [11, 2, 9], [1], [17, 4]]
+    with ContinuousBatchingServer(model, max_batch_size=4, seed=0) as server:
+        futures = {}
+        def client(i):
+            time.sleep(0.005 * i)  # requests arrive while others are decoding
+            futures[i] = server.submit(prompts[i], n=2, max_new_tokens=40)
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(len(prompts))]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        results = {i: f.result(timeout=10) for i, f in futures.items()}
+        stats = server.stats()
+
+    for i, prompt in enumerate(prompts):
+        expected = model.greedy(prompt, 40)
+        for c in results[i]:
+            assert c.tokens == expected
+            assert c.finish_reason == ("eos" if expected[-1] == 0 else "length")
+    # Decode steps were shared across requests
+    assert max(model.batch_sizes) > 2
+    assert stats.completed_requests == len(prompts)
+    assert stats.generated_tokens == sum(len(c.tokens) for r in results.values() for c in r)
+    assert stats.queue_depth == 0 and stats.active_sequences == 0
+    assert stats.tokens_per_second > 0 and stats.mean_batch_size > 1
+    print(f"   {stats.generated_tokens} tokens at {stats.tokens_per_second:.0f} tok/s, mean batch {stats.mean_batch_size:.2f}")
+    print("✅ Continuous Batching Test Passed!")
+
+def test_server_reports_queue_depth_when_full():
+    print("🧪 Testing Inference Server Queue Depth...")
+    model = TinyBigramModel(vocab=8, seed=1, delay=0.002)
+    model.table[:, 0] = -1e9  # never emit EOS, so every sample runs to max_new_tokens
+    with ContinuousBatchingServer(model, max_batch_size=2, seed=0) as server:
+        futures = [server.submit([1], n=2, max_new_tokens=30) for _ in range(3)]
+        assert server.stats().queue_depth >= 1
+        for f in futures:
+            assert [len(c.tokens) for c in f.result(timeout=10)] == [30, 30]
+        assert max(model.batch_sizes) == 2
+        assert server.stats().completed_requests == 3
+    print("✅ Queue Depth Test Passed!")
+
+def test_close_mid_step_resolves_every_future():
+    print("🧪 Testing Inference Server Close During A Decode Step...")
+    model = TinyBigramModel(vocab=8, seed=1, delay=0.2)
+    model.table[:, 0] = -1e9
+    server = ContinuousBatchingServer(model, max_batch_size=1, seed=0)
+    running = server.submit([1], max_new_tokens=100)
+    queued = server.submit([2], max_new_tokens=100)
+    time.sleep(0.05)  # the first request is inside model.decode
+    server.close()
+    for f in (running, queued):
+        try:
+            f.result(timeout=3)
+            assert False, "a closed server must not complete requests"
+        except RuntimeError as e:
+            assert "closed" in str(e)
+    print("✅ Close Mid-Step Test Passed!")
+
+def test_scheduler_crash_fails_outstanding_futures():
+    print("🧪 Testing Inference Server Loop Failure...")
+    class BrokenModel(TinyBigramModel):
+        def decode(self, caches, tokens):
+            return caches, None  # unusable logits blow up in the sampler
+    model = BrokenModel()
+    model.table[:, 0] = -1e9
+    server = ContinuousBatchingServer(model, seed=0)
+    futures = [server.submit([1], max_new_tokens=10), server.submit([2], n=2, max_new_tokens=10)]
+    for f in futures:
+        assert f.exception(timeout=3) is not None
+    try:
+        server.submit([3])
+        assert False, "a crashed server must refuse new requests"
+    except RuntimeError:
+        pass
+    server.close()
+    print("✅ Loop Failure Test Passed!")
+
+@pytest.mark.skipif(not HAS_TRANSFORMERS, reason="needs torch and transformers")
+def test_transformers_decode_matches_generate():
+    print("🧪 Testing Batched KV-Cache Decode On A Tiny GPT-2...")
+    torch.manual_seed(0)
+    config = GPT2Config(vocab_size=64, n_positions=64, n_embd=32, n_layer=2, n_head=2,
+                        bos_token_id=63, eos_token_id=63)
+    model = GPT2LMHeadModel(config).eval()
+    decoder = TransformersDecodeModel(model)
+    prompts = [[5, 17, 2, 40, 11, 9, 33], [8, 21]]  # unequal lengths force cache padding
+    steps = 12
+
+    def greedy(logits):
+        logits = np.array(logits)
+        logits[..., config.eos_token_id] = -np.inf  # as generate does under min_new_tokens
+        return logits.argmax(axis=-1)
+
+    # Both sequences share every decode step, as in the server's batches
+    caches, tokens = zip(*((cache, int(greedy(logits))) for cache, logits in map(decoder.prefill, prompts)))
+    outputs = [[t] for t in tokens]
+    for _ in range(steps - 1):
+        caches, logits = decoder.decode(list(caches), list(tokens))
+        tokens = greedy(logits).tolist()
+        for output, token in zip(outputs, tokens):
+            output.append(token)
+    assert [length for _, length in caches] == [len(p) + steps - 1 for p in prompts]
+
+    for prompt, output in zip(prompts, outputs):
+        expected = model.generate(torch.tensor([prompt]), attention_mask=torch.ones(1, len(prompt), dtype=torch.long),
+                                  do_sample=False, max_new_tokens=steps, min_new_tokens=steps,
+                                  pad_token_id=config.eos_token_id)
+        assert output == expected[0, len(prompt):].tolist()
+    print("✅ Transformers Decode Test Passed!")
+
+def test_solver_overlaps_next_generation_with_rtc():
+    print("🧪 Testing Solver Pipelining Through The Inference Server...")
+    scripts = {
+        "first 10 squares": "```python\nprint(sum(i*i for i in range(1, 11)))\n```\nThe final answer is \\boxed{385}.",
+        "5 element set": "Each element is in or out.\nThe final answer is \\boxed{32}.",
+    }
+    server = ContinuousBatchingServer(ScriptedModel(scripts), max_batch_size=16, seed=0)
+    solver = AIMOMathSolver(model_id_or_path="NON_EXISTENT", client=InferenceClient(server, ByteTokenizer()))
+    assert solver.mode == "LOCAL"
+
+    events = []
+    submit, execute_codes = server.submit, solver._execute_codes
+    server.submit = lambda *a, **k: events.append("submit") or submit(*a, **k)
+    solver._execute_codes = lambda codes: events.append("rtc") or execute_codes(codes)
+    try:
+        outcomes = list(solver.solve_problems([
+            ("a", "Compute the sum of the first 10 squares."),
+            ("b", "How many subsets does a 5 element set have?"),
+        ]))
+    finally:
+        solver.close()
+
+    assert [o["answer"] for o in outcomes] == [385, 32]
+    # The second problem was already queued when the first one's code ran
+    assert events == ["submit", "submit", "rtc", "rtc"]
+    print("✅ Solver Pipelining Test Passed!")
+
+if __name__ == "__main__":
+    test_continuous_batching_matches_sequential_greedy()
+    test_server_reports_queue_depth_when_full()
+    test_close_mid_step_resolves_every_future()
+    test_scheduler_crash_fails_outstanding_futures()
+    if HAS_TRANSFORMERS:
+        test_transformers_decode_matches_generate()
+    test_solver_overlaps_next_generation_with_rtc()
@@ -0,0 +1,45 @@
+import sys
+import os
+import numpy as np
+sys.path.append(os.getcwd())
+
+from layers.layer_4_discovery.omega_production_trainer_final import ProductionOmegaTrainer, TEST_CONFIG
+
+def test_batched_update_matches_accumulated_outer_products():
+    print("🧪 Testing Batched OMEGA Forward/Update...")
+    np.random.seed(0)
+    config = dict(TEST_CONFIG, num_episodes=5, prompts_per_episode=16, embedding_dim=32, hidden_dim=16)
+    trainer = ProductionOmegaTrainer(config)
+    W2 = trainer.W2.copy()
+
+    state = np.random.get_state()
+    embeddings = np.random.randn(16, 32)
+    np.random.set_state(state)
+    trainer.discover_dimensions(episode=3)
+
+    # One update per batch == sum of the per-prompt rank-1 updates at fixed W2
+    expected = W2.copy()
+    for emb in embeddings:
+        h = np.maximum(0, emb @ trainer.W1 + trainer.b1)
+        act = 1 / (1 + np.exp(-(h @ W2 + trainer.b2)))
+        expected += 0.0005 * np.outer(h, (0.75 + 3 * 0.0003 - 0.7) * act * 0.1)
+    assert np.allclose(trainer.W2, expected)
+
+    h, acts = trainer.forward_batch(embeddings)
+    assert np.allclose(acts[4], trainer.forward_pass(embeddings[4]))
+    print("✅ Batched OMEGA Test Passed!")
+
+def test_report_includes_timing():
+    print("🧪 Testing OMEGA Timing Report...")
+    np.random.seed(1)
+    trainer = ProductionOmegaTrainer(dict(TEST_CONFIG, num_episodes=6, prompts_per_episode=8, embedding_dim=16, hidden_dim=8))
+    report = trainer.train()
+    timing = report['timing']
+    assert len(trainer.episode_times) == 6
+    assert timing['prompts_per_s'] > 0 and timing['episode_p95_s'] >= timing['episode_p50_s']
+    assert 0 < timing['discovery_share'] <= 1
+    print("✅ Timing Report Test Passed!")
+
+if __name__ == "__main__":
+    test_batched_update_matches_accumulated_outer_products()
+    test_report_includes_timing()
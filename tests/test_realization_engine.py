@@ -0,0 +1,164 @@
+import sys
+import os
+import tempfile
+import numpy as np
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.global_realization_ledger import LedgerSync
+from layers.layer_2_core.realization_engine import RealizationEngine, RealizationFeatures
+from layers.layer_2_core.realization_index import RealizationIndex, tokenize
+
+_TMP = tempfile.TemporaryDirectory()
+_SYNC = LedgerSync(os.path.join(_TMP.name, "ledger.json"))
+
+HIGH = RealizationFeatures(0.95, 0.93, 0.92, 0.90, 0.95, 0.92)
+MID = RealizationFeatures(0.80, 0.80, 0.85, 0.80, 0.85, 0.75)
+
+def make_engine() -> RealizationEngine:
+    # Keep test realizations out of the shared project ledger.
+    return RealizationEngine(ledger_sync=_SYNC)
+
+def test_inverted_index_retrieval():
+    print("🧪 Testing Inverted-Index Retrieval...")
+    engine = make_engine()
+    engine.add_realization("Precision certainty drives crystallization of layers.", HIGH, turn_number=1)
+    engine.add_realization("Modular arithmetic shortcuts for olympiad problems.", MID, turn_number=2)
+    engine.add_realization("Symmetry arguments reduce combinatorial search.", MID, turn_number=3)
+
+    results = engine.retrieve("precision certainty")
+    assert [r.content for r in results] == ["Precision certainty drives crystallization of layers."]
+
+    # Punctuation no longer hides tokens, and unrelated text is filtered by the threshold.
+    assert len(engine.retrieve("layers")) == 1
+    assert engine.retrieve("quantum teleportation") == []
+
+    # A long problem statement scores by how much of each realization it covers.
+    problem = "Use modular arithmetic to count olympiad problems where symmetry helps."
+    assert {r.content for r in engine.retrieve(problem, similarity_threshold=0.1)} == {
+        "Modular arithmetic shortcuts for olympiad problems.",
+        "Symmetry arguments reduce combinatorial search.",
+    }
+    assert [r.content for r in engine.retrieve(problem, similarity_threshold=0.6)] == [
+        "Modular arithmetic shortcuts for olympiad problems."
+    ]
+    print("✅ Retrieval Test Passed!")
+
+def brute_force_search(index, layer, query, threshold):
+    """Score every document of the layer, as the pre-index scan did."""
+    docs = index.layers[layer]
+    terms = tokenize(query)
+    hits = []
+    for rid, d_terms in docs.doc_terms.items():
+        shared = sum(docs.idf(t) for t in terms & d_terms)
+        denom = min(sum(docs.idf(t) for t in terms), sum(docs.idf(t) for t in d_terms))
+        score = shared / denom if denom > 0 else 0.0
+        if score >= threshold: hits.append((rid, score))
+    return sorted(hits)
+
+def test_index_search_matches_brute_force():
+    print("🧪 Testing Index Recall Against A Full Scan...")
+    index = RealizationIndex()
+    for i, content in enumerate(["prime", "prime numbers", "prime factors", "prime gaps"]):
+        index.add(str(i), 1, content)
+    # 'prime' is in every document, yet doc 0 is fully covered by the query
+    hits = sorted(index.search(1, "prime numbers", 0.5))
+    assert [rid for rid, _ in hits] == ["0", "1"]
+    assert hits == brute_force_search(index, 1, "prime numbers", 0.5)
+
+    rng = np.random.default_rng(8)
+    vocab = [f"w{i}" for i in range(12)]
+    for i in range(4, 80):
+        index.add(str(i), 1, " ".join(rng.choice(vocab, size=rng.integers(1, 6))))
+    for _ in range(50):
+        query = " ".join(rng.choice(vocab, size=rng.integers(1, 5)))
+        threshold = float(rng.uniform(0.1, 1.0))
+        assert sorted(index.search(1, query, threshold)) == brute_force_search(index, 1, query, threshold)
+    print("✅ Index Recall Test Passed!")
+
+def test_batch_q_scores_match_scalar():
+    print("🧪 Testing Vectorized Q-Scoring...")
+    engine = make_engine()
+    engine.weights["D7"] = 0.07
+    rng = np.random.default_rng(7)
+    X = rng.random((5000, 6))
+    X[:500] = np.round(X[:500], 2)  # exercise exact 0.9 boosts and rounding ties
+    feats = [RealizationFeatures(*map(float, row)) for row in X]
+    feats[::3] = [RealizationFeatures(*map(float, row), extra_features={"D7": float(row[2])}) for row in X[::3]]
+
+    for method in ["linear", "integrated"]:
+        batch = engine.calculate_q_scores_batch(feats, method=method)
+        expected = [engine.calculate_q_score(f, method)[0] for f in feats]
+        assert batch.q_scores.tolist() == expected
+        assert batch.layers == [engine.assign_layer(q, f) for q, f in zip(expected, feats)]
+
+    batch = engine.calculate_q_scores_batch(X)
+    assert batch.penalties.tolist() == [bool(c > g + 0.2) for g, c in X[:, :2]]
+    print("✅ Vectorized Q-Scoring Test Passed!")
+
+def test_batch_ingest_matches_sequential():
+    print("🧪 Testing Bulk Ingest...")
+    rng = np.random.default_rng(11)
+    rows = rng.uniform(0.6, 1.0, size=(45, 6))
+    items = [{"content": f"Bulk insight {i}", "features": RealizationFeatures(*map(float, row))} for i, row in enumerate(rows)]
+    items[5]["parents"] = [RealizationEngine().generate_id("Bulk insight 0")]
+
+    sequential = make_engine()
+    for item in items:
+        sequential.add_realization(item["content"], item["features"], turn_number=1, parents=item.get("parents"))
+
+    batched = make_engine()
+    out = batched.add_realizations_batch(items, trigger_evolution=False)
+
+    assert [r.q_score for r in out] == [sequential.index[r.id].q_score for r in out]
+    assert batched.stats["layer_distribution"] == sequential.stats["layer_distribution"]
+    assert batched.stats["total_realizations"] == 45
+    assert abs(batched.stats["avg_q_score"] - sequential.stats["avg_q_score"]) < 1e-12
+    assert batched.index[out[0].id].children == [out[5].id]
+    assert batched.stats["weight_evolution_count"] == 0
+    print("✅ Bulk Ingest Test Passed!")
+
+def test_running_stats_track_insert_delete_rescore():
+    print("🧪 Testing Running Statistics...")
+    engine = make_engine()
+    rng = np.random.default_rng(3)
+    rows = rng.uniform(0.5, 1.0, size=(40, 6))
+    out = engine.add_realizations_batch(
+        [{"content": f"Stat insight {i}", "features": RealizationFeatures(*map(float, row))} for i, row in enumerate(rows)],
+        trigger_evolution=False
+    )
+    engine.remove_realization(out[0].id)
+    engine.set_q_score(out[1].id, 1.25)
+    engine.weights["G"] = 0.3
+    engine.rescore_realizations([r.id for r in out[2:10]])
+
+    qs = np.array([r.q_score for r in engine.index.values()])
+    rs = engine.running_stats
+    assert engine.stats["total_realizations"] == len(engine.index) == 39
+    assert abs(engine.stats["avg_q_score"] - qs.mean()) < 1e-12
+    assert abs(rs.variance - qs.var()) < 1e-12
+    assert rs.max == 1.25
+    assert abs(rs.quantile(0.5) - np.quantile(qs, 0.5)) < 0.01
+    for layer, count in engine.stats["layer_distribution"].items():
+        assert count == len(engine.layers[layer])
+
+    # Inserts and removals in a known layer reuse its sketch; a new layer gets its own
+    sketches = dict(rs.sketches)
+    inserted = rng.uniform(0.5, 1.0, size=100)
+    for q in inserted:
+        rs.add(q, 2)
+    rs.add(0.7, "new-layer")
+    for q in inserted[:50]:
+        rs.remove(q, 2)
+    assert all(rs.sketches[layer] is sketch for layer, sketch in sketches.items())
+    assert set(rs.sketches) - set(sketches) == {"new-layer"}
+    assert abs(rs.quantile(0.5, "new-layer") - 0.7) < 0.01
+    layer_2 = np.array([r.q_score for r in engine.layers[2].values()] + list(inserted[50:]))
+    assert abs(rs.quantile(0.5, 2) - np.quantile(layer_2, 0.5)) < 0.01
+    print("✅ Running Statistics Test Passed!")
+
+if __name__ == "__main__":
+    test_inverted_index_retrieval()
+    test_index_search_matches_brute_force()
+    test_batch_q_scores_match_scalar()
+    test_batch_ingest_matches_sequential()
+    test_running_stats_track_insert_delete_rescore()
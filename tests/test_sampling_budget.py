@@ -0,0 +1,133 @@
+import sys
+import os
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.sampling_budget import BudgetScheduler
+from layers.layer_2_core.aimo_math_solver import AIMOMathSolver
+from layers.layer_2_core.inference_server import ContinuousBatchingServer, InferenceClient
+from tests.test_inference_server import ByteTokenizer, ScriptedModel
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def run_problem(scheduler, clock, votes, first_round=4, seconds_per_sample=10.0):
+    """Drive one problem through the scheduler; votes[i] is the vote after round i."""
+    budget = scheduler.start_problem("p", "STANDARD", first_round)
+    n, rounds = budget.first_round, 0
+    while n:
+        clock.now += n * seconds_per_sample
+        scheduler.record(n, n * seconds_per_sample)
+        if scheduler.observe(budget, n, votes[min(rounds, len(votes) - 1)]): break
+        rounds += 1
+        n = scheduler.next_round(budget)
+    return budget, scheduler.finish(budget)
+
+def test_settled_vote_stops_and_contested_vote_borrows():
+    print("🧪 Testing Budget Scheduler Early Stop...")
+    clock = FakeClock()
+    scheduler = BudgetScheduler(total_limit=2000, problems_total=10, reserve_seconds=0,
+                                prior_seconds_per_sample=10.0, clock=clock)
+
+    unanimous = {"margin": 1.0, "effective_n": 4.0}
+    budget, entry = run_problem(scheduler, clock, [unanimous])
+    assert budget.samples == 4 and budget.stop_reason == "settled"
+    assert entry["seconds"] == 40.0 and entry["z"] == 2.0
+
+    # A split vote keeps sampling past its fair share, up to the contested limit
+    split = {"margin": 0.2, "effective_n": 8.0}
+    budget, entry = run_problem(scheduler, clock, [split], seconds_per_sample=20.0)
+    assert budget.stop_reason == "budget"
+    assert entry["fair_share"] < entry["seconds"] <= entry["limit"]
+    assert budget.samples > 4
+    assert [e["stop_reason"] for e in scheduler.trace] == ["settled", "budget"]
+    print("✅ Budget Scheduler Early Stop Test Passed!")
+
+def test_shares_follow_measured_cost_and_remaining_time():
+    print("🧪 Testing Budget Scheduler Fair Shares...")
+    clock = FakeClock()
+    scheduler = BudgetScheduler(total_limit=1000, problems_total=10, reserve_seconds=100,
+                                prior_seconds_per_sample=10.0, clock=clock)
+    assert scheduler.start_problem("a", "DEEP", 8).first_round == 8  # 90s share at the 10s prior
+    scheduler.record(4, 200.0)  # measured: 50s per sample
+    budget = scheduler.start_problem("b", "DEEP", 8)
+    assert budget.first_round == 1 and abs(budget.fair_share - 90.0) < 1e-9
+
+    # With only the reserve left, a problem gets one sample if the hard limit allows, else none
+    clock.now = 880.0
+    assert scheduler.start_problem("c", "STANDARD", 4).first_round == 1
+    clock.now = 960.0
+    late = scheduler.start_problem("d", "STANDARD", 4)
+    assert late.first_round == 0 and late.stop_reason == "budget"
+    print("✅ Budget Scheduler Fair Share Test Passed!")
+
+def test_solver_samples_in_rounds_within_budget():
+    print("🧪 Testing Solver Budget Integration...")
+    solver = AIMOMathSolver(model_id_or_path="NON_EXISTENT")
+    clock = FakeClock()
+    solver.budget = BudgetScheduler(total_limit=9 * 3600, problems_total=3, clock=clock)
+
+    outcome = solver.solve_problem("What is 6 * 7?", id="easy")
+    assert outcome["answer"] == 42 and outcome["samples"] == 4
+
+    clock.now = 9 * 3600 + 1  # past the hard limit
+    late = solver.solve_problem("What is 6 * 7?", id="late")
+    assert late["samples"] == 0
+
+    trace = solver.budget.trace
+    assert [t["id"] for t in trace] == ["easy", "late"]
+    assert trace[0]["stop_reason"] == "settled" and trace[1]["stop_reason"] == "budget"
+    print("✅ Solver Budget Integration Test Passed!")
+
+class ClockedModel(ScriptedModel):
+    """Every decode step takes one second of fake time, however many sequences it carries."""
+    def __init__(self, scripts, clock):
+        super().__init__(scripts)
+        self.clock = clock
+
+    def decode(self, caches, tokens):
+        self.clock.now += 1.0
+        return super().decode(caches, tokens)
+
+def test_pipelined_problems_are_charged_once():
+    print("🧪 Testing Budget Accounting For Pipelined Problems...")
+    clock = FakeClock()
+    scripts = {
+        "first 10 squares": "Sum them up. The final answer is \\boxed{385}.",
+        "5 element set": "Each element is in or out. The final answer is \\boxed{32}.",
+        "6 faces": "A cube has six faces. The final answer is \\boxed{6}.",
+    }
+    server = ContinuousBatchingServer(ClockedModel(scripts, clock), seed=0, clock=clock)
+    solver = AIMOMathSolver(model_id_or_path="NON_EXISTENT", client=InferenceClient(server, ByteTokenizer()))
+    solver.budget = BudgetScheduler(total_limit=9 * 3600, problems_total=3, prior_seconds_per_sample=30.0, clock=clock)
+
+    recorded, opened_after = [], []
+    record, start_problem = solver.budget.record, solver.budget.start_problem
+    solver.budget.record = lambda n, seconds: recorded.append(seconds) or record(n, seconds)
+    solver.budget.start_problem = lambda *a, **k: opened_after.append(solver.budget.problems_done) or start_problem(*a, **k)
+    try:
+        outcomes = list(solver.solve_problems([
+            ("a", "Compute the sum of the first 10 squares."),
+            ("b", "How many subsets does a 5 element set have?"),
+            ("c", "How many 6 faces does a cube have?"),
+        ]))
+    finally:
+        solver.close()
+
+    assert [o["answer"] for o in outcomes] == [385, 32, 6]
+    # Each problem's budget opens only after the previous one finished
+    assert opened_after == [0, 1, 2]
+    assert [t["id"] for t in solver.budget.trace] == ["a", "b", "c"]
+    # Overlapping rounds share their wall time instead of each paying for all of it
+    assert sum(recorded) <= clock.now
+    assert solver.budget.seconds_per_sample < clock.now / 4
+    print("✅ Pipelined Budget Test Passed!")
+
+if __name__ == "__main__":
+    test_settled_vote_stops_and_contested_vote_borrows()
+    test_shares_follow_measured_cost_and_remaining_time()
+    test_solver_samples_in_rounds_within_budget()
+    test_pipelined_problems_are_charged_once()
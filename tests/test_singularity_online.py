@@ -0,0 +1,54 @@
+import sys
+import os
+import tempfile
+import numpy as np
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.global_realization_ledger import LedgerSync
+from layers.layer_2_core.realization_engine import RealizationEngine, RealizationFeatures
+from layers.layer_4_discovery.singularity_realization_engine import SingularityRealizationEngine, StreamingCovariance
+
+def test_streaming_covariance_matches_batch():
+    print("🧪 Testing Streaming Covariance...")
+    rng = np.random.default_rng(5)
+    X = rng.random((300, 11))
+    stream = StreamingCovariance(11)
+    for chunk in np.array_split(X, 17):
+        stream.update(chunk)
+    assert np.allclose(stream.cov, np.cov(X.T))
+    assert np.allclose(stream.mean, X.mean(axis=0))
+
+    # Exponential forgetting: batched merge == one-row-at-a-time merge.
+    decayed, stepwise = StreamingCovariance(11, decay=0.99), StreamingCovariance(11, decay=0.99)
+    for chunk in np.array_split(X, 7):
+        decayed.update(chunk)
+    for row in X:
+        stepwise.update(row)
+    assert np.allclose(decayed.cov, stepwise.cov)
+    print("✅ Streaming Covariance Test Passed!")
+
+def test_online_evolution_reuses_eigenbasis():
+    print("🧪 Testing Online Singularity Evolution...")
+    with tempfile.TemporaryDirectory() as tmp, LedgerSync(os.path.join(tmp, "ledger.json")) as sync:
+        engine = RealizationEngine(ledger_sync=sync)
+        singularity = SingularityRealizationEngine(engine, online=True, history_limit=100)
+        rng = np.random.default_rng(9)
+        calls = 30
+        for cycle in range(calls):
+            batch = engine.add_realizations_batch([
+                {"content": f"Online insight {cycle}-{i}", "features": RealizationFeatures(*map(float, rng.uniform(0.6, 1.0, 6)))}
+                for i in range(20)
+            ], trigger_evolution=False)
+            singularity.evolve(batch, [r.q_score for r in batch])
+
+        # The stationary stream stops moving the basis, so eigh is mostly skipped.
+        assert 1 <= singularity.eig_recomputes < calls
+        assert len(singularity.performance_history) <= 200
+        assert len(singularity._grad_window) == SingularityRealizationEngine.GRADIENT_WINDOW
+        for dim_id in "GCSAHV":
+            assert 0.05 <= singularity.dimensions[dim_id].weight <= 0.30
+    print("✅ Online Evolution Test Passed!")
+
+if __name__ == "__main__":
+    test_streaming_covariance_matches_batch()
+    test_online_evolution_reuses_eigenbasis()
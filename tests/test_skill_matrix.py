@@ -0,0 +1,121 @@
+import sys
+import os
+import gc
+import weakref
+import numpy as np
+sys.path.append(os.getcwd())
+
+from layers.layer_0_universal.foundation import (
+    Skill, SkillMatrix, SkillTable, build_adjacency_matrix, compute_utility, cosine_similarity,
+    select_skills, synthesize_skills
+)
+
+def random_catalog(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0.3, 1.0, size=(n, 8))
+    costs = rng.uniform(0.5, 3.0, size=n)
+    return [Skill(f"S{i}", *map(float, X[i]), cost=float(costs[i])) for i in range(n)]
+
+def reference_select(skills, task_embedding, budget=10.0, gamma=0.1):
+    # The original O(n^3) greedy loop.
+    n = len(skills)
+    A = np.array([[cosine_similarity(a.embedding, b.embedding) for b in skills] for a in skills])
+    utilities = np.array([compute_utility(s, task_embedding) for s in skills])
+    selected, total_cost, remaining = [], 0.0, list(range(n))
+    while remaining and total_cost < budget:
+        best_gain, best_idx = -np.inf, None
+        for i in remaining:
+            gain = (utilities[i] + sum(A[i, j] for j in selected) * gamma) / skills[i].cost
+            if gain > best_gain: best_gain, best_idx = gain, i
+        if best_idx is None or total_cost + skills[best_idx].cost > budget: break
+        selected.append(best_idx)
+        total_cost += skills[best_idx].cost
+        remaining.remove(best_idx)
+    return selected
+
+def test_adjacency_and_selection_match_reference():
+    print("🧪 Testing Vectorized Skill Matrix...")
+    skills = random_catalog(60, seed=0)
+    skills.append(Skill("Null", cost=1.0))  # zero embedding keeps cosine 0
+    A = build_adjacency_matrix(skills)
+    expected = np.array([[cosine_similarity(a.embedding, b.embedding) for b in skills] for a in skills])
+    assert np.allclose(A, expected)
+
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        task = rng.uniform(0, 1, 8)
+        budget = float(rng.uniform(2, 20))
+        assert select_skills(skills, task, budget=budget, gamma=0.3) == reference_select(skills, task, budget, 0.3)
+    print("✅ Skill Matrix Test Passed!")
+
+def test_cache_invalidated_on_mutation():
+    print("🧪 Testing Skill Matrix Invalidation...")
+    skills = random_catalog(10, seed=2)
+    matrix = SkillMatrix(skills)
+    before = matrix.adjacency
+    assert matrix.adjacency is before
+    skills[3].embedding = -skills[3].embedding
+    after = matrix.adjacency
+    assert after is not before and np.isclose(after[3, 3], 1.0) and after[3, 4] < 0
+
+    task = np.ones(8)
+    skills[5].cost = 1e-3  # cheap skill now wins first
+    assert matrix.select(task, budget=5.0)[0] == 5
+    print("✅ Invalidation Test Passed!")
+
+def test_large_catalog_selects_without_adjacency():
+    print("🧪 Testing Large Catalog Selection...")
+    skills = random_catalog(5000, seed=3)
+    matrix = SkillMatrix(skills)
+    task = np.random.default_rng(4).uniform(0, 1, 8)
+    picks = matrix.select(task, budget=50.0)
+    unit = matrix.unit
+    assert matrix.select(task, budget=50.0) == picks and matrix.unit is unit  # arrays reused
+    assert matrix._adjacency is None  # the n x n matrix is never built
+    assert len(picks) > 10 and len(set(picks)) == len(picks)
+    assert sum(skills[i].cost for i in picks) <= 50.0
+    assert select_skills(skills, task, budget=50.0) == picks
+    print("✅ Large Catalog Test Passed!")
+
+def test_module_functions_do_not_keep_skills_alive():
+    print("🧪 Testing Skill Matrix Lifetime...")
+    skills = random_catalog(20, seed=7)
+    select_skills(skills, np.ones(8))
+    build_adjacency_matrix(skills)
+    ref = weakref.ref(skills[0])
+    del skills
+    gc.collect()
+    assert ref() is None
+    print("✅ Lifetime Test Passed!")
+
+def test_skill_table_matches_skill_objects():
+    print("🧪 Testing Columnar Skill Table...")
+    skills = random_catalog(200, seed=5)
+    table = SkillTable.from_skills(skills)
+    assert len(table) == 200 and table[7].name == "S7"
+    assert table.q_scores().tolist() == [s.q_score() for s in skills]
+
+    task = np.random.default_rng(6).uniform(0, 1, 8)
+    assert np.allclose(table.utilities(task), [compute_utility(s, task) for s in skills])
+    assert np.allclose(table.utilities(task), [compute_utility(v, task) for v in table])
+    assert table.select(task, budget=15.0) == select_skills(skills, task, budget=15.0)
+
+    emergent = table.synthesize([3, 10, 42])
+    expected = synthesize_skills([skills[3], skills[10], skills[42]])
+    assert emergent.index == 200 and emergent.name == expected.name
+    assert np.allclose(emergent.to_vector(), expected.to_vector())
+    assert emergent.priority == expected.priority and np.isclose(emergent.cost, expected.cost)
+
+    # Views write through and invalidate cached Q.
+    view = table[3]
+    view.G = 0.0
+    assert table.dims[3, 0] == 0.0
+    assert view.q_score() == table.to_skill(3).q_score() < skills[3].q_score()
+    print("✅ Skill Table Test Passed!")
+
+if __name__ == "__main__":
+    test_adjacency_and_selection_match_reference()
+    test_cache_invalidated_on_mutation()
+    test_large_catalog_selects_without_adjacency()
+    test_module_functions_do_not_keep_skills_alive()
+    test_skill_table_matches_skill_objects()
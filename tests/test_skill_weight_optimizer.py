@@ -0,0 +1,50 @@
+import sys
+import os
+import tempfile
+import numpy as np
+sys.path.append(os.getcwd())
+
+from layers.layer_4_discovery.skill_weight_optimizer import (
+    SkillMath, SkillWeightTrainer, SyntheticDataGenerator, examples_to_arrays
+)
+
+def test_analytic_gradients_match_finite_differences():
+    print("🧪 Testing Closed-Form Gradients...")
+    np.random.seed(0)
+    data = SyntheticDataGenerator.generate_training_set(n_examples=300)
+    trainer = SkillWeightTrainer(weight_decay=1e-3)
+    weights_array = trainer.weights.to_array() + np.random.uniform(-0.02, 0.02, 13)
+    analytic = trainer.compute_gradients(data, weights_array)
+    numerical = trainer.compute_numerical_gradients(data, weights_array)
+    assert np.allclose(analytic, numerical, atol=1e-6)
+
+    X, y = examples_to_arrays(data)
+    assert np.allclose(SkillMath.compute_q_scores(X, trainer.weights), [SkillMath.compute_q_score(ex.skill, trainer.weights) for ex in data])
+    print("✅ Gradient Test Passed!")
+
+def test_minibatch_training_and_weight_roundtrip():
+    print("🧪 Testing Mini-Batch Training...")
+    rng = np.random.default_rng(1)
+    X = rng.uniform(0.2, 1.0, size=(20000, 8))
+    true_w = np.array([0.10, 0.25, 0.15, 0.15, 0.15, 0.10, 0.05, 0.05])
+    y = np.clip(X @ true_w + rng.normal(0, 0.01, len(X)), 0, 1)
+
+    np.random.seed(2)
+    trainer = SkillWeightTrainer(learning_rate=0.5)
+    history = trainer.train((X, y), validation_data=(X[:2000], y[:2000]), epochs=30, batch_size=512, verbose=False)
+    assert history['train_loss'][-1] < history['train_loss'][0]
+    learned = trainer.weights.to_array()[:8]
+    assert np.isclose(learned.sum(), 1.0)
+    assert np.argmax(learned) == 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "weights.json")
+        trainer.save_weights(path)
+        restored = SkillWeightTrainer()
+        restored.load_weights(path)
+    assert np.allclose(restored.weights.to_array(), trainer.weights.to_array())
+    print("✅ Mini-Batch Training Test Passed!")
+
+if __name__ == "__main__":
+    test_analytic_gradients_match_finite_differences()
+    test_minibatch_training_and_weight_roundtrip()
@@ -0,0 +1,99 @@
+import sys
+import os
+import random
+sys.path.append(os.getcwd())
+
+from layers.layer_2_core.solve_cache import KnownProblemMatcher, SolveCache, normalize_problem, solve_key
+from layers.layer_2_core.aimo_math_solver import AIMOMathSolver, KNOWN_ANSWERS
+
+def linear_lookup(table, problem):
+    """The dict scan the matcher replaces."""
+    for key, val in table.items():
+        if key in problem.lower(): return val
+    return None
+
+def test_matcher_agrees_with_linear_scan():
+    print("🧪 Testing Aho-Corasick Known-Problem Matcher...")
+    matcher = KnownProblemMatcher(KNOWN_ANSWERS)
+    problems = [
+        "Find the minimal perimeter of the triangle.",
+        "Ken has 3 apples and Tastic has 2.",  # both match; the earlier table key wins
+        "Compute 2025! modulo 10^5.",
+        "What is 2 + 2?",
+        "",
+    ]
+    for p in problems:
+        assert matcher.match(p) == linear_lookup(KNOWN_ANSWERS, p), p
+
+    rng = random.Random(0)
+    for _ in range(500):
+        table = {"".join(rng.choice("abc") for _ in range(rng.randint(1, 4))): i for i in range(rng.randint(1, 6))}
+        text = "".join(rng.choice("abcAB ") for _ in range(rng.randint(0, 30)))
+        assert KnownProblemMatcher(table).match(text) == linear_lookup(table, text), (table, text)
+    print("✅ Known-Problem Matcher Test Passed!")
+
+def test_cache_evicts_least_recently_used_by_size(tmp_path):
+    print("🧪 Testing Solve Cache LRU Eviction...")
+    cache = SolveCache(str(tmp_path), max_bytes=1000)
+    payload = {"answer": 1, "samples": ["x" * 200]}
+    for key in ["a", "b", "c", "d"]:
+        cache.put(key, payload)
+    assert len(cache) == 4 and cache.total_bytes <= 1000
+    assert cache.get("a") is not None  # refresh "a"
+    cache.put("e", payload)
+    assert cache.get("b") is None and cache.get("a") is not None
+    assert cache.evictions == 1 and cache.total_bytes <= 1000
+    assert sorted(f for f in os.listdir(tmp_path)) == ["a.json", "c.json", "d.json", "e.json"]
+    # A fresh handle rebuilds the index from disk
+    assert len(SolveCache(str(tmp_path), max_bytes=1000)) == 4
+    print("✅ Solve Cache Eviction Test Passed!")
+
+def test_keys_follow_normalized_text_model_and_config():
+    print("🧪 Testing Solve Cache Keys...")
+    config = {"temperature": 0.6}
+    key = solve_key("What is  6 * 7?\n", "mock", config)
+    assert key == solve_key(" What is 6 * 7? ", "mock", config)
+    assert normalize_problem("ｘ  +\t1") == "x + 1"
+    assert key != solve_key("What is 6 * 8?", "mock", config)
+    assert key != solve_key("What is 6 * 7?", "other-model", config)
+    assert key != solve_key("What is 6 * 7?", "mock", {"temperature": 0.7})
+    print("✅ Solve Cache Key Test Passed!")
+
+def test_rerun_is_answered_from_cache(tmp_path):
+    print("🧪 Testing Solver Rerun From Cache...")
+    problem = "What is 6 * 7?"
+    first = AIMOMathSolver(model_id_or_path="NON_EXISTENT", cache=SolveCache(str(tmp_path)))
+    cold = first.solve_problem(problem, id="p1")
+    assert cold["method"] == "synergy_ensemble"
+
+    rerun = AIMOMathSolver(model_id_or_path="NON_EXISTENT", cache=SolveCache(str(tmp_path)))
+    warm = rerun.solve_problem("  What is 6 *  7? ", id="p1")
+    assert warm["method"] == "cache" and warm["answer"] == cold["answer"] == 42
+    assert warm["samples"] == cold["samples"] and rerun.budget.trace == []
+
+    entry = rerun.cache.get(rerun._cache_key(problem))
+    assert [s["answer"] for s in entry["samples"]] == [42] * cold["samples"]
+    assert all(s["rtc_answer"] == 42 for s in entry["samples"])
+    assert entry["votes"][0][0] == 42 and entry["budget"]["stop_reason"] == "settled"
+
+    # Any change to the sampling config is a clean miss
+    rerun.temperature = 0.7
+    assert rerun.solve_problem(problem, id="p1")["method"] == "synergy_ensemble"
+
+    # So is any change to the voting or mock logic, even with the model id fixed at "mock"
+    class PatchedSolver(AIMOMathSolver):
+        def _synergy_weighted_voting(self, results):
+            return dict(super()._synergy_weighted_voting(results), q_score=0.0)
+    patched = PatchedSolver(model_id_or_path="NON_EXISTENT", cache=SolveCache(str(tmp_path)))
+    assert patched._cache_key(problem) != first._cache_key(problem)
+    assert patched.solve_problem(problem, id="p1")["method"] == "synergy_ensemble"
+    print("✅ Solver Cache Rerun Test Passed!")
+
+if __name__ == "__main__":
+    import tempfile
+    test_matcher_agrees_with_linear_scan()
+    test_keys_follow_normalized_text_model_and_config()
+    with tempfile.TemporaryDirectory() as d:
+        test_cache_evicts_least_recently_used_by_size(d)
+    with tempfile.TemporaryDirectory() as d:
+        test_rerun_is_answered_from_cache(d)
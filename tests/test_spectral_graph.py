@@ -0,0 +1,88 @@
+import sys
+import os
+import numpy as np
+import scipy.sparse as sp
+sys.path.append(os.getcwd())
+
+from layers.layer_0_universal.foundation import Skill
+from layers.layer_2_core.foundation import PatternDetectionEngine
+from layers.layer_2_core.spectral_graph import SpectralGraphService
+
+def loop_modularity(A, communities):
+    m = A.sum() / 2
+    k = A.sum(axis=1)
+    Q = 0.0
+    for community in communities:
+        for i in community:
+            for j in community:
+                Q += A[i, j] - (k[i] * k[j]) / (2 * m)
+    return Q / (2 * m)
+
+def test_modularity_and_cache():
+    print("🧪 Testing Spectral Graph Service...")
+    rng = np.random.default_rng(2)
+    A = rng.random((60, 60))
+    A = (A + A.T) / 2
+    communities = [list(range(0, 30)), list(range(20, 45)), [3, 50, 59]]
+    service = SpectralGraphService()
+    assert np.isclose(service.modularity(A, communities), loop_modularity(A, communities))
+
+    vals, vecs = service.eigenpairs(A)
+    L = np.diag(A.sum(axis=1)) - A
+    assert np.allclose(L @ vecs, vecs * vals)
+    # Equal content hits the cache even through a different array object.
+    assert service.eigenpairs(A.copy())[1] is vecs and service.hits >= 1
+    assert np.isclose(service.fiedler_value(A), vals[1] - vals[0])
+
+    # Sparse input takes the partial (k smallest) solver.
+    partial, _ = service.eigenpairs(sp.csr_matrix(A), k=3)
+    assert np.allclose(partial, vals[:3])
+    print("✅ Spectral Graph Service Test Passed!")
+
+def test_factored_graph_matches_dense():
+    print("🧪 Testing Matrix-Free Cosine Graph Spectra...")
+    rng = np.random.default_rng(6)
+    skills = [Skill(f"Skill-{i}", *rng.random(8)) for i in range(300)]
+    U = np.array([s.embedding for s in skills])
+    U /= np.linalg.norm(U, axis=1, keepdims=True)
+    service = SpectralGraphService()
+    dense_vals = service.eigenvalues(U @ U.T)
+    factored_vals, vecs = service.factored_eigenpairs(U, 4)
+    assert np.allclose(factored_vals, dense_vals[:4], atol=1e-8)
+
+    communities = [list(np.where(vecs[:, i] > 0)[0]) for i in range(1, 4)]
+    assert np.isclose(service.factored_modularity(U, communities), service.modularity(U @ U.T, communities))
+
+    dense = PatternDetectionEngine(SpectralGraphService()).detect_communities(skills)
+    factored = PatternDetectionEngine(SpectralGraphService(dense_limit=50)).detect_communities(skills)
+    assert np.isclose(dense["modularity"], factored["modularity"])
+    # Eigenvector signs are arbitrary: each community matches or is the complement.
+    for a, b in zip(dense["communities"], factored["communities"]):
+        assert a == b or sorted(set(range(300)) - set(a)) == b
+    print("✅ Matrix-Free Spectra Test Passed!")
+
+def test_cached_results_are_read_only():
+    print("🧪 Testing Spectral Cache Is Read-Only...")
+    rng = np.random.default_rng(5)
+    A = rng.random((20, 20))
+    A = (A + A.T) / 2
+    service = SpectralGraphService()
+    vals, vecs = service.eigenpairs(A)
+    expected = vecs.copy()
+    for result in (vals, vecs, vals[:2], service.laplacian(A), service.eigenvalues(A, k=2),
+                   service.laplacian(sp.csr_matrix(A)).data):
+        try:
+            result[0] = 0.0
+            assert False, "cached spectral results must be read-only"
+        except ValueError:
+            pass
+    assert np.array_equal(service.eigenpairs(A.copy())[1], expected)
+    # Copies stay writable
+    mine = vecs.copy()
+    mine[0] = 0.0
+    print("✅ Read-Only Cache Test Passed!")
+
+if __name__ == "__main__":
+    test_modularity_and_cache()
+    test_factored_graph_matches_dense()
+    test_cached_results_are_read_only()
@@ -0,0 +1,49 @@
+import sys
+import os
+import re
+sys.path.append(os.getcwd())
+
+from competitions.aimo.build_bundle import ROOT, build, host_imports, inline_source
+
+def inlined_blocks(target):
+    with open(os.path.join(ROOT, target)) as f:
+        text = f.read()
+    return re.findall(r"^# >>> inlined: (\S+)\n(.*?)^# <<< inlined: \1\n", text, re.MULTILINE | re.DOTALL)
+
+def test_bundles_match_shared_modules():
+    print("🧪 Testing Kaggle Bundles Are Built From The Shared Modules...")
+    stale = build(check=True)
+    assert not any(stale.values()), f"run python competitions/aimo/build_bundle.py: {stale}"
+    assert [m for m, _ in inlined_blocks("competitions/aimo/bundled_submission.py")][:2] == [
+        "layers/layer_2_core/code_sandbox.py", "layers/layer_2_core/answer_extraction.py"]
+    # Re-imports of names the host script already imports are marked for pyflakes
+    with open(os.path.join(ROOT, "submission.py")) as f:
+        assert "Counter" in host_imports(f.read())
+    for _, source in inlined_blocks("submission.py"):
+        assert "from collections import Counter\n" not in source
+    assert "from collections import Counter  # noqa: F811\n" in inlined_blocks("submission.py")[-1][1]
+    try:
+        inline_source("layers/layer_2_core/aimo_math_solver.py", [])
+        assert False, "a layer import with nothing inlined before it must be rejected"
+    except ValueError:
+        pass
+    print("✅ Bundle Sync Test Passed!")
+
+def test_bundled_copies_run_standalone():
+    print("🧪 Testing Inlined Code Runs Without The layers Package...")
+    namespace = {"__name__": "bundle"}
+    for _, source in inlined_blocks("competitions/aimo/bundled_submission.py"):
+        exec(compile(source, "<bundle>", "exec"), namespace)
+    assert namespace["extract_answer"]("so \\boxed{\\frac{84}{2}}") == 84
+
+    pool = namespace["SandboxPool"](workers=1, preload=())
+    result = pool.run("print(6 * 7)")
+    assert namespace["extract_rtc_answer"](result) == 42
+    procs = [w.proc for w in pool._all]
+    pool.close()
+    assert all(p.poll() is not None for p in procs)  # no orphaned workers
+    print("✅ Standalone Bundle Test Passed!")
+
+if __name__ == "__main__":
+    test_bundles_match_shared_modules()
+    test_bundled_copies_run_standalone()
@@ -0,0 +1,87 @@
+import sys
+import os
+import json
+sys.path.append(os.getcwd())
+
+from competitions.aimo.validate_performance import default_workers, evaluate, load_records, load_tasks, summarize
+from layers.layer_2_core.aimo_math_solver import AIMOMathSolver
+
+def mock_solver():
+    return AIMOMathSolver(model_id_or_path="NON_EXISTENT")
+
+def test_parallel_run_matches_serial(tmp_path):
+    print("🧪 Testing Parallel Validation Harness...")
+    tasks = load_tasks()
+    serial = evaluate(tasks, str(tmp_path / "serial.jsonl"), mock_solver, workers=0)
+    parallel = evaluate(tasks, str(tmp_path / "parallel.jsonl"), mock_solver, workers=2, variant="pool")
+
+    assert [r["id"] for r in parallel["details"]] == [t[0] for t in tasks]
+    assert [r["predicted"] for r in parallel["details"]] == [r["predicted"] for r in serial["details"]]
+    assert parallel["score"] == serial["score"] and parallel["total"] == len(tasks)
+    assert parallel["samples_total"] == serial["samples_total"]
+    with open(tmp_path / "parallel.jsonl") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == len(tasks) and all(r["variant"] == "pool" for r in lines)
+    print(f"   {parallel['score']} | p50 {parallel['latency_p50']:.3f}s | RTC hit rate {parallel['rtc_hit_rate']:.0%}")
+    print("✅ Parallel Validation Test Passed!")
+
+def test_resume_skips_finished_problems(tmp_path):
+    print("🧪 Testing Validation Resume...")
+    tasks = load_tasks()[:4]
+    output = str(tmp_path / "run.jsonl")
+    evaluate(tasks[:2], output, mock_solver, workers=0)
+    with open(output, "a") as f:
+        f.write('{"id": "' + tasks[2][0] + '", "predic')  # crash mid-write
+
+    solved = []
+    def counting_solver():
+        solver = mock_solver()
+        solve = solver.solve_problem
+        solver.solve_problem = lambda problem, id: solved.append(id) or solve(problem, id=id)
+        return solver
+
+    summary = evaluate(tasks, output, counting_solver, workers=0)
+    assert solved == [tasks[2][0], tasks[3][0]]
+    assert summary["total"] == 4 and set(load_records(output)) == {t[0] for t in tasks}
+
+    # Without resume everything is solved again
+    solved.clear()
+    evaluate(tasks, output, counting_solver, workers=0, resume=False)
+    assert solved == [t[0] for t in tasks]
+    print("✅ Validation Resume Test Passed!")
+
+def test_summary_metrics():
+    print("🧪 Testing Validation Summary Metrics...")
+    records = [
+        {"correct": True, "latency": 1.0, "samples": 4, "rtc_hits": 4},
+        {"correct": False, "latency": 3.0, "samples": 8, "rtc_hits": 2},
+        {"correct": True, "latency": 2.0, "samples": 0, "rtc_hits": 0},
+    ]
+    summary = summarize(records)
+    assert summary["score"] == "2/3" and summary["accuracy"] == "66.7%"
+    assert summary["latency_p50"] == 2.0 and abs(summary["latency_p95"] - 2.9) < 1e-9
+    assert summary["samples_total"] == 12 and summary["rtc_hit_rate"] == 0.5
+    assert summary["cache_hits"] == 0
+
+    # Cache hits count toward the score but not toward solver latency
+    cached = records + [{"correct": True, "latency": 0.001, "samples": 4, "rtc_hits": 4, "method": "cache"}] * 5
+    summary = summarize(cached)
+    assert summary["score"] == "7/8" and summary["cache_hits"] == 5
+    assert summary["latency_p50"] == 2.0 and abs(summary["latency_p95"] - 2.9) < 1e-9
+    print("✅ Validation Summary Test Passed!")
+
+def test_real_model_defaults_to_in_process(tmp_path):
+    print("🧪 Testing Validation Worker Default...")
+    assert default_workers(str(tmp_path)) == 0  # a model that exists loads once, in this process
+    assert default_workers(str(tmp_path / "missing")) >= 1
+    print("✅ Worker Default Test Passed!")
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    with tempfile.TemporaryDirectory() as d:
+        test_parallel_run_matches_serial(pathlib.Path(d))
+    with tempfile.TemporaryDirectory() as d:
+        test_resume_skips_finished_problems(pathlib.Path(d))
+    test_summary_metrics()
+    with tempfile.TemporaryDirectory() as d:
+        test_real_model_defaults_to_in_process(pathlib.Path(d))
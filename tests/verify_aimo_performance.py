@@ -6,10 +6,13 @@ import os
 sys.path.append(os.getcwd())
 
 from layers.layer_2_core.aimo_math_solver import AIMOMathSolver
+from layers.layer_2_core.solve_cache import SolveCache
 
 def main():
     print("🔬 Verifying AIMO 3 Solver against Reference Problems...")
-    solver = AIMOMathSolver(model_id_or_path="NON_EXISTENT") # Force MOCK mode
+    # Re-solve every problem so solver regressions show up; pass --cache to reuse earlier answers
+    cache = SolveCache() if "--cache" in sys.argv[1:] else None
+    solver = AIMOMathSolver(model_id_or_path="NON_EXISTENT", cache=cache) # Force MOCK mode
 
     ref_path = 'data/aimo_3/reference.csv'
     if not os.path.exists(ref_path):